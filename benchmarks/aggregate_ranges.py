@@ -0,0 +1,64 @@
+"""
+Measures the time taken by SUMA, PROMEDIO, MAX and MIN to read and reduce large ranges.
+
+Usage: PYTHONPATH=src python benchmarks/aggregate_ranges.py [NUM_ROWS] [--no-numpy]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+if '--no-numpy' in sys.argv:  # Measures the pure Python reductions
+    sys.argv.remove('--no-numpy')
+    sys.modules['numpy'] = None
+
+from simple_spreadsheet.domain.cell_range import CellRange
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.functions import FunctionFactory
+from simple_spreadsheet.domain.vectorization import numpy_module
+from simple_spreadsheet.framework.file_manager import FileManager
+
+NUM_ROWS = 1_000_000
+REPEATS = 5
+SEED = 2024
+
+# Column of each kind of data in the generated sheet
+COLUMNS = {
+    'integers': 'A',
+    'decimals': 'B',
+    'with empty cells': 'C',
+}
+
+
+def _write_sheet(file_path: str, num_rows: int) -> None:
+    rng = random.Random(SEED)
+    with open(file_path, 'w') as file:
+        for _ in range(num_rows):
+            gap = '' if rng.random() < 0.3 else str(rng.randint(-1000, 1000))
+            file.write(f'{rng.randint(-1000, 1000)};{rng.uniform(0, 100):.2f};{gap}\n')
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'aggregates.s2v')
+        _write_sheet(file_path, num_rows)
+        spreadsheet, _ = FileManager().read(file_path)
+
+    print(f'{num_rows} rows, NumPy {"enabled" if numpy_module() is not None else "disabled"}, best of {REPEATS}:')
+    for kind, column in COLUMNS.items():
+        cell_range = CellRange(Coordinates.from_id(f'{column}1'),
+                               Coordinates.from_id(f'{column}{num_rows}'))
+        for name in ('SUMA', 'PROMEDIO', 'MAX', 'MIN'):
+            function = FunctionFactory.create(name, [cell_range])
+            best = float('inf')
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                function.reduce(cell_range.evaluate_arg(spreadsheet))  # Full read, no aggregates
+                best = min(best, time.perf_counter() - start)
+            print(f'  {name}({kind}): {best * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures the time taken to paste a column of numbers over a sheet whose
+formulas depend on it, including a summary table over the totals of the
+column, cell by cell and as a single batch of edits. The
+batch checks cycles once and recomputes the dependents in a single pass.
+
+Usage: PYTHONPATH=src:. python benchmarks/batch_edits.py [NUM_ROWS]
+"""
+import random
+import sys
+import time
+
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 50_000
+NUM_SUMMARIES = 20
+SEED = 2024
+
+
+def _create_sheet(num_rows: int) -> ControllerForChecker:
+    controller = ControllerForChecker()
+    contents = {'D1': f'=SUMA(B1:B{num_rows})', 'E1': f'=MAX(C1:C{num_rows})'}
+    for row in range(1, NUM_SUMMARIES + 1):
+        contents[f'F{row}'] = f'=D1/E1*{row}'
+    for row in range(1, num_rows + 1):
+        contents[f'A{row}'] = '0'
+        contents[f'B{row}'] = f'=A{row}*2+1'
+        contents[f'C{row}'] = f'=B{row}/2-A{row}'
+    controller.set_many(contents)
+    return controller
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    rng = random.Random(SEED)
+    pasted = {f'A{row}': f'{rng.uniform(0, 100):.2f}' for row in range(1, num_rows + 1)}
+
+    print(f'Paste of {num_rows} cells over {2 * num_rows + NUM_SUMMARIES + 2} formulas:')
+    controller = _create_sheet(num_rows)
+    start = time.perf_counter()
+    for coord, content in pasted.items():
+        controller.set_cell_content(coord, content)
+    sequential = time.perf_counter() - start
+    print(f'  one by one: {sequential:.2f}s')
+
+    batched = _create_sheet(num_rows)
+    start = time.perf_counter()
+    batched.set_many(pasted)
+    print(f'  batch: {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
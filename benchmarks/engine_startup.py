@@ -0,0 +1,48 @@
+"""
+Measures the startup of the headless engine: importing it and constructing
+an empty spreadsheet, each in a fresh interpreter so nothing is cached. Then
+the slowest modules it imports, as reported by -X importtime.
+
+Usage: PYTHONPATH=src python benchmarks/engine_startup.py [REPEATS]
+"""
+import subprocess
+import sys
+
+REPEATS = 10
+SLOWEST_MODULES = 5
+
+STARTUP = '''
+import time
+start = time.perf_counter()
+from simple_spreadsheet.usecase.spreadsheet_engine import SpreadsheetEngine
+imported = time.perf_counter()
+SpreadsheetEngine()
+constructed = time.perf_counter()
+print(imported - start, constructed - imported)
+'''
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS
+    timings = [tuple(map(float, _run('-c', STARTUP).stdout.split())) for _ in range(repeats)]
+    import_time = min(timing[0] for timing in timings)
+    construct_time = min(timing[1] for timing in timings)
+    print(f'Best of {repeats}: import {import_time * 1000:.1f}ms, construction {construct_time * 1000:.2f}ms')
+
+    # Lines are "import time: self | cumulative | module", in microseconds
+    report = _run('-X', 'importtime', '-c', 'import simple_spreadsheet.usecase.spreadsheet_engine').stderr
+    modules = []
+    for line in report.splitlines()[1:]:
+        _, cumulative, module = line.split('|')
+        modules.append((int(cumulative), module.strip()))
+    print('Slowest imports (cumulative):')
+    for cumulative, module in sorted(modules, reverse=True)[:SLOWEST_MODULES]:
+        print(f'  {module}: {cumulative / 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
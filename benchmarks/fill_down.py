@@ -0,0 +1,48 @@
+"""
+Measures the time taken to load a sheet whose formula columns are filled
+down, such as =A1*B1+A1 ... =A100000*B100000+A100000. Runs of the same
+formula down a column are evaluated at once when NumPy is installed.
+
+Usage: PYTHONPATH=src:. python benchmarks/fill_down.py [NUM_ROWS] [--no-numpy]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+if '--no-numpy' in sys.argv:  # Measures the formula by formula evaluation
+    sys.argv.remove('--no-numpy')
+    sys.modules['numpy'] = None
+
+from simple_spreadsheet.domain.vectorization import numpy_module
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 100_000
+SEED = 2024
+
+
+def _write_sheet(file_path: str, num_rows: int) -> None:
+    rng = random.Random(SEED)
+    with open(file_path, 'w') as file:
+        for row in range(1, num_rows + 1):
+            file.write(f'{rng.uniform(0, 100):.2f};{rng.uniform(1, 100):.2f};'
+                       f'=A{row}*B{row}+A{row};=C{row}/B{row}-1;=C{row}-D{row}*2\n')
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    controller = ControllerForChecker()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'fill_down.s2v')
+        _write_sheet(file_path, num_rows)
+        start = time.perf_counter()
+        controller.load_spreadsheet_from_file(file_path)
+        elapsed = time.perf_counter() - start
+
+    print(f'{3 * num_rows} filled down formulas, NumPy {"enabled" if numpy_module() is not None else "disabled"}: '
+          f'loaded in {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
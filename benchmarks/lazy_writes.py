@@ -0,0 +1,52 @@
+"""
+Measures the write throughput of an ingestion job that writes numbers into
+a column read by a growing number of formulas, then reads a single output.
+With lazy evaluation, writes only record the change and the cost moves to
+the read, which evaluates what the output depends on.
+
+Usage: PYTHONPATH=src:. python benchmarks/lazy_writes.py [NUM_WRITES]
+"""
+import random
+import sys
+import time
+
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_WRITES = 5_000
+NUM_ROWS = 1_000
+DOWNSTREAM_FORMULAS = [0, 100, 1_000]
+SEED = 2024
+
+
+def _create_sheet(num_formulas: int, lazy: bool) -> ControllerForChecker:
+    controller = ControllerForChecker(lazy=lazy)
+    contents = {f'A{row}': '0' for row in range(1, NUM_ROWS + 1)}
+    contents['B1'] = f'=SUMA(A1:A{NUM_ROWS})'
+    for row in range(1, num_formulas + 1):
+        contents[f'C{row}'] = f'=B1*{row}+A{row % NUM_ROWS + 1}'
+    controller.set_many(contents)
+    return controller
+
+
+def main() -> None:
+    num_writes = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_WRITES
+    rng = random.Random(SEED)
+    writes = [(f'A{rng.randint(1, NUM_ROWS)}', f'{rng.uniform(0, 100):.2f}') for _ in range(num_writes)]
+
+    print(f'{num_writes} writes, then one read:')
+    for num_formulas in DOWNSTREAM_FORMULAS:
+        for lazy in (False, True):
+            controller = _create_sheet(num_formulas, lazy)
+            start = time.perf_counter()
+            for coord, content in writes:
+                controller.set_cell_content(coord, content)
+            written = time.perf_counter()
+            controller.get_cell_content_as_float('B1')
+            read = time.perf_counter()
+            mode = 'lazy' if lazy else 'eager'
+            print(f'  {num_formulas} formulas downstream, {mode}: '
+                  f'{num_writes / (written - start):.0f} writes/s, read {(read - written) * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
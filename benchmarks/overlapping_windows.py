@@ -0,0 +1,59 @@
+"""
+Measures the time taken to evaluate many SUMA, PROMEDIO, MAX and MIN formulas
+over overlapping windows of a large column, as in SUMA(A1:A1000),
+SUMA(A1:A2000)... and to recalculate them after single cell updates.
+
+Usage: PYTHONPATH=src:. python benchmarks/overlapping_windows.py [NUM_ROWS] [NUM_WINDOWS]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 100_000
+NUM_WINDOWS = 100
+NUM_UPDATES = 100
+FUNCTIONS = ['SUMA', 'PROMEDIO', 'MAX', 'MIN']
+SEED = 2024
+
+
+def _write_sheet(file_path: str, num_rows: int, num_windows: int, rng: random.Random) -> None:
+    step = num_rows // num_windows
+    with open(file_path, 'w') as file:
+        for row in range(num_rows):
+            formulas = ''
+            if row < num_windows:
+                start, stop = row * step // 2 + 1, (row + 1) * step
+                formulas = ''.join(f';={name}(A{start}:A{stop})' for name in FUNCTIONS)
+            file.write(f'{rng.uniform(0, 100):.2f}{formulas}\n')
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    num_windows = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_WINDOWS
+    rng = random.Random(SEED)
+    controller = ControllerForChecker()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'windows.s2v')
+        _write_sheet(file_path, num_rows, num_windows, rng)
+        start = time.perf_counter()
+        controller.load_spreadsheet_from_file(file_path)
+        load = time.perf_counter() - start
+
+    updates = [(f'A{rng.randint(num_windows + 1, num_rows)}', f'{rng.uniform(0, 100):.2f}')
+               for _ in range(NUM_UPDATES)]
+    start = time.perf_counter()
+    for cell, value in updates:
+        controller.set_cell_content(cell, value)
+    elapsed = time.perf_counter() - start
+
+    hits, misses = controller.get_aggregate_counters()
+    print(f'{num_windows * len(FUNCTIONS)} formulas over {num_rows} rows: load {load:.3f}s, '
+          f'{elapsed / NUM_UPDATES * 1000:.2f}ms per update ({hits} hits, {misses} misses)')
+
+
+if __name__ == '__main__':
+    main()
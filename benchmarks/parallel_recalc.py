@@ -0,0 +1,80 @@
+"""
+Measures the time taken to recompute a sheet made of independent blocks of
+aggregate formulas, such as =B1*PROMEDIO(A1:A1000)+MAX(A1:A500), when new
+inputs are pasted into every block, with an increasing number of processes.
+Each block is a connected component, so the blocks are spread over them.
+The workers are forked while the sheet is created, the pastes timed send
+them the new inputs only.
+
+On a single core host, where it only measures the overhead, 16 blocks of
+500 formulas took 3.39s serially, 3.84s with 2 processes, 3.96s with 4
+and 4.19s with 8. The scaling on 4-16 cores is yet to be measured on a
+multicore host.
+
+Usage: PYTHONPATH=src:. python benchmarks/parallel_recalc.py [NUM_ROWS] [PROCESSES...]
+"""
+import os
+import random
+import sys
+import time
+
+from simple_spreadsheet.domain.coordinates import Column
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 2_000
+NUM_BLOCKS = 16
+WINDOW = 1_000
+PROCESSES = [1, 2, 4, 8, 16]
+NUM_PASTES = 3
+SEED = 2024
+
+
+def _block_columns(block: int) -> tuple[str, str, str]:
+    """Data, input and formula columns of a block."""
+    return tuple(Column.letters_from_number(3 * block + i) for i in range(3))
+
+
+def _create_sheet(num_rows: int, processes: int) -> ControllerForChecker:
+    rng = random.Random(SEED)
+    controller = ControllerForChecker(processes=processes)
+    contents = {}
+    for block in range(NUM_BLOCKS):
+        data, inputs, formulas = _block_columns(block)
+        for row in range(1, num_rows + WINDOW + 1):
+            contents[f'{data}{row}'] = f'{rng.uniform(0, 100):.2f}'
+        for row in range(1, num_rows + 1):
+            contents[f'{inputs}{row}'] = '1'
+            contents[f'{formulas}{row}'] = (f'={inputs}{row}*PROMEDIO({data}{row}:{data}{row + WINDOW})'
+                                            f'+MAX({data}{row}:{data}{row + WINDOW // 2})'
+                                            f'-MIN({data}{row}:{data}{row + WINDOW // 4})')
+    controller.set_many(contents)
+    return controller
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    processes = [int(arg) for arg in sys.argv[2:]] or PROCESSES
+    rng = random.Random(SEED)
+    pastes = []
+    for _ in range(NUM_PASTES):
+        pasted = {}
+        for block in range(NUM_BLOCKS):
+            _, inputs, _ = _block_columns(block)
+            for row in range(1, num_rows + 1):
+                pasted[f'{inputs}{row}'] = f'{rng.uniform(0, 2):.2f}'
+        pastes.append(pasted)
+
+    print(f'{NUM_BLOCKS} blocks of {num_rows} formulas, {os.cpu_count()} cores, mean of {NUM_PASTES} pastes:')
+    serial = None
+    for count in processes:
+        controller = _create_sheet(num_rows, count)
+        start = time.perf_counter()
+        for pasted in pastes:
+            controller.set_many(pasted)
+        elapsed = (time.perf_counter() - start) / NUM_PASTES
+        serial = serial or elapsed
+        print(f'  {count} processes: {elapsed:.2f}s, speedup {serial / elapsed:.2f}x')
+        del controller  # Stops its workers before the next ones are forked
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures the time taken to turn formula expressions into postfix programs.
+
+Usage: PYTHONPATH=src python benchmarks/parse_formulas.py [NUM_FORMULAS]
+"""
+import random
+import sys
+import time
+
+from simple_spreadsheet.domain.formula_evaluation import FormulaEvaluator
+
+NUM_FORMULAS = 100_000
+REPEATS = 3
+SEED = 2024
+
+
+def _cell(rng: random.Random) -> str:
+    return f'{rng.choice("ABCDEFGH")}{rng.randint(1, 5000)}'
+
+
+def _range(rng: random.Random) -> str:
+    return f'{_cell(rng)}:{_cell(rng)}'
+
+
+def _function(rng: random.Random, depth: int = 0) -> str:
+    args = [rng.choice([_cell, _range])(rng) for _ in range(rng.randint(1, 3))]
+    if depth < 2 and rng.random() < 0.3:
+        args.append(_function(rng, depth + 1))
+    return f'{rng.choice(["SUMA", "PROMEDIO", "MAX", "MIN"])}({";".join(args)})'
+
+
+def _operand(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.5:
+        return _cell(rng)
+    if kind < 0.8:
+        return str(rng.choice([2, 0.5, 10, -3, 1.25]))
+    return _function(rng)
+
+
+def _expression(rng: random.Random, depth: int = 0) -> str:
+    terms = []
+    for _ in range(rng.randint(1, 6)):
+        if depth < 3 and rng.random() < 0.2:
+            terms.append(f'({_expression(rng, depth + 1)})')
+        else:
+            terms.append(_operand(rng))
+    expression = terms[0]
+    for term in terms[1:]:
+        expression += rng.choice('+-*/') + term
+    return expression
+
+
+def build_corpus(num_formulas: int) -> list[str]:
+    rng = random.Random(SEED)
+    return [_expression(rng) for _ in range(num_formulas)]
+
+
+def main() -> None:
+    num_formulas = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_FORMULAS
+    corpus = build_corpus(num_formulas)
+    evaluator = FormulaEvaluator()
+    num_chars = sum(len(expression) for expression in corpus)
+
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for expression in corpus:
+            evaluator.get_postfix(expression)
+        best = min(best, time.perf_counter() - start)
+
+    print(f'{num_formulas} formulas ({num_chars} characters), best of {REPEATS}: '
+          f'{best:.3f}s ({num_formulas / best:,.0f} formulas/s)')
+
+
+if __name__ == '__main__':
+    main()
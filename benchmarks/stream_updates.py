@@ -0,0 +1,51 @@
+"""
+Measures the time taken by single cell updates inside a large column that
+SUMA, PROMEDIO, MAX and MIN formulas read.
+
+Usage: PYTHONPATH=src:. python benchmarks/stream_updates.py [NUM_ROWS] [NUM_UPDATES]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 100_000
+NUM_UPDATES = 1000
+SEED = 2024
+
+
+def _write_sheet(file_path: str, num_rows: int, rng: random.Random) -> None:
+    column = f'A1:A{num_rows}'
+    with open(file_path, 'w') as file:
+        file.write(f'{rng.uniform(0, 100):.2f};=SUMA({column});=PROMEDIO({column});'
+                   f'=MAX({column});=MIN({column})\n')
+        for _ in range(num_rows - 1):
+            file.write(f'{rng.uniform(0, 100):.2f}\n')
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    num_updates = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_UPDATES
+    rng = random.Random(SEED)
+    controller = ControllerForChecker()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'stream.s2v')
+        _write_sheet(file_path, num_rows, rng)
+        controller.load_spreadsheet_from_file(file_path)
+
+    updates = [(f'A{rng.randint(1, num_rows)}', f'{rng.uniform(0, 100):.2f}')
+               for _ in range(num_updates)]
+    start = time.perf_counter()
+    for cell, value in updates:
+        controller.set_cell_content(cell, value)
+    elapsed = time.perf_counter() - start
+
+    print(f'{num_updates} updates over {num_rows} rows: {elapsed:.3f}s '
+          f'({elapsed / num_updates * 1e6:,.0f}us per update)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from .coordinates import Coordinates
+from .cell_range import CellRange
+from .range_index import RangeSet
+from .functions import Function, Sum, Average, Max, Min
+from .numeric_store import NumericStore
+from .column_summary import NOT_SUMMARIZED
+from .vectorization import total, minimum, maximum, exact_units, units_to_float
+
+MAX_AGGREGATES = 1024
+# Smaller ranges are cheap enough to read on every evaluation
+AGGREGATE_MIN_CELLS = 256
+
+type Bounds = tuple[int, int, int, int]  # (min_row, min_col, max_row, max_col)
+type AggregateKey = tuple[type[Function], int, int, int, int]
+
+
+class Aggregate(ABC):
+    """
+    Result of a function over a range, kept up to date with the changes of
+    the cells in the range. Empty and non-numeric cells have no value (None).
+    """
+
+    @property
+    @abstractmethod
+    def known(self) -> bool:
+        """True if the result is known without looking at the numeric store."""
+        pass
+
+    @abstractmethod
+    def get_value(self, store: NumericStore, bounds: Bounds) -> float:
+        """Returns the result, computing it from the store if it is not known."""
+        pass
+
+    @abstractmethod
+    def update(self, old: float | None, new: float | None) -> None:
+        """Applies the change of a cell of the range."""
+        pass
+
+
+class SumAggregate(Aggregate):
+    """
+    Sum of a range. Its exact sum is taken from the column summaries and
+    tracked as an integer, so each change is applied in O(1) and the result
+    is the same correctly rounded sum a full read gives.
+    """
+
+    def __init__(self) -> None:
+        self._value: float | None = None  # None until computed again
+        self._units: int | None = None  # Exact sum, None if not tracked
+        self._count = 0
+
+    @property
+    def known(self) -> bool:
+        return self._value is not None or self._units is not None
+
+    def _finish(self, total_value: float, count: int) -> float:
+        return total_value
+
+    def get_value(self, store: NumericStore, bounds: Bounds) -> float:
+        if self._value is not None:
+            return self._value
+
+        if self._units is None:
+            summary = store.exact_sum(*bounds)
+            if summary is None:  # Infinities and NaNs are not tracked
+                values = store.read(*bounds)
+                self._value = self._finish(total(values), len(values))
+                return self._value
+            self._units, self._count = summary
+
+        total_value = units_to_float(self._units) if self._count else 0
+        self._value = self._finish(total_value, self._count)
+        return self._value
+
+    def update(self, old: float | None, new: float | None) -> None:
+        self._value = None
+        if self._units is None:
+            return
+        try:
+            if old is not None:
+                self._units -= exact_units(old)
+                self._count -= 1
+            if new is not None:
+                self._units += exact_units(new)
+                self._count += 1
+        except (ValueError, OverflowError):  # Not finite, the range is read again
+            self._units = None
+
+
+class AverageAggregate(SumAggregate):
+    def _finish(self, total_value: float, count: int) -> float:
+        return total_value / count if count else 0.0
+
+
+class ExtremeAggregate(Aggregate):
+    """
+    Maximum or minimum of a range. It is only computed again when the
+    extreme is removed, or when the result depends on the position of the
+    values (NaNs, and 0 and -0, which the builtins resolve by order).
+    """
+
+    _largest: bool
+
+    def __init__(self) -> None:
+        self._known = False
+        self._extreme: float | None = None  # None if the range has no numbers
+
+    @property
+    def known(self) -> bool:
+        return self._known
+
+    @abstractmethod
+    def _reduce(self, values: Sequence[float]) -> float:
+        pass
+
+    @abstractmethod
+    def _beats(self, value: float, extreme: float) -> bool:
+        pass
+
+    def get_value(self, store: NumericStore, bounds: Bounds) -> float:
+        if not self._known:
+            extreme = store.extreme(*bounds, self._largest)
+            if extreme is NOT_SUMMARIZED:
+                values = store.read(*bounds)
+                extreme = self._reduce(values) if len(values) else None
+            self._extreme = extreme
+            self._known = True
+        return self._extreme if self._extreme is not None else 0.0
+
+    def update(self, old: float | None, new: float | None) -> None:
+        if not self._known:
+            return
+        extreme = self._extreme
+        if old is not None and (old == extreme or old != old):
+            # Only known if the new value beats the removed extreme
+            if new is not None and self._beats(new, old):
+                self._extreme = new
+            else:
+                self._known = False
+        elif new is None:
+            return
+        elif new != new or extreme != extreme:
+            self._known = False
+        elif extreme is None or self._beats(new, extreme):
+            self._extreme = new
+        elif new == extreme == 0.0:
+            self._known = False
+
+
+class MaxAggregate(ExtremeAggregate):
+    _largest = True
+
+    def _reduce(self, values: Sequence[float]) -> float:
+        return maximum(values)
+
+    def _beats(self, value: float, extreme: float) -> bool:
+        return value > extreme
+
+
+class MinAggregate(ExtremeAggregate):
+    _largest = False
+
+    def _reduce(self, values: Sequence[float]) -> float:
+        return minimum(values)
+
+    def _beats(self, value: float, extreme: float) -> bool:
+        return value < extreme
+
+
+class AggregateFactory:
+    @staticmethod
+    def create(function: type[Function]) -> Aggregate:
+        if function is Sum:
+            return SumAggregate()
+        if function is Average:
+            return AverageAggregate()
+        if function is Max:
+            return MaxAggregate()
+        if function is Min:
+            return MinAggregate()
+        raise ValueError(f"Unsupported function: {function.__name__}")
+
+
+class AggregateCache:
+    """
+    Aggregates of the large ranges read by single range functions, such as
+    SUMA(A1:A100000), subscribed to the changes of the cells inside them.
+    Bounded LRU, the least recently read aggregates are dropped. Unknown
+    results are computed from the column summaries of the numeric store.
+    Hits count the results already known, misses the ones computed.
+    """
+
+    def __init__(self, max_size: int = MAX_AGGREGATES) -> None:
+        self._aggregates: OrderedDict[AggregateKey, Aggregate] = OrderedDict()
+        self._ranges = RangeSet()
+        self._subscribers: dict[CellRange, dict[AggregateKey, Aggregate]] = {}
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._aggregates)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @staticmethod
+    def _range_of(key: AggregateKey) -> CellRange:
+        _, min_row, min_col, max_row, max_col = key
+        return CellRange(Coordinates(min_row, min_col), Coordinates(max_row, max_col))
+
+    def _subscribe(self, key: AggregateKey) -> Aggregate:
+        aggregate = self._aggregates[key] = AggregateFactory.create(key[0])
+        cell_range = self._range_of(key)
+        subscribers = self._subscribers.get(cell_range)
+        if subscribers is None:
+            subscribers = self._subscribers[cell_range] = {}
+            self._ranges.add(cell_range)
+        subscribers[key] = aggregate
+
+        if len(self._aggregates) > self._max_size:
+            self._unsubscribe(next(iter(self._aggregates)))
+        return aggregate
+
+    def _unsubscribe(self, key: AggregateKey) -> None:
+        del self._aggregates[key]
+        cell_range = self._range_of(key)
+        subscribers = self._subscribers[cell_range]
+        del subscribers[key]
+        if not subscribers:
+            del self._subscribers[cell_range]
+            self._ranges.discard(cell_range)
+
+    def get(self, function: type[Function], min_row: int, min_col: int, max_row: int, max_col: int,
+            store: NumericStore) -> float:
+        """Returns the result of the function over the (inclusive) range."""
+        bounds = (min_row, min_col, max_row, max_col)
+        if (max_row - min_row + 1) * (max_col - min_col + 1) < AGGREGATE_MIN_CELLS:
+            return function.reduce(store.read(*bounds))
+
+        key = (function, *bounds)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            aggregate = self._subscribe(key)
+        else:
+            self._aggregates.move_to_end(key)
+        if aggregate.known:
+            self._hits += 1
+        else:
+            self._misses += 1
+        return aggregate.get_value(store, bounds)
+
+    def update(self, coords: Coordinates, old: float | None, new: float | None) -> None:
+        """Notifies the aggregates of the ranges containing a cell that its value changed."""
+        if old == new and (old is None or math.copysign(1.0, old) == math.copysign(1.0, new)):
+            return  # Same value, 0 and -0 are told apart
+        for cell_range in self._ranges.get_ranges(coords):
+            for aggregate in self._subscribers[cell_range].values():
+                aggregate.update(old, new)
@@ -1,8 +1,15 @@
+from collections.abc import Iterator, Sequence
+
 from .functions import Argument
 from .coordinates import Coordinates
 
 
 class CellRange(Argument):
+    """
+    Rectangular range of cells. Only its corners are stored, the
+    coordinates inside it are produced on demand.
+    """
+
     def __init__(self, start: Coordinates, end: Coordinates) -> None:
         min_row = min(start.row, end.row)
         max_row = max(start.row, end.row)
@@ -13,28 +20,73 @@ class CellRange(Argument):
         self._top_left_corner = Coordinates(min_row, min_col)
         self._bottom_right_corner = Coordinates(max_row, max_col)
 
-        self._coords_in_range: list[Coordinates] = self._list_coords_in_range()
-
     def __repr__(self) -> str:
         return f'{self._top_left_corner}:{self._bottom_right_corner}'
 
-    def _list_coords_in_range(self) -> list[Coordinates]:
-        coords = []
-        for row in range(self._top_left_corner.row, self._bottom_right_corner.row + 1):
-            for col in range(self._top_left_corner.col, self._bottom_right_corner.col + 1):
-                coords.append(Coordinates(row, col))
-        return coords
-
-    def get_all_coords(self) -> list[Coordinates]:
-        return self._coords_in_range
-
-    def evaluate_arg(self, spreadsheet) -> list[float]:
-        values = []
-        coords_list = self.get_all_coords()
-        for coords in coords_list:
-            cell = spreadsheet.get_cell(coords)
-            values.append(cell.get_value_as_float())
-        return values
-
-    def get_dependencies(self) -> set[Coordinates]:
-        return set(self._coords_in_range)
+    def __eq__(self, value) -> bool:
+        return (isinstance(value, CellRange) and
+                value._top_left_corner is self._top_left_corner and
+                value._bottom_right_corner is self._bottom_right_corner)
+
+    def __hash__(self) -> int:
+        return hash((self._top_left_corner, self._bottom_right_corner))
+
+    def __iter__(self) -> Iterator[Coordinates]:
+        """Iterates over the coordinates in the range in row-major order."""
+        min_row, min_col, max_row, max_col = self.get_bounds()
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                yield Coordinates(row, col)
+
+    def __len__(self) -> int:
+        return self.num_rows * self.num_cols
+
+    def __contains__(self, coords: Coordinates) -> bool:
+        return (self._top_left_corner.row <= coords.row <= self._bottom_right_corner.row and
+                self._top_left_corner.col <= coords.col <= self._bottom_right_corner.col)
+
+    @property
+    def top_left(self) -> Coordinates:
+        return self._top_left_corner
+
+    @property
+    def bottom_right(self) -> Coordinates:
+        return self._bottom_right_corner
+
+    @property
+    def num_rows(self) -> int:
+        return self._bottom_right_corner.row - self._top_left_corner.row + 1
+
+    @property
+    def num_cols(self) -> int:
+        return self._bottom_right_corner.col - self._top_left_corner.col + 1
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """Returns (min_row, min_col, max_row, max_col), all inclusive."""
+        return (self._top_left_corner.row, self._top_left_corner.col,
+                self._bottom_right_corner.row, self._bottom_right_corner.col)
+
+    def intersects(self, other: 'CellRange') -> bool:
+        return self.intersection(other) is not None
+
+    def intersection(self, other: 'CellRange') -> 'CellRange | None':
+        """Returns the overlapping range of both ranges, if any."""
+        min_row = max(self._top_left_corner.row, other._top_left_corner.row)
+        min_col = max(self._top_left_corner.col, other._top_left_corner.col)
+        max_row = min(self._bottom_right_corner.row, other._bottom_right_corner.row)
+        max_col = min(self._bottom_right_corner.col, other._bottom_right_corner.col)
+        if min_row > max_row or min_col > max_col:
+            return None
+        return CellRange(Coordinates(min_row, min_col), Coordinates(max_row, max_col))
+
+    def get_all_coords(self) -> Iterator[Coordinates]:
+        return iter(self)
+
+    def evaluate_arg(self, spreadsheet) -> Sequence[float]:
+        return spreadsheet.get_range_values(self._top_left_corner, self._bottom_right_corner)
+
+    def aggregate_arg(self, function, spreadsheet) -> float:
+        return spreadsheet.get_range_aggregate(function, self._top_left_corner, self._bottom_right_corner)
+
+    def get_dependencies(self) -> set['CellRange']:
+        return {self}
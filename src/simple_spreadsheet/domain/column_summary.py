@@ -0,0 +1,174 @@
+import math
+from collections.abc import Callable, Sequence
+
+from .vectorization import minimum, maximum, exact_total
+
+# Rows summarized by each block
+BLOCK_ROWS = 1024
+
+# Returned by queries that must be answered by reading the range
+NOT_SUMMARIZED = object()
+
+type BlockStats = tuple[int | None, int, float, float]  # (exact sum, count, max, min)
+type SparseTable = list[list[float]]
+
+
+def _all_finite(values: Sequence[float]) -> bool:
+    """False if there are infinities or NaNs. Also False if a huge sum overflows."""
+    return math.isfinite(sum(values))
+
+
+def _build_table(values: list[float], combine: Callable[[float, float], float]) -> SparseTable:
+    """Sparse table, row k holds the combination of each run of 2**k values."""
+    table = [values]
+    span = 1
+    while 2 * span <= len(values):
+        previous = table[-1]
+        table.append([combine(previous[i], previous[i + span])
+                      for i in range(len(previous) - span)])
+        span *= 2
+    return table
+
+
+def _query_table(table: SparseTable, first: int, last: int,
+                 combine: Callable[[float, float], float]) -> float:
+    """Combination of the values in [first, last), two overlapping runs cover them."""
+    level = (last - first).bit_length() - 1
+    row = table[level]
+    return combine(row[first], row[last - (1 << level)])
+
+
+class ColumnSummary:
+    """
+    Statistics of a numeric column per block of rows, built lazily and
+    invalidated by edits: exact sums and counts of numbers, with their prefix
+    sums over blocks, and sparse tables over the maxima and minima of the
+    blocks. Ranges are answered from the blocks they cover in O(1), only
+    their partial blocks at both ends are read.
+    """
+
+    def __init__(self, read: Callable[[int, int], Sequence[float]]) -> None:
+        self._read = read
+        self._blocks: list[BlockStats] = []
+        self._edited: set[int] = set()  # Blocks to compute again
+        # Prefix sums over blocks [0, i), valid for i <= _num_prefixed
+        self._prefix_units = [0]
+        self._prefix_counts = [0]
+        self._prefix_irregular = [0]
+        self._num_prefixed = 0
+        self._max_table: SparseTable | None = None
+        self._min_table: SparseTable | None = None
+
+    def invalidate(self, row: int) -> None:
+        block = row // BLOCK_ROWS
+        if block < len(self._blocks):
+            self._edited.add(block)
+            self._num_prefixed = min(self._num_prefixed, block)
+            self._max_table = self._min_table = None
+
+    def invalidate_rows(self, start: int, stop: int) -> None:
+        """Invalidates the blocks of rows [start, stop)."""
+        first = start // BLOCK_ROWS
+        if start < stop and first < len(self._blocks):
+            self._edited.update(range(first, min((stop - 1) // BLOCK_ROWS + 1, len(self._blocks))))
+            self._num_prefixed = min(self._num_prefixed, first)
+            self._max_table = self._min_table = None
+
+    def _compute_block(self, block: int) -> BlockStats:
+        values = self._read(block * BLOCK_ROWS, (block + 1) * BLOCK_ROWS)
+        if not values:
+            return 0, 0, -math.inf, math.inf
+        try:
+            units = exact_total(values)
+        except (ValueError, OverflowError):  # Infinities and NaNs are not summarized
+            return None, len(values), -math.inf, math.inf
+        return units, len(values), maximum(values), minimum(values)
+
+    def _ensure_blocks(self, num_blocks: int) -> None:
+        """Computes the missing statistics and prefix sums of blocks [0, num_blocks)."""
+        blocks = self._blocks
+        recomputed = [block for block in self._edited if block < num_blocks]
+        for block in recomputed:
+            blocks[block] = self._compute_block(block)
+            self._edited.discard(block)
+        if recomputed:  # The tables may have been built while these blocks were stale
+            self._max_table = self._min_table = None
+        while len(blocks) < num_blocks:
+            blocks.append(self._compute_block(len(blocks)))
+
+        if self._num_prefixed < num_blocks:
+            del self._prefix_units[self._num_prefixed + 1:]
+            del self._prefix_counts[self._num_prefixed + 1:]
+            del self._prefix_irregular[self._num_prefixed + 1:]
+            for units, count, _, _ in blocks[self._num_prefixed:num_blocks]:
+                self._prefix_units.append(self._prefix_units[-1] + (units or 0))
+                self._prefix_counts.append(self._prefix_counts[-1] + count)
+                self._prefix_irregular.append(self._prefix_irregular[-1] + (units is None))
+            self._num_prefixed = num_blocks
+
+    def _full_blocks(self, start: int, stop: int) -> tuple[int, int]:
+        """Blocks entirely inside rows [start, stop), as [first, last)."""
+        return -(-start // BLOCK_ROWS), stop // BLOCK_ROWS
+
+    def exact_sum(self, start: int, stop: int) -> tuple[int, int] | object:
+        """
+        Exact sum (in units of 2**-1074) and count of the numbers in rows
+        [start, stop). NOT_SUMMARIZED if there are infinities or NaNs.
+        """
+        first, last = self._full_blocks(start, stop)
+        if first >= last:
+            parts = [(start, stop)]
+            units = count = 0
+        else:
+            self._ensure_blocks(last)
+            if self._prefix_irregular[last] != self._prefix_irregular[first]:
+                return NOT_SUMMARIZED
+            units = self._prefix_units[last] - self._prefix_units[first]
+            count = self._prefix_counts[last] - self._prefix_counts[first]
+            parts = [(start, first * BLOCK_ROWS), (last * BLOCK_ROWS, stop)]
+
+        for part_start, part_stop in parts:
+            values = self._read(part_start, part_stop)
+            try:
+                units += exact_total(values)
+            except (ValueError, OverflowError):
+                return NOT_SUMMARIZED
+            count += len(values)
+        return units, count
+
+    def extreme(self, start: int, stop: int, largest: bool) -> float | None | object:
+        """
+        Maximum (or minimum) of the numbers in rows [start, stop), None if there
+        are none. NOT_SUMMARIZED if there are infinities or NaNs, or if it is 0.
+        """
+        combine, reduce = (max, maximum) if largest else (min, minimum)
+        first, last = self._full_blocks(start, stop)
+        candidates = []
+        if first >= last:
+            parts = [(start, stop)]
+        else:
+            self._ensure_blocks(last)
+            if self._prefix_irregular[last] != self._prefix_irregular[first]:
+                return NOT_SUMMARIZED
+            if self._max_table is None:
+                self._max_table = _build_table([block[2] for block in self._blocks], max)
+                self._min_table = _build_table([block[3] for block in self._blocks], min)
+            table = self._max_table if largest else self._min_table
+            if len(table[0]) < last:  # Blocks computed after the tables were built
+                self._max_table = self._min_table = None
+                return self.extreme(start, stop, largest)
+            if self._prefix_counts[last] != self._prefix_counts[first]:
+                candidates.append(_query_table(table, first, last, combine))
+            parts = [(start, first * BLOCK_ROWS), (last * BLOCK_ROWS, stop)]
+
+        for part_start, part_stop in parts:
+            values = self._read(part_start, part_stop)
+            if not _all_finite(values):
+                return NOT_SUMMARIZED
+            if values:
+                candidates.append(reduce(values))
+        if not candidates:
+            return None
+        result = reduce(candidates)
+        # The builtins return the first of 0 and -0, only a read tells which one
+        return result if result != 0.0 else NOT_SUMMARIZED
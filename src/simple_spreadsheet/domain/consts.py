@@ -1,2 +1,10 @@
+# Default dimensions of a new spreadsheet
 NUM_ROWS = 100
 NUM_COLS = 100
+
+# Bits reserved for the column index when packing coordinates into an int key
+COL_KEY_BITS = 14
+
+# Hard limits any spreadsheet can grow to
+MAX_ROWS = 1_048_576
+MAX_COLS = 1 << COL_KEY_BITS
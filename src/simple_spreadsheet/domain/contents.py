@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
-from .formula_components import FormulaComponent, Operand
+from .formula_components import Operand
 from .functions import Argument
 from .coordinates import Coordinates
 
+if TYPE_CHECKING:
+    from .formula_evaluation.program import Program
+
 
 class Content(ABC):
     """Base class for cell contents."""
@@ -43,7 +47,8 @@ class Formula(Content):
             raise ValueError('Expression must be a string')
 
         self._expression = expression[1:]
-        self._postfix = None
+        self._program = None
+        self._origin = None
         self._value = None
 
     def set_expression(self, expression: str) -> None:
@@ -56,11 +61,17 @@ class Formula(Content):
     def __str__(self) -> str:
         return self.expression
 
-    def set_postfix(self, postfix: list[FormulaComponent]) -> None:
-        self._postfix = postfix
+    def set_program(self, program: 'Program', origin: Coordinates) -> None:
+        """Sets the (possibly shared) program of the formula and the cell it is in."""
+        self._program = program
+        self._origin = origin
+
+    def get_program(self) -> 'Program | None':
+        return self._program
 
-    def get_postfix(self) -> list[FormulaComponent]:
-        return self._postfix
+    @property
+    def origin(self) -> Coordinates | None:
+        return self._origin
 
     def set_value(self, value: float) -> None:
         self._value = value
@@ -69,11 +80,7 @@ class Formula(Content):
         return '=' + self._expression.replace(";", ",")
 
     def get_dependencies(self) -> set[Coordinates]:
-        dependencies = set()
-        for component in self._postfix:
-            dependencies.update(component.get_dependencies())
-
-        return dependencies
+        return self._program.get_dependencies(self._origin)
 
     def is_formula(self) -> bool:
         return True
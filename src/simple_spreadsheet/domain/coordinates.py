@@ -1,14 +1,20 @@
 import re
+import weakref
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from .formula_components import Operand
 from .functions import Argument
-from .consts import NUM_ROWS, NUM_COLS
+from .consts import MAX_ROWS, MAX_COLS, COL_KEY_BITS
 
 if TYPE_CHECKING:
     from .spreadsheet import Spreadsheet
 
 ABC_LEN = 26
+CELL_ID_CACHE_SIZE = 65_536
+
+_CELL_ID_PATTERN = re.compile(r'([A-Z]+)([0-9]+)')
 
 
 class BadCoordinateException(Exception):
@@ -38,69 +44,120 @@ class Column:
         return letters
 
 
+class ColumnLabels(Sequence[str]):
+    """Lazy sequence of column labels ('A', 'B', ...), computed on access."""
+
+    def __init__(self, num_cols: int) -> None:
+        self._num_cols = num_cols
+
+    def __len__(self) -> int:
+        return self._num_cols
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._num_cols))]
+        if index < 0:
+            index += self._num_cols
+        if not 0 <= index < self._num_cols:
+            raise IndexError('Column index out of range')
+        return Column.letters_from_number(index)
+
+
 class Coordinates(Operand, Argument):
-    def __init__(self, row: int, col: int) -> None:
-        self._row = row
-        self._col = col
-        self._is_in_range()
-        self._id = self._parse_indices(row, col)
+    """
+    Immutable cell coordinates. Instances are interned, so every (row, col)
+    pair maps to a single shared object while it is in use.
+    """
+    __slots__ = ('_row', '_col', '_key', '_id', '__weakref__')
+
+    # Weak, coordinates no longer referenced (e.g. visited in a range) are freed
+    _instances: weakref.WeakValueDictionary[int, 'Coordinates'] = weakref.WeakValueDictionary()
+
+    def __new__(cls, row: int, col: int) -> 'Coordinates':
+        if not (0 <= row < MAX_ROWS and 0 <= col < MAX_COLS):
+            raise BadCoordinateException('Cell out of range')
+
+        key = (row << COL_KEY_BITS) | col
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            object.__setattr__(instance, '_row', row)
+            object.__setattr__(instance, '_col', col)
+            object.__setattr__(instance, '_key', key)
+            object.__setattr__(instance, '_id', None)
+            cls._instances[key] = instance
+        return instance
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError('Coordinates are immutable')
+
+    def __reduce__(self) -> tuple:
+        return Coordinates, (self._row, self._col)
 
     def __repr__(self) -> str:
-        return self._id
+        return self.id
 
     @classmethod
     def from_id(cls, cell_id: str) -> 'Coordinates':
         if not isinstance(cell_id, str):
             raise BadCoordinateException(f"Expected cell_id to be a string, got {
                 type(cell_id).__name__}")
-        cell_id = cell_id.upper()
-        cls.is_valid_id(cell_id)
-        row, col = cls.parse_id(cell_id)
-        return cls(row, col)
+        return _coordinates_from_id(cell_id)
 
     @staticmethod
     def is_valid_id(cell_id: str) -> None:
-        if not re.match(r'^[A-Z]+[0-9]+$', cell_id):
+        if not _CELL_ID_PATTERN.fullmatch(cell_id):
             raise BadCoordinateException(f'Invalid cell ID ({cell_id})')
 
     @staticmethod
     def parse_id(cell_id: str) -> tuple[int, int]:
-        col_str = ''.join(filter(str.isalpha, cell_id))
-        row_str = ''.join(filter(str.isdigit, cell_id))
+        match = _CELL_ID_PATTERN.fullmatch(cell_id)
+        if match is None:
+            raise BadCoordinateException(f'Invalid cell ID ({cell_id})')
 
-        row = int(row_str) - 1
-        col = Column.number_from_letters(col_str)
+        row = int(match[2]) - 1
+        col = Column.number_from_letters(match[1])
 
         return row, col
 
     def __eq__(self, value) -> bool:
-        return isinstance(value, Coordinates) and value.get_indices() == self.get_indices()
+        return self is value or (isinstance(value, Coordinates) and value._key == self._key)
 
     def __hash__(self) -> int:
-        return hash(self.get_indices())
-
-    def _is_in_range(self) -> None:
-        if not (0 <= self._row < NUM_ROWS and 0 <= self._col < NUM_COLS):
-            raise BadCoordinateException('Cell out of range')
-
-    def _parse_indices(self, row: int, col: int) -> str:
-        return Column.letters_from_number(col) + str(row + 1)
+        return self._key
 
     def get_indices(self) -> tuple[int, int]:
         return self._row, self._col
 
+    @property
+    def key(self) -> int:
+        """Returns the row-major packed integer key of the coordinates."""
+        return self._key
+
+    @classmethod
+    def from_key(cls, key: int) -> 'Coordinates':
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls(key >> COL_KEY_BITS, key & (MAX_COLS - 1))
+        return instance
+
     def get_dependencies(self) -> set['Coordinates']:
         return {self}
 
     def evaluate(self, spreadsheet) -> float:
-        return spreadsheet.get_cell(self).get_value_as_float()
+        return spreadsheet.get_number(self)
 
     def evaluate_arg(self, spreadsheet: 'Spreadsheet') -> list[float]:
-        return [self.evaluate(spreadsheet)]
+        value = self.evaluate(spreadsheet)
+        return [value] if value is not None else []
 
     @property
     def id(self) -> str:
-        return self._id
+        cell_id = self._id
+        if cell_id is None:  # Computed lazily, most coordinates are never printed
+            cell_id = Column.letters_from_number(self._col) + str(self._row + 1)
+            object.__setattr__(self, '_id', cell_id)
+        return cell_id
 
     @property
     def row(self) -> int:
@@ -111,3 +168,9 @@ class Coordinates(Operand, Argument):
     def col(self) -> int:
         """Returns the column index (zero-based)."""
         return self._col
+
+
+@lru_cache(maxsize=CELL_ID_CACHE_SIZE)
+def _coordinates_from_id(cell_id: str) -> Coordinates:
+    row, col = Coordinates.parse_id(cell_id.upper())
+    return Coordinates(row, col)
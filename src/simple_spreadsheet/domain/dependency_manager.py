@@ -1,4 +1,10 @@
+from collections.abc import Iterable
+
 from .coordinates import Coordinates
+from .cell_range import CellRange
+from .range_index import RangeIndex
+
+type Dependency = Coordinates | CellRange
 
 
 class CircularDependencyException(Exception):
@@ -11,59 +17,115 @@ class CircularDependencyException(Exception):
 
 class DependencyManager:
     def __init__(self) -> None:
-        self._dependencies = {}
-
-    def _register_dependencies(self, cell: Coordinates, depends_on: list[Coordinates] | None) -> None:
-        if depends_on is None:
+        # Forward map: cell -> cells and ranges it depends on
+        self._precedents: dict[Coordinates, set[Dependency]] = {}
+        # Reverse map: cell -> cells that depend on it directly
+        self._dependents: dict[Coordinates, set[Coordinates]] = {}
+        # Ranges are kept as rectangles in a spatial index
+        self._range_index = RangeIndex()
+
+    def _register_dependencies(self, cell: Coordinates, depends_on: set[Dependency] | None) -> None:
+        if not depends_on:
             return
+        self._precedents[cell] = set(depends_on)
         for dependency in depends_on:
-            if dependency not in self._dependencies:
-                self._dependencies[dependency] = []
-            self._dependencies[dependency].append(cell)
+            if isinstance(dependency, CellRange):
+                self._range_index.add(dependency, cell)
+                continue
+            dependents = self._dependents.get(dependency)
+            if dependents is None:
+                dependents = self._dependents[dependency] = set()
+            dependents.add(cell)
 
     def _remove_dependencies(self, cell) -> None:
-        for dependency in self._dependencies:
-            if cell in self._dependencies[dependency]:
-                self._dependencies[dependency].remove(cell)
+        """Removes the edges of a cell, only touching its own precedents."""
+        for dependency in self._precedents.pop(cell, ()):
+            if isinstance(dependency, CellRange):
+                self._range_index.remove(dependency, cell)
+                continue
+            dependents = self._dependents[dependency]
+            dependents.discard(cell)
+            if not dependents:
+                del self._dependents[dependency]
 
     def set_dependencies(self, cell, depends_on) -> None:
         self._remove_dependencies(cell)
         self._register_dependencies(cell, depends_on)
 
-    def get_dependents(self, cell: Coordinates) -> list[Coordinates]:
-        return self._dependencies.get(cell, [])
+    def get_precedents(self, cell: Coordinates) -> set[Dependency]:
+        return self._precedents.get(cell, set())
+
+    def get_dependents(self, cell: Coordinates) -> set[Coordinates]:
+        """Returns the cells that depend on the given cell. The result must not be modified."""
+        dependents = self._dependents.get(cell, set())
+        range_dependents = self._range_index.get_dependents(cell)
+        if not range_dependents:
+            return dependents
+        return dependents.union(range_dependents)
+
+    @staticmethod
+    def _is_covered_by(cell: Coordinates, depends_on: set[Dependency]) -> bool:
+        """Checks if a cell is one of the given dependencies or lies inside one of their ranges."""
+        return any(cell in dependency if isinstance(dependency, CellRange) else cell == dependency
+                   for dependency in depends_on)
 
     def _raise_circular_exception(self, cell: Coordinates) -> None:
         raise CircularDependencyException(
             f"Circular dependency detected when trying to set {cell}")
 
-    def has_circular_dependency(self, start: Coordinates, depends_on: list[Coordinates]) -> None:
+    def has_circular_dependency(self, start: Coordinates, depends_on: set[Dependency]) -> None:
+        """
+        Raises CircularDependencyException if making `start` depend on `depends_on`
+        would close a cycle. Only the cells downstream of `start` are searched,
+        looking for one of its new precedents.
+        """
         if not depends_on:
             return
 
-        temp_dependencies = self._dependencies.copy()
+        if self._is_covered_by(start, depends_on):
+            self._raise_circular_exception(start)
 
-        for dependency in depends_on:
-            if dependency not in temp_dependencies:
-                temp_dependencies[dependency] = []
-            temp_dependencies[dependency].append(start)
-
-        visited = set()
-        stack = set()
-
-        def visit(cell) -> bool:
-            if cell in stack:
-                self._raise_circular_exception(start)
-                return
-            if cell in visited:
-                return
-
-            visited.add(cell)
-            stack.add(cell)
-            for neighbor in temp_dependencies.get(cell, []):
-                if visit(neighbor):
-                    return self._raise_circular_exception(start)
-            stack.remove(cell)
+        # Cells without precedents can not depend on start, so they never close a cycle
+        targets = {dependency for dependency in depends_on
+                   if isinstance(dependency, CellRange) or dependency in self._precedents}
+        if not targets:
             return
 
-        return visit(start)
+        visited = {start}
+        pending = [start]
+        while pending:
+            cell = pending.pop()
+            for dependent in self.get_dependents(cell):
+                if dependent in visited:
+                    continue
+                if self._is_covered_by(dependent, targets):
+                    self._raise_circular_exception(start)
+                visited.add(dependent)
+                pending.append(dependent)
+
+    def check_cycles(self, cells: Iterable[Coordinates]) -> None:
+        """
+        Raises CircularDependencyException if one of the given cells lies on a
+        cycle of the current graph. Used after several cells have their
+        dependencies changed at once, only those cells can close a cycle.
+        """
+        done = set()
+        for root in cells:
+            if root in done:
+                continue
+            # Iterative depth-first search, a cell found again on the path closes a cycle
+            on_path = {root}
+            stack = [(root, iter(self.get_dependents(root)))]
+            while stack:
+                cell, dependents = stack[-1]
+                for dependent in dependents:
+                    if dependent in on_path:
+                        self._raise_circular_exception(root)
+                    if dependent not in done:
+                        on_path.add(dependent)
+                        stack.append((dependent, iter(self.get_dependents(dependent))))
+                        break
+                else:
+                    stack.pop()
+                    on_path.discard(cell)
+                    done.add(cell)
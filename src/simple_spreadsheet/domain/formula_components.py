@@ -8,6 +8,7 @@ if TYPE_CHECKING:
 
 class FormulaComponent(ABC):
     """Base class for formula components."""
+    __slots__ = ()
 
     @abstractmethod
     def accept(self, visitor: 'Visitor') -> None:
@@ -19,6 +20,7 @@ class FormulaComponent(ABC):
 
 class Operand(FormulaComponent):
     """Base class for formula operands."""
+    __slots__ = ()
 
     @abstractmethod
     def evaluate(self) -> float:
@@ -0,0 +1,226 @@
+from collections import Counter
+from collections.abc import Callable
+from functools import lru_cache
+
+from ..formula_components import FormulaComponent
+from ..coordinates import Coordinates
+from ..cell_range import CellRange
+from ..functions import Function, Argument
+from ..contents import Number
+from .visitor import Visitor
+from .program import CompiledProgram, RelativeReference, RelativeRange
+
+FACTORY_CACHE_SIZE = 1024
+# Python refuses to compile more than 200 nested parentheses
+MAX_NESTING = 190
+# Parentheses and brackets opened by each level of function calls
+FUNCTION_NESTING = 4
+
+# Operators evaluated inline, any other operator falls back to its _compute method
+INLINE_OPERATORS = {
+    '+': '({} + {})',
+    '-': '({} - {})',
+    '*': '({} * {})',
+}
+
+
+def _present(value: float | None) -> tuple[float, ...]:
+    """Values of a single cell argument, empty cells contribute no value."""
+    return () if value is None else (value,)
+
+
+@lru_cache(maxsize=FACTORY_CACHE_SIZE)
+def _build_factory(expression: str, num_bindings: int) -> Callable[..., Callable]:
+    """
+    Generates the code of an expression once. Programs with the same code
+    only differ in the constants bound to it.
+    """
+    params = ', '.join(f'b{i}' for i in range(num_bindings))
+    source = (f'def _factory({params}):\n'
+              f'    def _formula(spreadsheet, r, c):\n'
+              f'        _get = spreadsheet.get_number_at\n'
+              f'        _range = spreadsheet.get_range_values_at\n'
+              f'        _aggregate = spreadsheet.get_range_aggregate_at\n'
+              f'        return {expression}\n'
+              f'    return _formula\n')
+    namespace = {'_present': _present}
+    exec(compile(source, '<formula>', 'exec'), namespace)
+    return namespace['_factory']
+
+
+class NotCompilableError(Exception):
+    def __init__(self) -> None:
+        Exception.__init__(self)
+
+    def __init__(self, msg) -> None:
+        Exception.__init__(self, msg)
+
+
+class Compiler(Visitor):
+    """
+    Compiles postfix expressions into Python functions of the spreadsheet and
+    the position of the formula. References are turned into offsets from that
+    position, so the program can be shared by formulas of the same shape.
+    Intermediate results are plain floats, no formula components are
+    involved at evaluation.
+    """
+
+    def __init__(self) -> None:
+        self._stack: list[tuple[str, bool, int]] = []  # (source, may be None, nesting)
+        self._bindings: list = []
+        self._num_temps = 0
+        self._origin: Coordinates | None = None
+        self._references: list[RelativeReference] = []
+        self._ranges: list[RelativeRange] = []
+        self._uses: Counter[int] = Counter()
+        self._names: dict[int, str] = {}
+
+    @staticmethod
+    def _count_uses(postfix: list[FormulaComponent]) -> Counter[int]:
+        """Counts the occurrences of each function call and range, by identity."""
+        uses = Counter()
+        pending = list(postfix)
+        while pending:
+            component = pending.pop()
+            if isinstance(component, (Function, CellRange)):
+                uses[id(component)] += 1
+                if isinstance(component, Function) and uses[id(component)] == 1:
+                    pending.extend(component.args)
+        return uses
+
+    def _share(self, component: FormulaComponent, source: Callable[[], str]) -> str:
+        """
+        Components used more than once (see Optimizer) are evaluated the first
+        time and kept in a local variable for the next ones.
+        """
+        if self._uses[id(component)] < 2:
+            return source()
+        name = self._names.get(id(component))
+        if name is None:
+            name = self._names[id(component)] = f's{len(self._names)}'
+            return f'({name} := {source()})'
+        return name
+
+    def _bind(self, value) -> str:
+        """Binds a constant to the generated code and returns its name."""
+        name = f'b{len(self._bindings)}'
+        self._bindings.append(value)
+        return name
+
+    @staticmethod
+    def _offset(name: str, delta: int) -> str:
+        if delta == 0:
+            return name
+        return f'{name} + {delta}' if delta > 0 else f'{name} - {-delta}'
+
+    def _reference_source(self, coords: Coordinates) -> str:
+        d_row, d_col = coords.row - self._origin.row, coords.col - self._origin.col
+        self._references.append((d_row, d_col))
+        return f"_get({self._offset('r', d_row)}, {self._offset('c', d_col)})"
+
+    def _range_bounds(self, cell_range: CellRange) -> str:
+        """Source of the bounds of a range, as arguments of the spreadsheet's range methods."""
+        min_row, min_col, max_row, max_col = cell_range.get_bounds()
+        bounds = (min_row - self._origin.row, min_col - self._origin.col,
+                  max_row - self._origin.row, max_col - self._origin.col)
+        self._ranges.append(bounds)
+        top, left, bottom, right = bounds
+        return (f"{self._offset('r', top)}, {self._offset('c', left)}, "
+                f"{self._offset('r', bottom)}, {self._offset('c', right)}")
+
+    def _range_source(self, cell_range: CellRange) -> str:
+        return f'_range({self._range_bounds(cell_range)})'
+
+    def _argument_source(self, arg: Argument, nesting: int) -> str:
+        """Source of an expression returning the values of a function argument."""
+        if isinstance(arg, Number):
+            return f'({self._bind(arg.evaluate(None))},)'
+        if isinstance(arg, Coordinates):
+            return f'_present({self._reference_source(arg)})'
+        if isinstance(arg, CellRange):
+            return self._share(arg, lambda: self._range_source(arg))
+        if isinstance(arg, Function):
+            return f'({self._share(arg, lambda: self._function_source(arg, nesting))},)'
+        raise NotCompilableError(f"Unsupported argument: {arg}")
+
+    def _function_source(self, function: Function, nesting: int = 0) -> str:
+        nesting += FUNCTION_NESTING
+        if nesting > MAX_NESTING:
+            raise NotCompilableError("Formula nested too deeply")
+        if len(function.args) == 1 and isinstance(function.args[0], CellRange):
+            # Results over large ranges are kept up to date by the spreadsheet
+            return f'_aggregate({self._bind(type(function))}, {self._range_bounds(function.args[0])})'
+        args = [self._argument_source(arg, nesting) for arg in function.args]
+        values = args[0] if len(args) == 1 else \
+            '[' + ', '.join(f'*{arg}' for arg in args) + ']'
+        return f'{self._bind(type(function))}.reduce({values})'
+
+    def _as_number(self, source: str, may_be_none: bool, nesting: int) -> tuple[str, int]:
+        """Empty cells are taken as 0 by the operators."""
+        if not may_be_none:
+            return source, nesting
+        temp = f't{self._num_temps}'
+        self._num_temps += 1
+        return f'(0.0 if ({temp} := {source}) is None else {temp})', nesting + 2
+
+    def visit_operand(self, operand: FormulaComponent) -> None:
+        if isinstance(operand, Number):
+            self._stack.append((self._bind(operand.evaluate(None)), False, 0))
+        elif isinstance(operand, Coordinates):
+            self._stack.append((self._reference_source(operand), True, 1))
+        elif isinstance(operand, Function):
+            source = self._share(operand, lambda: self._function_source(operand))
+            self._stack.append((source, False, FUNCTION_NESTING))
+        else:
+            raise NotCompilableError(f"Unsupported operand: {operand}")
+
+    def visit_operator(self, operator: FormulaComponent) -> None:
+        if len(self._stack) < 2:
+            raise ValueError("Invalid postfix expression.")
+        right, right_nesting = self._as_number(*self._stack.pop())
+        left, left_nesting = self._as_number(*self._stack.pop())
+        nesting = max(left_nesting, right_nesting) + 1
+        if nesting > MAX_NESTING:
+            raise NotCompilableError("Formula nested too deeply")
+
+        template = INLINE_OPERATORS.get(operator.symbol)
+        if template is None:
+            template = f'{self._bind(operator)}._compute({{}}, {{}})'
+        self._stack.append((template.format(left, right), False, nesting))
+
+    def visit_opening_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def visit_closing_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def compile(self, postfix: list[FormulaComponent], origin: Coordinates) -> CompiledProgram | None:
+        """
+        Compiles the postfix expression of the formula located at `origin`.
+        Returns None if it can not be compiled, e.g. if it is nested too
+        deeply for Python to compile it.
+        """
+        self._stack = []
+        self._bindings = []
+        self._num_temps = 0
+        self._origin = origin
+        self._references = []
+        self._ranges = []
+        self._uses = self._count_uses(postfix)
+        self._names = {}
+
+        try:
+            for component in postfix:
+                component.accept(self)
+        except NotCompilableError:
+            return None
+
+        if len(self._stack) != 1:
+            raise ValueError("Invalid postfix expression.")
+
+        expression, _, _ = self._stack.pop()
+        try:
+            factory = _build_factory(expression, len(self._bindings))
+        except (SyntaxError, RecursionError, MemoryError):
+            return None
+        return CompiledProgram(factory(*self._bindings), self._references, self._ranges)
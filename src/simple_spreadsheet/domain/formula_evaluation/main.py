@@ -1,11 +1,15 @@
+from array import array
 
 from .tokenizer import Tokenizer
-from .validator import Validator
 from .parser import Parser
-from .converter import Converter
-from .postfix_evaluator import PostfixEvaluator
+from .optimizer import Optimizer
+from .compiler import Compiler
+from .vector_compiler import VectorCompiler
+from .program import InterpretedProgram
+from .program_cache import ProgramCache
 
-from ..contents import Formula
+from ..contents import Content, Formula
+from ..coordinates import Coordinates
 from ..formula_components import FormulaComponent
 from ..spreadsheet import Spreadsheet
 
@@ -13,23 +17,63 @@ from ..spreadsheet import Spreadsheet
 class FormulaEvaluator:
     def __init__(self) -> None:
         self._tokenizer = Tokenizer()
-        self._validator = Validator()
         self._parser = Parser()
-        self._converter = Converter()
+        self._optimizer = Optimizer()
+        self._compiler = Compiler()
+        self._vector_compiler = VectorCompiler()
+        self._programs = ProgramCache()
+        # Nodes removed from the formula in each cell, recorded once it is set in the cell
+        self._eliminated_nodes: dict[Coordinates, int] = {}
 
-    def get_postfix(self, formula: Formula) -> list[FormulaComponent]:
-        postfix = formula.get_postfix()
-        if postfix is None:
-            expression = formula.expression[1:]  # remove '='
-            tokens = self._tokenizer.tokenize(expression)
-            self._validator.has_syntax_error(tokens)
-            components = self._parser.tokens_to_components(tokens)
-            postfix = self._converter.infix_to_postfix(components)
-            formula.set_postfix(postfix)
+    def get_postfix(self, expression: str) -> list[FormulaComponent]:
+        tokens = self._tokenizer.tokenize(expression)
+        return self._parser.parse(tokens)
 
-        return postfix
+    def compile(self, formula: Formula, origin: Coordinates) -> None:
+        """
+        Prepares the formula located at `origin` for evaluation. Formulas with
+        the same relative shape share a single compiled program.
+        """
+        expression = formula.expression[1:]  # remove '='
+        key = self._programs.shape_key(expression, origin)
+        program = self._programs.get(key) if key is not None else None
+        if program is None:
+            postfix = self._optimizer.optimize(self.get_postfix(expression))
+            program = self._compiler.compile(postfix, origin)
+            if program is None:  # Not compilable, interpret the postfix instead
+                program = InterpretedProgram(postfix)
+            elif key is not None:  # Shared by fill-down runs, which may be vectorized
+                vector = self._vector_compiler.compile(postfix, origin)
+                if vector is not None:
+                    program.set_run_function(*vector)
+                self._programs.put(key, program)
+            program.eliminated_nodes = self._optimizer.get_eliminated_nodes()
+        formula.set_program(program, origin)
+
+    def record(self, origin: Coordinates, content: Content | None) -> None:
+        """
+        Tells the content set in a cell, once the edit is accepted. Formulas
+        compiled for edits that are then rejected are not counted.
+        """
+        program = content.get_program() if content is not None and content.is_formula() else None
+        if program is not None and program.eliminated_nodes:
+            self._eliminated_nodes[origin] = program.eliminated_nodes
+        else:
+            self._eliminated_nodes.pop(origin, None)
+
+    @property
+    def eliminated_nodes(self) -> int:
+        """Formula nodes removed by the optimizer, over the formula set in each cell."""
+        return sum(self._eliminated_nodes.values())
 
     def evaluate(self, formula: Formula, spreadsheet: Spreadsheet) -> None:
-        postfix = self.get_postfix(formula)
-        value = PostfixEvaluator(spreadsheet).evaluate(postfix)
+        value = formula.get_program().evaluate(spreadsheet, formula.origin)
         formula.set_value(value)
+
+    def evaluate_run(self, formula: Formula, num_rows: int, spreadsheet: Spreadsheet) -> array | None:
+        """
+        Evaluates the `num_rows` formulas of a run down a column, sharing the
+        program of its first `formula`. Returns their values, None if they
+        must be evaluated one by one.
+        """
+        return formula.get_program().evaluate_run(spreadsheet, formula.origin, num_rows)
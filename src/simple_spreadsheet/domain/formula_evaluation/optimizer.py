@@ -0,0 +1,132 @@
+from ..formula_components import FormulaComponent
+from ..functions import Argument, Function
+from ..cell_range import CellRange
+from ..contents import Number
+from .visitor import Visitor
+
+# Marks subexpressions whose value is only known at evaluation
+_NOT_CONSTANT = object()
+
+
+class Optimizer(Visitor):
+    """
+    Optimization pass run on the postfix expression of a formula after parsing.
+
+    Arithmetic on constants is folded into a single number, as are functions
+    whose arguments are all constants. Identical function calls and ranges
+    are replaced by a single shared component, so the backends evaluate them
+    once per recalculation. Only exact rewrites are done, operations are
+    never reassociated.
+    """
+
+    def __init__(self) -> None:
+        self._output: list[FormulaComponent] = []
+        # (start of the subexpression in the output, its value if constant)
+        self._stack: list[tuple[int, object]] = []
+        self._functions: dict[tuple, Function] = {}
+        self._ranges: dict[CellRange, CellRange] = {}
+        self._eliminated = 0
+
+    @staticmethod
+    def count_nodes(component: FormulaComponent) -> int:
+        """Number of nodes of a component, function arguments included."""
+        if isinstance(component, Function):
+            return 1 + sum(Optimizer.count_nodes(arg) for arg in component.args)
+        return 1
+
+    def _share_range(self, cell_range: CellRange) -> tuple[CellRange, int]:
+        shared = self._ranges.setdefault(cell_range, cell_range)
+        return shared, 0 if shared is cell_range else 1
+
+    def _optimize_function(self, function: Function) -> tuple[Argument, object, int]:
+        """
+        Returns the optimized function or the number it folds to, its value if
+        constant and the number of nodes eliminated.
+        """
+        args = []
+        key = [type(function)]
+        eliminated = 0
+        constant = True
+        for arg in function.args:
+            if isinstance(arg, Function):
+                arg, value, arg_eliminated = self._optimize_function(arg)
+                eliminated += arg_eliminated
+            elif isinstance(arg, CellRange):
+                arg, arg_eliminated = self._share_range(arg)
+                eliminated += arg_eliminated
+            constant = constant and isinstance(arg, Number)
+            args.append(arg)
+            # Numbers are keyed by their exact representation, so 0 and -0 differ
+            key.append(arg.evaluate(None).hex() if isinstance(arg, Number) else arg)
+
+        if constant:
+            value = function.evaluate(None)
+            return Number(value), value, self.count_nodes(function) - 1
+
+        key = tuple(key)
+        shared = self._functions.get(key)
+        if shared is not None:  # The whole call is evaluated once
+            return shared, _NOT_CONSTANT, self.count_nodes(function)
+
+        if any(new is not old for new, old in zip(args, function.args)):
+            function = type(function)(args)
+        self._functions[key] = function
+        return function, _NOT_CONSTANT, eliminated
+
+    def visit_operand(self, operand: FormulaComponent) -> None:
+        value = _NOT_CONSTANT
+        if isinstance(operand, Number):
+            value = operand.evaluate(None)
+        elif isinstance(operand, Function):
+            operand, value, eliminated = self._optimize_function(operand)
+            self._eliminated += eliminated
+        self._stack.append((len(self._output), value))
+        self._output.append(operand)
+
+    def visit_operator(self, operator: FormulaComponent) -> None:
+        if len(self._stack) < 2:
+            raise ValueError("Invalid postfix expression.")
+        _, right = self._stack.pop()
+        start, left = self._stack.pop()
+
+        if left is not _NOT_CONSTANT and right is not _NOT_CONSTANT:
+            try:
+                value = operator._compute(left, right)
+            except ArithmeticError:  # Raised again at evaluation
+                value = _NOT_CONSTANT
+            if value is not _NOT_CONSTANT:
+                del self._output[start:]
+                self._output.append(Number(value))
+                self._stack.append((start, value))
+                self._eliminated += 2
+                return
+
+        self._output.append(operator)
+        self._stack.append((start, _NOT_CONSTANT))
+
+    def visit_opening_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def visit_closing_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def optimize(self, postfix: list[FormulaComponent]) -> list[FormulaComponent]:
+        """Returns the optimized postfix expression, the given one is not modified."""
+        self._output = []
+        self._stack = []
+        self._functions = {}
+        self._ranges = {}
+        self._eliminated = 0
+
+        try:
+            for component in postfix:
+                component.accept(self)
+        except RecursionError:  # Functions nested too deeply, left as they are
+            self._eliminated = 0
+            return postfix
+
+        return self._output
+
+    def get_eliminated_nodes(self) -> int:
+        """Returns the number of nodes removed by the last call to optimize."""
+        return self._eliminated
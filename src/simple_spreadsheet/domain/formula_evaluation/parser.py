@@ -1,75 +1,192 @@
-from ..formula_components import FormulaComponent, OpeningParenthesis, ClosingParenthesis
-from ..functions import Function, FunctionFactory
-from ..operators import BinaryOperatorFactory
+from ..formula_components import FormulaComponent
+from ..functions import Argument, Function, FunctionFactory
+from ..operators import BinaryOperator, BinaryOperatorFactory
 from ..cell_range import CellRange
+from ..coordinates import Coordinates
 from ..contents import Number
-from .consts import OPERATORS, FUNCTIONS, RANGE_SEPARATOR, PARAM_SEPARATOR, OPENING_PARENTHESIS, CLOSING_PARENTHESIS
+from .consts import Token, PRECEDENCE, UNARY_OPERATORS, FUNCTIONS, RANGE_SEPARATOR, PARAM_SEPARATOR, OPENING_PARENTHESIS, CLOSING_PARENTHESIS
 
 
-class Parser():
-    """Parser to convert tokenized formulas into Components and generate postfix expressions."""
+class _FunctionCall:
+    """Function call whose arguments are being parsed."""
+    __slots__ = ('name', 'args', 'num_args', 'after_separator')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.args: list[Argument] = []
+        self.num_args = 0  # Nested functions are not counted
+        self.after_separator = True
+
+
+class Parser:
+    """
+    One pass operator precedence parser. Validates the tokens of a formula and
+    turns them into postfix components at the same time.
+
+    Pending operators, open parentheses and function calls are kept on
+    explicit stacks, so the nesting depth of a formula is not limited by the
+    interpreter's recursion limit.
+    """
 
     def __init__(self) -> None:
-        self._operators = OPERATORS
+        self._operators = {symbol: BinaryOperatorFactory.create(symbol) for symbol in PRECEDENCE}
+        self._precedence = PRECEDENCE
+        self._unary_operators = UNARY_OPERATORS
         self._functions = FUNCTIONS
         self._range_separator = RANGE_SEPARATOR
+        self._param_separator = PARAM_SEPARATOR
         self._opening_parenthesis = OPENING_PARENTHESIS
         self._closing_parenthesis = CLOSING_PARENTHESIS
 
-    def _parse_function(self, tokens: list[str], position: int) -> tuple[Function, int]:
-        """Parses a function call and returns a Function object."""
+    def _open_call(self, tokens: list[Token], position: int) -> _FunctionCall:
         function_name = tokens[position]
-        args = []
-        i = position + 2  # Skip the function name and opening parenthesis
+        if position + 1 >= len(tokens) or tokens[position + 1] != self._opening_parenthesis:
+            raise SyntaxError(f"Function '{function_name}' must be followed by '{
+                              self._opening_parenthesis}'")
+        return _FunctionCall(function_name)
+
+    def _close_call(self, call: _FunctionCall) -> Function:
+        if call.num_args == 0:
+            raise SyntaxError(
+                f"Function '{call.name}' requires at least one argument")
+        return FunctionFactory.create(call.name, call.args)
+
+    def _parse_function(self, tokens: list[Token], position: int) -> tuple[Function, int]:
+        """Parses a function call, nested calls included. Returns the function and the next position."""
         n = len(tokens)
+        calls = [self._open_call(tokens, position)]
+        i = position + 2  # Skip the function name and opening parenthesis
 
-        is_function_complete = False
-        while i < n and not is_function_complete:
-            token = tokens[i]
-            if token == self._closing_parenthesis:
-                is_function_complete = True
+        while True:
+            call = calls[-1]
+            token = tokens[i] if i < n else None
+
+            if type(token) is Coordinates:
+                if not call.after_separator:
+                    raise SyntaxError(
+                        f"Cell reference must be preceded by a separator at position {i}")
+                call.num_args += 1
+                call.after_separator = False
+                i += 1
+                if i < n and tokens[i] == self._range_separator:
+                    i += 1
+                    if i >= n:
+                        raise SyntaxError(f"Invalid range separator at position {i}")
+                    range_end = tokens[i]
+                    if type(range_end) is not Coordinates:
+                        raise SyntaxError(
+                            f"Range must be followed by a cell reference (position {i})")
+                    call.args.append(CellRange(token, range_end))
+                    i += 1
+                else:
+                    call.args.append(token)
+            elif type(token) is Number:
+                if not call.after_separator:
+                    raise SyntaxError(
+                        f"Number must be preceded by a separator at position {i}")
+                call.args.append(token)
+                call.num_args += 1
+                call.after_separator = False
                 i += 1
-            elif token == PARAM_SEPARATOR:
+            elif token == self._param_separator:
+                if call.after_separator:
+                    raise SyntaxError(f"Invalid separator at position {i}")
+                call.after_separator = True
                 i += 1
-            elif token in self._functions:
-                arg, i = self._parse_function(tokens, i)
-                args.append(arg)
-            elif isinstance(token, Number):
-                args.append(token)
+            elif token is None or token == self._closing_parenthesis:
+                if token is None:
+                    raise SyntaxError(
+                        f"Function '{call.name}' missing closing parenthesis")
+                function = self._close_call(calls.pop())
                 i += 1
-            else:  # Cell reference or range
-                if i + 1 < n and tokens[i + 1] == self._range_separator:
-                    range_end = tokens[i + 2]
-                    args.append(CellRange(token, range_end))
-                    i += 3
-                else:
-                    args.append(token)  # Cell reference
-                    i += 1
+                if not calls:
+                    return function, i
+                calls[-1].args.append(function)
+                calls[-1].after_separator = False
+            elif token in self._functions:
+                calls.append(self._open_call(tokens, i))
+                i += 2
+            else:
+                raise SyntaxError(f"Unexpected token '{token}' at position {i}")
+
+    def _parse_signed_number(self, tokens: list[Token], position: int) -> Number:
+        """Parses a sign followed by a number, unary operators are only allowed before numbers."""
+        sign = tokens[position]
+        i = position + 1
+        token = tokens[i] if i < len(tokens) else None
+        if type(token) is not Number:
+            if type(token) is Coordinates:
+                raise SyntaxError(
+                    f"Unary operators cannot be used with cell references at position {i}")
+            elif token in self._functions:
+                raise SyntaxError(
+                    f"Unary operators cannot be used with functions at position {i}")
+            else:
+                raise SyntaxError(
+                    f"Unary operators must be followed by a number at position {i}")
+
+        value = token.get_value_as_float()
+        return Number(-value if sign == '-' else value)
 
-        function = FunctionFactory.create(function_name, args)
-        return function, i
+    def parse(self, tokens: list[Token]) -> list[FormulaComponent]:
+        """
+        Validates the given tokenized formula and returns its postfix expression.
+        Raises SyntaxError if invalid.
+        """
+        if not tokens:
+            raise SyntaxError("Empty formula")
 
-    def tokens_to_components(self, tokens: list[str]) -> list[FormulaComponent]:
-        """Converts a list of tokens into Component objects."""
-        components = []
+        output: list[FormulaComponent] = []
+        # Pending operators with their precedence, None marks an open parenthesis
+        pending: list[tuple[int, BinaryOperator] | None] = []
+        depth = 0  # Open parentheses
+        n = len(tokens)
         i = 0
 
-        while i < len(tokens):
-            token = tokens[i]
-            if token in self._functions:
-                function, i = self._parse_function(tokens, i)
-                components.append(function)
-            elif token in self._operators:
-                components.append(BinaryOperatorFactory.create(token))
+        while True:
+            # An operand is expected
+            token = tokens[i] if i < n else None
+            if type(token) is Coordinates or type(token) is Number:
+                output.append(token)
                 i += 1
+            elif token is None:
+                raise SyntaxError("Unexpected end of formula")
+            elif token in self._unary_operators:
+                output.append(self._parse_signed_number(tokens, i))
+                i += 2
+            elif token in self._functions:
+                function, i = self._parse_function(tokens, i)
+                output.append(function)
             elif token == self._opening_parenthesis:
-                components.append(OpeningParenthesis())
-                i += 1
-            elif token == self._closing_parenthesis:
-                components.append(ClosingParenthesis())
+                pending.append(None)
+                depth += 1
                 i += 1
+                continue
             else:
-                components.append(token)
-                i += 1
+                raise SyntaxError(f"Unexpected token '{token}' at position {i}")
 
-        return components
+            # An operator, a closing parenthesis or the end of the formula is expected
+            while True:
+                token = tokens[i] if i < n else None
+                if isinstance(token, str) and token in self._precedence:
+                    precedence = self._precedence[token]
+                    while pending and pending[-1] is not None and pending[-1][0] >= precedence:
+                        output.append(pending.pop()[1])
+                    pending.append((precedence, self._operators[token]))
+                    i += 1
+                    break
+
+                if depth:
+                    if token != self._closing_parenthesis:
+                        raise SyntaxError(
+                            f"Missing closing parenthesis at position {i}")
+                    while (operator := pending.pop()) is not None:
+                        output.append(operator[1])
+                    depth -= 1
+                    i += 1
+                elif token is not None:
+                    raise SyntaxError(f"Unexpected token '{token}' at position {i}")
+                else:
+                    while pending:
+                        output.append(pending.pop()[1])
+                    return output
@@ -1,7 +1,18 @@
+from collections import Counter
+from collections.abc import Callable
+
 from ..spreadsheet import Spreadsheet
 from ..formula_components import FormulaComponent
+from ..coordinates import Coordinates
+from ..functions import Function
+from ..contents import Number
 from .visitor import Visitor
 
+# Instruction codes of the float stack mode
+PUSH_CONSTANT, PUSH_REFERENCE, PUSH_FUNCTION, PUSH_SHARED, APPLY_OPERATOR = range(5)
+
+type Instruction = tuple[int, object, object]
+
 
 class PostfixEvaluator(Visitor):
     def __init__(self, spreadsheet: Spreadsheet) -> None:
@@ -32,3 +43,92 @@ class PostfixEvaluator(Visitor):
             raise ValueError("Invalid postfix expression.")
 
         return self._stack.pop().evaluate(self._spreadsheet)
+
+
+class FloatStackEvaluator(Visitor):
+    """
+    Float stack mode of the postfix evaluator. The postfix expression is
+    translated once into flat instructions, with references resolved to
+    their row and column, and every evaluation runs them over a preallocated
+    stack of plain floats. No Number is built for intermediate results.
+    Function calls used more than once (see Optimizer) are evaluated once.
+    """
+
+    def __init__(self, postfix: list[FormulaComponent]) -> None:
+        self._code: list[Instruction] = []
+        self._depth = 0
+        self._uses = Counter(id(component) for component in postfix
+                             if isinstance(component, Function))
+        self._slots: dict[int, int] = {}
+        max_depth = 0
+        for component in postfix:
+            component.accept(self)
+            max_depth = max(max_depth, self._depth)
+
+        if self._depth != 1:
+            raise ValueError("Invalid postfix expression.")
+        self._stack: list[float | None] = [None] * max_depth
+        self._shared: list[float | None] = [None] * len(self._slots)
+
+    def _emit(self, code: int, first: object, second: object = None) -> None:
+        self._code.append((code, first, second))
+
+    def visit_operand(self, operand: FormulaComponent) -> None:
+        if isinstance(operand, Number):
+            self._emit(PUSH_CONSTANT, operand.evaluate(None))
+        elif isinstance(operand, Coordinates):
+            self._emit(PUSH_REFERENCE, operand.row, operand.col)
+        elif isinstance(operand, Function):
+            if self._uses[id(operand)] < 2:
+                self._emit(PUSH_FUNCTION, operand)
+            elif id(operand) in self._slots:
+                self._emit(PUSH_SHARED, self._slots[id(operand)])
+            else:  # First use, its value is kept for the next ones
+                self._emit(PUSH_FUNCTION, operand, len(self._slots))
+                self._slots[id(operand)] = len(self._slots)
+        else:
+            raise ValueError(f"Unsupported operand: {operand}")
+        self._depth += 1
+
+    def visit_operator(self, operator: FormulaComponent) -> None:
+        if self._depth < 2:
+            raise ValueError("Invalid postfix expression.")
+        compute: Callable[[float, float], float] = operator._compute
+        self._emit(APPLY_OPERATOR, compute)
+        self._depth -= 1
+
+    def visit_opening_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def visit_closing_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def evaluate(self, spreadsheet: Spreadsheet) -> float | None:
+        """Runs the instructions. A single reference to an empty cell evaluates to None."""
+        stack = self._stack
+        shared = self._shared
+        get_number_at = spreadsheet.get_number_at
+        top = -1
+        for code, first, second in self._code:
+            if code == APPLY_OPERATOR:
+                right = stack[top]
+                top -= 1
+                left = stack[top]
+                # Empty cells are taken as 0 by the operators
+                stack[top] = first(0.0 if left is None else left,
+                                   0.0 if right is None else right)
+            elif code == PUSH_REFERENCE:
+                top += 1
+                stack[top] = get_number_at(first, second)
+            elif code == PUSH_CONSTANT:
+                top += 1
+                stack[top] = first
+            elif code == PUSH_FUNCTION:
+                top += 1
+                stack[top] = value = first.evaluate(spreadsheet)
+                if second is not None:
+                    shared[second] = value
+            else:
+                top += 1
+                stack[top] = shared[first]
+        return stack[0]
@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Callable
+
+from ..spreadsheet import Spreadsheet
+from ..formula_components import FormulaComponent
+from ..coordinates import Coordinates
+from ..cell_range import CellRange
+from .postfix_evaluator import FloatStackEvaluator
+
+type RelativeReference = tuple[int, int]
+type RelativeRange = tuple[int, int, int, int]
+# Evaluates a run of rows given the column read by each reference, None if it raises
+type RunFunction = Callable[[int, list[array]], array | None]
+
+
+class Program(ABC):
+    """Executable form of a formula, evaluated relative to the cell it is in."""
+
+    # Formula nodes removed by the optimizer when the program was built
+    eliminated_nodes: int = 0
+    # True if runs of the program down a column can be evaluated at once
+    vectorized: bool = False
+
+    @abstractmethod
+    def evaluate(self, spreadsheet: Spreadsheet, origin: Coordinates) -> float:
+        pass
+
+    @abstractmethod
+    def get_dependencies(self, origin: Coordinates) -> set[Coordinates | CellRange]:
+        pass
+
+    def evaluate_run(self, spreadsheet: Spreadsheet, origin: Coordinates, num_rows: int) -> array | None:
+        """
+        Evaluates the program in `num_rows` consecutive rows of a column at
+        once, starting at `origin`. Returns None if the formulas must be
+        evaluated one by one.
+        """
+        return None
+
+
+class CompiledProgram(Program):
+    """
+    Generated code shared by every formula with the same relative shape
+    (e.g. =A1*B1 in C1 and =A2*B2 in C2). References are stored as offsets
+    from the cell holding the formula.
+    """
+
+    def __init__(self, function: Callable[[Spreadsheet, int, int], float],
+                 references: list[RelativeReference], ranges: list[RelativeRange]) -> None:
+        self._function = function
+        self._references = references
+        self._ranges = ranges
+        self._run: RunFunction | None = None
+        self._run_references: list[RelativeReference] = []
+
+    def set_run_function(self, run: RunFunction, references: list[RelativeReference]) -> None:
+        """Sets the vectorized form of the program, given the column read by each reference."""
+        self._run = run
+        self._run_references = references
+        self.vectorized = True
+
+    def evaluate(self, spreadsheet: Spreadsheet, origin: Coordinates) -> float:
+        return self._function(spreadsheet, origin.row, origin.col)
+
+    def evaluate_run(self, spreadsheet: Spreadsheet, origin: Coordinates, num_rows: int) -> array | None:
+        if self._run is None:
+            return None
+        columns = []
+        for d_row, d_col in self._run_references:
+            column = spreadsheet.get_column_values_at(origin.row + d_row, origin.col + d_col, num_rows)
+            if column is None:  # Non-numeric cells raise, formula by formula
+                return None
+            columns.append(column)
+        return self._run(num_rows, columns)
+
+    def get_dependencies(self, origin: Coordinates) -> set[Coordinates | CellRange]:
+        row, col = origin.get_indices()
+        dependencies = {Coordinates(row + d_row, col + d_col)
+                        for d_row, d_col in self._references}
+        for top, left, bottom, right in self._ranges:
+            dependencies.add(CellRange(Coordinates(row + top, col + left),
+                                       Coordinates(row + bottom, col + right)))
+        return dependencies
+
+
+class InterpretedProgram(Program):
+    """
+    Postfix expression of a single formula, for formulas that can not be
+    compiled. It is run by the float stack mode of the postfix evaluator.
+    """
+
+    def __init__(self, postfix: list[FormulaComponent]) -> None:
+        self._postfix = postfix
+        self._evaluator = FloatStackEvaluator(postfix)
+
+    def evaluate(self, spreadsheet: Spreadsheet, _: Coordinates) -> float:
+        return self._evaluator.evaluate(spreadsheet)
+
+    def get_dependencies(self, _: Coordinates) -> set[Coordinates | CellRange]:
+        dependencies = set()
+        for component in self._postfix:
+            dependencies.update(component.get_dependencies())
+        return dependencies
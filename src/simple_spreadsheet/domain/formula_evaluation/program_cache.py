@@ -0,0 +1,60 @@
+import re
+from collections import OrderedDict
+
+from ..coordinates import Coordinates
+from .program import CompiledProgram
+
+PROGRAM_CACHE_SIZE = 4096
+
+# Same words the tokenizer reads as cell references or function names
+_WORD_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9]*')
+# Marks relative references in shape keys, it can never appear in a valid formula
+_REFERENCE_MARK = '['
+
+
+class ProgramCache:
+    """
+    Bounded LRU cache of compiled programs, keyed by the relative (R1C1-like)
+    shape of the formulas. Filled-down formulas such as =A1*B1, =A2*B2, ...
+    share a single program.
+    """
+
+    def __init__(self, max_size: int = PROGRAM_CACHE_SIZE) -> None:
+        self._programs: OrderedDict[str, CompiledProgram] = OrderedDict()
+        self._max_size = max_size
+
+    @staticmethod
+    def shape_key(expression: str, origin: Coordinates) -> str | None:
+        """
+        Rewrites the cell references of an expression as offsets from its cell.
+        Returns None if the expression can not be keyed, it is then parsed as usual.
+        """
+        if _REFERENCE_MARK in expression:
+            return None
+
+        def to_relative(match: re.Match) -> str:
+            word = match[0]
+            if word.isalpha():  # Function name
+                return word
+            coords = Coordinates.from_id(word)
+            return f'R[{coords.row - origin.row}]C[{coords.col - origin.col}]'
+
+        try:
+            return _WORD_PATTERN.sub(to_relative, expression)
+        except Exception:
+            return None
+
+    def get(self, key: str) -> CompiledProgram | None:
+        program = self._programs.get(key)
+        if program is not None:
+            self._programs.move_to_end(key)
+        return program
+
+    def put(self, key: str, program: CompiledProgram) -> None:
+        self._programs[key] = program
+        self._programs.move_to_end(key)
+        if len(self._programs) > self._max_size:
+            self._programs.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._programs)
@@ -1,8 +1,51 @@
-from typing import Union
-from ..coordinates import Coordinates
+import re
+import string
+from functools import lru_cache
+
+from ..coordinates import Coordinates, Column
 from ..contents import Number
 from .consts import Token, DECIMAL_SEPARATOR, SPECIAL_CHARS, FUNCTIONS, UNARY_OPERATORS, CLOSING_PARENTHESIS
 
+COLUMN_CACHE_SIZE = 4096
+
+_NUMBER_CHARS = r'\d' + re.escape(DECIMAL_SEPARATOR)
+
+# Splits an expression into consecutive pieces, every character belongs to one
+# of them: single special characters, signs with the number that follows them,
+# numbers, words (cell references and function names), whitespace and any
+# other single character.
+_TOKEN_PATTERN = re.compile(
+    rf'[{re.escape("".join(sorted(SPECIAL_CHARS - UNARY_OPERATORS)))}]'
+    rf'|[{re.escape("".join(sorted(UNARY_OPERATORS)))}][{_NUMBER_CHARS}]*'
+    rf'|[{_NUMBER_CHARS}]+'
+    r'|[^\W_]+'
+    r'|\s+'
+    r'|.', re.DOTALL)
+
+# Kind of a piece, looked up by its first character
+_SPECIAL, _SIGN, _NUMBER, _WORD, _SPACE, _INVALID = range(6)
+_CHAR_KINDS = {
+    **{char: _SPECIAL for char in SPECIAL_CHARS - UNARY_OPERATORS},
+    **{char: _SIGN for char in UNARY_OPERATORS},
+    **{char: _NUMBER for char in string.digits + DECIMAL_SEPARATOR},
+    **{char: _WORD for char in string.ascii_letters},
+    **{char: _SPACE for char in string.whitespace},
+}
+
+
+def _piece_kind(piece: str) -> int:
+    """Kind of a piece starting with a character out of the lookup table."""
+    if piece.isspace():
+        return _SPACE
+    if piece[0].isdecimal():
+        return _NUMBER
+    return _WORD if piece.isalnum() else _INVALID
+
+
+@lru_cache(maxsize=COLUMN_CACHE_SIZE)
+def _column_number(letters: str) -> int:
+    return Column.number_from_letters(letters.upper())
+
 
 class TokenizationError(Exception):
     def __init__(self) -> None:
@@ -13,117 +56,94 @@ class TokenizationError(Exception):
 
 
 class Tokenizer:
+    """
+    Single pass tokenizer. A precompiled pattern splits the expression and
+    each piece is dispatched on its first character. Signs directly followed
+    by a number are read as part of it, unless they come after an operand.
+    """
+
     def __init__(self) -> None:
         self._tokens: list[Token] = []
+        self._positions: list[int] = []
         self._decimal_separator = DECIMAL_SEPARATOR
-        self._unary_operators = UNARY_OPERATORS
-        self._special_chars = SPECIAL_CHARS
         self._functions = FUNCTIONS
         self._closing_parenthesis = CLOSING_PARENTHESIS
 
-    def _is_valid_numeric_char(self, char: str) -> bool:
-        """Checks if a character is a digit or the decimal separator."""
-        return char.isdigit() or char == self._decimal_separator
-
-    def _extract_number(self, expression: str, start_index: int, include_sign: bool = True) -> tuple[float, int]:
-        """Extracts a numeric token from the expression."""
-        num = ''
-        decimal_separator_seen = False
-        n = len(expression)
-        i = start_index
-
-        # Handle sign if needed
-        if include_sign and i < n and expression[i] in self._unary_operators:
-            num += expression[i]
-            i += 1
-
-        while i < n and self._is_valid_numeric_char(expression[i]):
-            if expression[i] == self._decimal_separator:
-                if decimal_separator_seen:
-                    raise TokenizationError(
-                        'A number contains multiple decimal separators')
-                decimal_separator_seen = True
-            num += expression[i]
-            i += 1
-
-        if num in self._unary_operators:  # Handle alone signs
-            raise TokenizationError(
-                f'Invalid number at position {start_index}')
-
-        return Number(num), i
-
-    def _extract_cell_or_function(self, expression: str, start_index: int) -> tuple[Union[str, Coordinates], int]:
-        """Extracts a cell reference or function from the expression."""
-        var = ''
-        n = len(expression)
-        i = start_index
-        while i < n and (expression[i].isalpha() or expression[i].isdigit()):
-            var += expression[i]
-            i += 1
-
-        if var.isalpha():  # All alphabetic characters
-            upper_var = var.upper()
-            if upper_var in self._functions:
-                return upper_var, i
-            raise TokenizationError(f'Invalid function "{
-                var}" at position {start_index}')
-        return Coordinates.from_id(var), i
-
-    def _is_binary_operator_context(self, prev_token: Token | None) -> bool:
-        """
-        Determines if the current context suggests a binary operator.
-        Returns True if the previous token is a number, cell reference, or closing parenthesis.
-        """
-        return (prev_token is not None and
-                (isinstance(prev_token, (Number, Coordinates)) or
-                 (isinstance(prev_token, str) and prev_token == self._closing_parenthesis)))
+    def _create_number(self, text: str) -> Number:
+        if text.count(self._decimal_separator) > 1:
+            raise TokenizationError('A number contains multiple decimal separators')
+        return Number(text)
+
+    def _create_cell_or_function(self, word: str, start_index: int) -> str | Coordinates:
+        """Extracts a cell reference or function from a word."""
+        if word.isalpha():
+            upper_word = word.upper()
+            if upper_word in self._functions:
+                return upper_word
+            raise TokenizationError(f'Invalid function "{word}" at position {start_index}')
+
+        letters = word.rstrip(string.digits)
+        if word.isascii() and letters.isalpha() and len(letters) < len(word):
+            return Coordinates(int(word[len(letters):]) - 1, _column_number(letters))
+        return Coordinates.from_id(word)  # Raises the invalid cell ID error
 
     def tokenize(self, expression: str) -> list[Token]:
         """Tokenizes the given mathematical expression."""
-        self._tokens = []
-        n = len(expression)
-        i = 0
-
-        while i < n:
-            char = expression[i]
-            if char.isspace():
-                i += 1
+        tokens = self._tokens = []
+        positions = self._positions = []
+        after_operand = False  # Whether a sign is a binary operator
+        start = 0
+
+        for piece in _TOKEN_PATTERN.findall(expression):
+            kind = _CHAR_KINDS.get(piece[0])
+            if kind is None:
+                kind = _piece_kind(piece)
+
+            if kind == _SPECIAL:
+                token = piece
+                after_operand = piece == self._closing_parenthesis
+            elif kind == _WORD:
+                token = self._create_cell_or_function(piece, start)
+                after_operand = not isinstance(token, str)
+            elif kind == _NUMBER:
+                token = self._create_number(piece)
+                after_operand = True
+            elif kind == _SPACE:
+                start += len(piece)
                 continue
-
-            prev_token = self._tokens[-1] if self._tokens else None
-
-            if char in self._unary_operators:
-                if self._is_binary_operator_context(prev_token):
-                    self._tokens.append(char)
-                    i += 1
-                else:
+            elif kind == _SIGN:
+                token = None
+                if not after_operand:
+                    if len(piece) == 1:
+                        raise TokenizationError(f'Invalid number at position {start}')
                     try:
-                        num, i = self._extract_number(
-                            expression, i, include_sign=True)
-                        self._tokens.append(num)
-                    except ValueError as e:
-                        if char in self._unary_operators:
-                            self._tokens.append(char)
-                            i += 1
-                        else:
-                            raise TokenizationError(
-                                f'Invalid number format at position {i}') from e
-            elif self._is_valid_numeric_char(char):
-                num, i = self._extract_number(
-                    expression, i, include_sign=False)
-                self._tokens.append(num)
-            elif char.isalpha():
-                var, i = self._extract_cell_or_function(expression, i)
-                self._tokens.append(var)
-            elif char in self._special_chars:
-                self._tokens.append(char)
-                i += 1
+                        token = self._create_number(piece)
+                    except ValueError:  # The sign alone is kept as a token
+                        pass
+                if token is None:
+                    # Binary operator, the number after it is a token of its own
+                    tokens.append(piece[0])
+                    positions.append(start)
+                    after_operand = False
+                    start += 1
+                    piece = piece[1:]
+                    if not piece:
+                        continue
+                    token = self._create_number(piece)
+                after_operand = True
             else:
-                raise TokenizationError(f'Invalid character "{
-                                        char}" at position {i}')
+                raise TokenizationError(f'Invalid character "{piece}" at position {start}')
 
-        return self._tokens
+            tokens.append(token)
+            positions.append(start)
+            start += len(piece)
+
+        return tokens
 
     def get_tokens(self) -> list[Token]:
         """Returns the tokens generated by the last call to tokenize."""
         return self._tokens
+
+    def get_positions(self) -> list[int]:
+        """Returns the position in the expression of each token of the last call to tokenize."""
+        return self._positions
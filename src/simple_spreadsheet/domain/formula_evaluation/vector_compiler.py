@@ -0,0 +1,129 @@
+from array import array
+from collections.abc import Callable
+from functools import lru_cache
+
+from ..formula_components import FormulaComponent
+from ..coordinates import Coordinates
+from ..contents import Number
+from ..vectorization import numpy_module
+from .visitor import Visitor
+from .compiler import FACTORY_CACHE_SIZE, INLINE_OPERATORS, NotCompilableError
+from .program import RelativeReference, RunFunction
+
+
+def _divide(left, right):
+    """Division by zero raises, the run is then evaluated formula by formula."""
+    if numpy_module().any(right == 0):
+        raise ZeroDivisionError("Division by zero is not allowed")
+    return left / right
+
+
+def _run(function: Callable, num_rows: int, columns: list[array]) -> array | None:
+    """Evaluates the vector function over the columns, None if a formula of the run raises."""
+    np = numpy_module()
+    with np.errstate(all='ignore'):  # Overflows give infinities and NaNs, as with floats
+        try:
+            result = function(*(np.frombuffer(column, dtype=np.float64) for column in columns))
+        except ZeroDivisionError:
+            return None
+    result = np.broadcast_to(np.asarray(result, dtype=np.float64), num_rows)
+    return array('d', result.tobytes())
+
+
+@lru_cache(maxsize=FACTORY_CACHE_SIZE)
+def _build_factory(expression: str, num_bindings: int, num_columns: int) -> Callable[..., Callable]:
+    bindings = ', '.join(f'b{i}' for i in range(num_bindings))
+    columns = ', '.join(f'v{i}' for i in range(num_columns))
+    source = (f'def _factory({bindings}):\n'
+              f'    def _vector({columns}):\n'
+              f'        return {expression}\n'
+              f'    return _vector\n')
+    namespace = {'_divide': _divide}
+    exec(compile(source, '<vector formula>', 'exec'), namespace)
+    return namespace['_factory']
+
+
+class VectorCompiler(Visitor):
+    """
+    Compiles postfix expressions of plain arithmetic on cell references and
+    numbers into NumPy expressions over columns. A fill-down run of the same
+    formula (e.g. =A1*B1 ... =A1000*B1000) is then evaluated at once, with
+    the same float operations the scalar program does for each formula.
+    """
+
+    def __init__(self) -> None:
+        self._stack: list[str] = []
+        self._bindings: list[float] = []
+        self._origin: Coordinates | None = None
+        self._references: dict[RelativeReference, str] = {}
+
+    def _bind(self, value: float) -> str:
+        name = f'b{len(self._bindings)}'
+        self._bindings.append(value)
+        return name
+
+    def visit_operand(self, operand: FormulaComponent) -> None:
+        if isinstance(operand, Number):
+            self._stack.append(self._bind(operand.evaluate(None)))
+        elif isinstance(operand, Coordinates):
+            reference = (operand.row - self._origin.row, operand.col - self._origin.col)
+            name = self._references.get(reference)
+            if name is None:
+                name = self._references[reference] = f'v{len(self._references)}'
+            self._stack.append(name)
+        else:  # Functions are evaluated formula by formula
+            raise NotCompilableError(f"Unsupported operand: {operand}")
+
+    def visit_operator(self, operator: FormulaComponent) -> None:
+        if len(self._stack) < 2:
+            raise ValueError("Invalid postfix expression.")
+        right = self._stack.pop()
+        left = self._stack.pop()
+        template = INLINE_OPERATORS.get(operator.symbol)
+        if template is None:
+            if operator.symbol != '/':
+                raise NotCompilableError(f"Unsupported operator: {operator}")
+            template = '_divide({}, {})'
+        self._stack.append(template.format(left, right))
+
+    def visit_opening_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def visit_closing_parenthesis(self, _) -> None:
+        raise ValueError("Invalid postfix expression.")
+
+    def compile(self, postfix: list[FormulaComponent],
+                origin: Coordinates) -> tuple[RunFunction, list[RelativeReference]] | None:
+        """
+        Compiles the postfix expression of the formula located at `origin`.
+        Returns the function evaluating a run of rows, given the column read
+        by each reference, and the references. None if it can not be
+        vectorized or NumPy is not installed.
+        """
+        if numpy_module() is None:
+            return None
+        if len(postfix) == 1 and isinstance(postfix[0], Coordinates):
+            return None  # A bare reference to an empty cell is None, columns read it as 0
+        self._stack = []
+        self._bindings = []
+        self._origin = origin
+        self._references = {}
+
+        try:
+            for component in postfix:
+                component.accept(self)
+        except NotCompilableError:
+            return None
+
+        if len(self._stack) != 1:
+            raise ValueError("Invalid postfix expression.")
+
+        try:
+            factory = _build_factory(self._stack.pop(), len(self._bindings), len(self._references))
+        except (SyntaxError, RecursionError, MemoryError):
+            return None
+        function = factory(*self._bindings)
+
+        def run(num_rows: int, columns: list[array]) -> array | None:
+            return _run(function, num_rows, columns)
+        return run, list(self._references)
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from .formula_components import Operand
+from .vectorization import total, minimum, maximum
 
 if TYPE_CHECKING:
     from .spreadsheet import Spreadsheet
@@ -9,14 +12,21 @@ if TYPE_CHECKING:
 
 
 class Argument(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def evaluate_arg(self, spreadsheet: 'Spreadsheet') -> list[float]:
+    def evaluate_arg(self, spreadsheet: 'Spreadsheet') -> Sequence[float]:
+        """Returns the numeric values of the argument, empty cells excluded."""
         pass
 
     @abstractmethod
     def get_dependencies(self) -> set['Coordinates']:
         pass
 
+    def aggregate_arg(self, function: type['Function'], spreadsheet: 'Spreadsheet') -> float:
+        """Returns the result of a function whose only argument is this one."""
+        return function.reduce(self.evaluate_arg(spreadsheet))
+
 
 class Function(Operand, Argument):
     def __init__(self, args: list[Argument]) -> None:
@@ -30,24 +40,35 @@ class Function(Operand, Argument):
         if not self._args:
             raise ValueError("Function must have at least one argument")
 
-    def _filter_nones(self, values: list[float]) -> list[float]:
-        return [v for v in values if v is not None]
-
-    def _evaluate_argument(self, arg: Argument, spreadsheet: 'Spreadsheet') -> list[float]:
-        """Evaluates an argument and returns numeric values, excluding `None`."""
-        return self._filter_nones(arg.evaluate_arg(spreadsheet))
+    def _evaluate_argument(self, arg: Argument, spreadsheet: 'Spreadsheet') -> Sequence[float]:
+        """Evaluates an argument and returns its numeric values, empty cells excluded."""
+        return arg.evaluate_arg(spreadsheet)
 
-    def _get_values(self, spreadsheet: 'Spreadsheet') -> list[float]:
+    def _get_values(self, spreadsheet: 'Spreadsheet') -> Sequence[float]:
         """Evaluates all arguments and combines valid values."""
-        values = []
+        if len(self._args) == 1:  # Avoids copying the values of a single range
+            return self._evaluate_argument(self._args[0], spreadsheet)
+
+        values = array('d')  # Contiguous, so it can be reduced as a vector
         for arg in self._args:
             values.extend(self._evaluate_argument(arg, spreadsheet))
         return values
 
+    @property
+    def args(self) -> list[Argument]:
+        return self._args
+
+    @classmethod
     @abstractmethod
-    def evaluate(self, spreadsheet: 'Spreadsheet') -> float:
+    def reduce(cls, values: Sequence[float]) -> float:
+        """Computes the result of the function from the values of its arguments."""
         pass
 
+    def evaluate(self, spreadsheet: 'Spreadsheet') -> float:
+        if len(self._args) == 1:  # Ranges keep their aggregates up to date
+            return self._args[0].aggregate_arg(type(self), spreadsheet)
+        return self.reduce(self._get_values(spreadsheet))
+
     def evaluate_arg(self, spreadsheet: 'Spreadsheet') -> list[float]:
         return [self.evaluate(spreadsheet)]
 
@@ -73,23 +94,24 @@ class FunctionFactory:
 
 
 class Sum(Function):
-    def evaluate(self, spreadsheet: 'Spreadsheet') -> float:
-        return sum(self._get_values(spreadsheet))
+    @classmethod
+    def reduce(cls, values: Sequence[float]) -> float:
+        return total(values)
 
 
 class Min(Function):
-    def evaluate(self, spreadsheet: 'Spreadsheet') -> float:
-        values = self._get_values(spreadsheet)
-        return min(values, default=0.0)
+    @classmethod
+    def reduce(cls, values: Sequence[float]) -> float:
+        return minimum(values)
 
 
 class Max(Function):
-    def evaluate(self, spreadsheet: 'Spreadsheet') -> float:
-        values = self._get_values(spreadsheet)
-        return max(values, default=0.0)
+    @classmethod
+    def reduce(cls, values: Sequence[float]) -> float:
+        return maximum(values)
 
 
 class Average(Function):
-    def evaluate(self, spreadsheet: 'Spreadsheet') -> float:
-        values = self._get_values(spreadsheet)
-        return sum(values) / len(values) if values else 0.0
+    @classmethod
+    def reduce(cls, values: Sequence[float]) -> float:
+        return total(values) / len(values) if values else 0.0
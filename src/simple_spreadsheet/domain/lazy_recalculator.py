@@ -0,0 +1,84 @@
+from collections.abc import Iterable
+
+from .coordinates import Coordinates
+from .cell_range import CellRange
+from .spreadsheet import Spreadsheet
+from .dependency_manager import DependencyManager
+from .formula_evaluation import FormulaEvaluator
+from .recalculator import Recalculator
+
+
+class LazyRecalculator(Recalculator):
+    """
+    Recalculator that evaluates formulas when they are read. Changes are only
+    recorded, so their cost does not depend on the formulas downstream. A
+    read marks the cells affected by the changes recorded since the previous
+    read as stale, then evaluates the stale precedents of the cell read and
+    the cell itself, each once.
+    """
+
+    def __init__(self, spreadsheet: Spreadsheet, formula_evaluator: FormulaEvaluator,
+                 deps_manager: DependencyManager) -> None:
+        super().__init__(spreadsheet, formula_evaluator, deps_manager)
+        self._changed: list[Coordinates] = []
+        # Cells whose value may be out of date, their dependents are stale too
+        self._stale: set[Coordinates] = set()
+
+    def recalculate(self, cells: Iterable[Coordinates]) -> list[Coordinates]:
+        """Records the changed cells, they are evaluated when read. Nothing is recomputed now."""
+        self._changed.extend(cells)
+        return []
+
+    def _mark_stale(self) -> None:
+        """Marks the changed cells and their transitive dependents as stale."""
+        stale = self._stale
+        pending = [cell for cell in self._changed if cell not in stale]
+        stale.update(pending)
+        self._changed = []
+        while pending:
+            cell = pending.pop()
+            for dependent in self._deps_manager.get_dependents(cell):
+                if dependent not in stale:
+                    stale.add(dependent)
+                    pending.append(dependent)
+
+    def _stale_in_range(self, cell_range: CellRange) -> list[Coordinates]:
+        if len(cell_range) < len(self._stale):
+            return [cell for cell in cell_range if cell in self._stale]
+        return [cell for cell in self._stale if cell in cell_range]
+
+    def _stale_precedents(self, cell: Coordinates) -> list[Coordinates]:
+        precedents = []
+        for dependency in self._deps_manager.get_precedents(cell):
+            if isinstance(dependency, CellRange):
+                precedents.extend(self._stale_in_range(dependency))
+            elif dependency in self._stale:
+                precedents.append(dependency)
+        return precedents
+
+    def refresh(self, cell: Coordinates) -> None:
+        """Evaluates the cell if it is stale, after its stale precedents."""
+        self._mark_stale()
+        stale = self._stale
+        if cell not in stale:
+            return
+
+        # Iterative depth-first search over the stale precedents, evaluated in post-order
+        stack = [(cell, iter(self._stale_precedents(cell)))]
+        while stack:
+            current, precedents = stack[-1]
+            for precedent in precedents:
+                if precedent in stale:  # Unless already evaluated through another path
+                    stack.append((precedent, iter(self._stale_precedents(precedent))))
+                    break
+            else:
+                stack.pop()
+                self._evaluate(current)
+                stale.discard(current)  # Still stale if the evaluation raises
+
+    def refresh_all(self) -> None:
+        """Evaluates every stale cell in topological order."""
+        self._mark_stale()
+        if self._stale:
+            super().recalculate(self._stale)
+            self._stale = set()
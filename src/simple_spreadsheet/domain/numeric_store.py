@@ -0,0 +1,201 @@
+from array import array
+
+from .column_summary import ColumnSummary, NOT_SUMMARIZED
+from .vectorization import select
+
+# Cell states kept in the validity mask of each column
+EMPTY = 0
+NUMBER = 1
+NOT_NUMBER = 2
+
+FLOAT_SIZE = array('d').itemsize
+
+
+class NumericColumn:
+    """
+    Column-major buffer with the numeric values of a column. A parallel
+    byte mask tells empty cells and non-numeric cells apart from numbers.
+    """
+
+    def __init__(self) -> None:
+        self._values = array('d')
+        self._states = bytearray()
+        self._non_numbers = 0
+        self._summary: ColumnSummary | None = None  # Built on the first range query
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _ensure_size(self, size: int) -> None:
+        missing = size - len(self._states)
+        if missing > 0:
+            self._values.frombytes(bytes(missing * FLOAT_SIZE))
+            self._states.extend(bytes(missing))
+
+    def set(self, row: int, value: float | None, state: int) -> None:
+        if state == EMPTY and row >= len(self._states):
+            return
+        self._ensure_size(row + 1)
+        self._non_numbers += (state == NOT_NUMBER) - \
+            (self._states[row] == NOT_NUMBER)
+        self._values[row] = value if state == NUMBER else 0.0
+        self._states[row] = state
+        if self._summary is not None:
+            self._summary.invalidate(row)
+
+    def set_numbers(self, start: int, values: array) -> None:
+        """Stores numbers in rows [start, start + len(values))."""
+        stop = start + len(values)
+        self._ensure_size(stop)
+        self._non_numbers -= self._states[start:stop].count(NOT_NUMBER)
+        self._values[start:stop] = values
+        self._states[start:stop] = bytes([NUMBER]) * len(values)
+        if self._summary is not None:
+            self._summary.invalidate_rows(start, stop)
+
+    def get_state(self, row: int) -> int:
+        return self._states[row] if row < len(self._states) else EMPTY
+
+    def get(self, row: int) -> float | None:
+        if self.get_state(row) != NUMBER:
+            return None
+        return self._values[row]
+
+    def has_non_numbers(self, start: int, stop: int) -> bool:
+        return self._non_numbers > 0 and NOT_NUMBER in self._states[start:stop]
+
+    def read_rows(self, start: int, stop: int) -> array:
+        """Returns the values of rows [start, stop), empty cells are 0."""
+        values = self._values[start:stop]
+        missing = stop - start - len(values)
+        if missing > 0:
+            values.frombytes(bytes(missing * FLOAT_SIZE))
+        return values
+
+    def read_states(self, start: int, stop: int) -> bytes:
+        """Returns the states of rows [start, stop)."""
+        states = bytes(self._states[start:stop])
+        missing = stop - start - len(states)
+        return states + bytes(missing) if missing > 0 else states
+
+    def read(self, start: int, stop: int) -> array:
+        """Returns the numbers stored in rows [start, stop), skipping empty cells."""
+        values = self._values[start:stop]
+        states = self._states[start:stop]
+        if len(states) == stop - start and EMPTY not in states:
+            return values
+        return select(values, states)
+
+    def _get_summary(self) -> ColumnSummary:
+        if self._summary is None:
+            self._summary = ColumnSummary(self.read)
+        return self._summary
+
+    def exact_sum(self, start: int, stop: int) -> tuple[int, int] | object:
+        return self._get_summary().exact_sum(start, min(stop, len(self)))
+
+    def extreme(self, start: int, stop: int, largest: bool) -> float | None | object:
+        return self._get_summary().extreme(start, min(stop, len(self)), largest)
+
+
+class NumericStore:
+    """Numeric values of a spreadsheet, stored column by column."""
+
+    def __init__(self) -> None:
+        self._columns: dict[int, NumericColumn] = {}
+
+    def set(self, row: int, col: int, value: float | None, state: int) -> None:
+        column = self._columns.get(col)
+        if column is None:
+            if state == EMPTY:
+                return
+            column = self._columns[col] = NumericColumn()
+        column.set(row, value, state)
+
+    def set_numbers(self, start_row: int, col: int, values: array) -> None:
+        """Stores numbers down a column, from `start_row` on."""
+        column = self._columns.get(col)
+        if column is None:
+            column = self._columns[col] = NumericColumn()
+        column.set_numbers(start_row, values)
+
+    def get_state(self, row: int, col: int) -> int:
+        column = self._columns.get(col)
+        return column.get_state(row) if column is not None else EMPTY
+
+    def get(self, row: int, col: int) -> float | None:
+        column = self._columns.get(col)
+        return column.get(row) if column is not None else None
+
+    def has_non_numbers(self, start_row: int, start_col: int, end_row: int, end_col: int) -> bool:
+        for col in range(start_col, end_col + 1):
+            column = self._columns.get(col)
+            if column is not None and column.has_non_numbers(start_row, end_row + 1):
+                return True
+        return False
+
+    def read_rows(self, start_row: int, col: int, num_rows: int) -> array:
+        """Returns the values of `num_rows` cells down a column, empty cells are 0."""
+        column = self._columns.get(col)
+        if column is None:
+            return array('d', bytes(num_rows * FLOAT_SIZE))
+        return column.read_rows(start_row, start_row + num_rows)
+
+    def read(self, start_row: int, start_col: int, end_row: int, end_col: int) -> array:
+        """
+        Returns the numbers inside the (inclusive) rectangle, row by row as the
+        cells of a range are iterated, so that reductions whose result depends
+        on the order (NaNs, 0 and -0) give the same result.
+        """
+        columns = [column for column in map(self._columns.get, range(start_col, end_col + 1))
+                   if column is not None]
+        if not columns:
+            return array('d')
+        if len(columns) == 1:
+            return columns[0].read(start_row, end_row + 1)
+
+        # Interleaves the columns, missing columns have no numbers to place
+        num_rows, num_cols = end_row - start_row + 1, len(columns)
+        values = array('d', bytes(num_rows * num_cols * FLOAT_SIZE))
+        states = bytearray(num_rows * num_cols)
+        for i, column in enumerate(columns):
+            values[i::num_cols] = column.read_rows(start_row, end_row + 1)
+            states[i::num_cols] = column.read_states(start_row, end_row + 1)
+        return select(values, states)
+
+    def exact_sum(self, start_row: int, start_col: int, end_row: int, end_col: int) -> tuple[int, int] | None:
+        """
+        Exact sum (in units of 2**-1074) and count of the numbers inside the
+        (inclusive) rectangle. None if there are infinities or NaNs.
+        """
+        units = count = 0
+        for col in range(start_col, end_col + 1):
+            column = self._columns.get(col)
+            if column is None:
+                continue
+            summary = column.exact_sum(start_row, end_row + 1)
+            if summary is NOT_SUMMARIZED:
+                return None
+            units += summary[0]
+            count += summary[1]
+        return units, count
+
+    def extreme(self, start_row: int, start_col: int, end_row: int, end_col: int,
+                largest: bool) -> float | None | object:
+        """
+        Maximum (or minimum) of the numbers inside the (inclusive) rectangle,
+        None if there are none. NOT_SUMMARIZED if the rectangle must be read.
+        """
+        candidates = []
+        for col in range(start_col, end_col + 1):
+            column = self._columns.get(col)
+            if column is None:
+                continue
+            result = column.extreme(start_row, end_row + 1, largest)
+            if result is NOT_SUMMARIZED:
+                return result
+            if result is not None:
+                candidates.append(result)
+        if not candidates:
+            return None
+        return max(candidates) if largest else min(candidates)
@@ -0,0 +1,294 @@
+import gc
+import heapq
+import multiprocessing
+import pickle
+import sys
+import weakref
+from array import array
+from collections.abc import Callable, Iterable
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+from .coordinates import Coordinates
+from .spreadsheet import Spreadsheet
+from .contents import ContentFactory
+from .dependency_manager import DependencyManager
+from .formula_evaluation import FormulaEvaluator
+from .recalculator import Recalculator
+
+try:
+    # Workers start as forked copies of the sheet, then only its changes are sent to them
+    _FORK = multiprocessing.get_context('fork')
+except ValueError:  # Not available on Windows, recalculations are then serial
+    _FORK = None
+
+# Smaller recalculations are not worth sending the changes to the workers
+PARALLEL_MIN_CELLS = 4096
+
+FLOAT_SIZE = array('d').itemsize
+
+# Kinds of the values in the shared buffer, the cells of a partition that are not formulas are skipped
+SKIPPED = 0
+NONE = 1
+FLOAT = 2
+INT = 3
+
+type Order = list[tuple[Coordinates, set[Coordinates]]]
+# Cells whose content was replaced (content as text, or None if emptied, and value) and formulas whose value changed
+type Changes = tuple[list[tuple[int, str | None, float | None]], list[tuple[int, float | None]]]
+
+
+class _WorkerPool:
+    """
+    Forked workers, each serving the requests sent through its pipe, and
+    the shared buffer where they write the values. The buffer holds a
+    float64 value and a kind byte per cell, the values of a request first.
+    """
+
+    def __init__(self, serve: Callable[[Connection], None], processes: int) -> None:
+        # Shared with the workers, so that the buffers they attach to are only tracked by the parent
+        resource_tracker.ensure_running()
+        self.connections: list[Connection] = []
+        self._workers = []
+        for _ in range(processes):
+            connection, worker_connection = _FORK.Pipe()
+            worker = _FORK.Process(target=serve, args=(worker_connection,), daemon=True)
+            worker.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self._workers.append(worker)
+        self.buffer: SharedMemory | None = None
+        self.capacity = 0
+
+    def reserve(self, size: int) -> None:
+        """Makes room for the values of `size` cells, all of them skipped."""
+        if size > self.capacity:
+            self._release_buffer()
+            self.capacity = max(size, 2 * self.capacity)
+            self.buffer = SharedMemory(create=True, size=(FLOAT_SIZE + 1) * self.capacity)
+        kinds = FLOAT_SIZE * self.capacity
+        self.buffer.buf[kinds:kinds + size] = bytes(size)
+
+    def _release_buffer(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer.unlink()
+            self.buffer = None
+
+    def close(self) -> None:
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except OSError:  # The worker is gone already
+                pass
+            connection.close()
+        for worker in self._workers:
+            worker.join(1)
+            if worker.is_alive():
+                worker.terminate()
+        self._release_buffer()
+
+
+class ParallelRecalculator(Recalculator):
+    """
+    Recalculator that evaluates large recalculations in several processes.
+    The cells to recompute are split into connected components, which do not
+    read each other's values, and the components are spread over the
+    processes. The processes are forked by the first parallel recalculation
+    and kept until the recalculator is closed. Each recalculation sends them
+    the cells changed since the previous one, then each process evaluates
+    its share on its copy of the sheet and writes the values to a shared
+    memory buffer, which are then set in the sheet. Smaller recalculations,
+    or those with a single component, are evaluated serially.
+
+    If a formula raises in any process, the values of the processes are
+    dropped and the recalculation is evaluated serially, so it stops at the
+    same error and leaves the same values as in serial mode.
+    """
+
+    def __init__(self, spreadsheet: Spreadsheet, formula_evaluator: FormulaEvaluator,
+                 deps_manager: DependencyManager, processes: int) -> None:
+        super().__init__(spreadsheet, formula_evaluator, deps_manager)
+        self._processes = processes
+        self._pool: _WorkerPool | None = None
+        self._close_pool: weakref.finalize | None = None
+
+    @staticmethod
+    def _components(order: Order) -> list[Order]:
+        """Splits a topological order into the orders of its connected components."""
+        parents = {cell: cell for cell, _ in order}
+
+        def find(cell: Coordinates) -> Coordinates:
+            while parents[cell] is not cell:
+                parents[cell] = parents[parents[cell]]
+                cell = parents[cell]
+            return cell
+
+        for cell, dependents in order:
+            root = find(cell)
+            for dependent in dependents:
+                other = find(dependent)
+                if other is not root:
+                    parents[other] = root
+
+        components: dict[Coordinates, Order] = {}
+        for entry in order:
+            components.setdefault(find(entry[0]), []).append(entry)
+        return list(components.values())
+
+    def _partition(self, components: list[Order]) -> list[Order]:
+        """Spreads the components over the processes, largest first, by number of cells."""
+        heap = [(0, i, []) for i in range(min(self._processes, len(components)))]
+        for component in sorted(components, key=len, reverse=True):
+            size, i, partition = heapq.heappop(heap)
+            partition.extend(component)
+            heapq.heappush(heap, (size + len(component), i, partition))
+        return [partition for _, _, partition in sorted(heap, key=lambda item: item[1])]
+
+    def _start_pool(self) -> _WorkerPool:
+        if self._pool is None:
+            self._spreadsheet.track_changes()  # The workers are forked with the sheet as it is now
+            self._pool = _WorkerPool(self._serve, self._processes)
+            self._close_pool = weakref.finalize(self, self._pool.close)
+        return self._pool
+
+    def close(self) -> None:
+        """Stops the worker processes, the next parallel recalculation forks them again."""
+        if self._pool is not None:
+            self._close_pool()
+            self._pool = None
+            self._spreadsheet.track_changes(False)
+
+    def _take_changes(self, order: Order) -> Changes:
+        """
+        Returns the changes of the sheet since the previous parallel
+        recalculation. The values of the cells about to be recomputed are left out.
+        """
+        replaced, values = [], []
+        recomputed = {cell for cell, _ in order}
+        for key, was_replaced in self._spreadsheet.take_changes().items():
+            cell = Coordinates.from_key(key)
+            content = self._spreadsheet.get_content(cell)
+            if was_replaced:
+                value = content.get_value_as_float() if content is not None and content.is_formula() else None
+                replaced.append((key, None if content is None else str(content), value))
+            elif cell not in recomputed and content.is_formula():
+                values.append((key, content.get_value_as_float()))
+        return replaced, values
+
+    def _apply_changes(self, changes: Changes) -> None:
+        """Runs in a worker. Brings its copy of the sheet up to date with the changes sent."""
+        replaced, values = changes
+        for key, text, value in replaced:
+            cell = Coordinates.from_key(key)
+            if text is None:
+                self._deps_manager.set_dependencies(cell, None)
+                self._spreadsheet.remove_content(cell)
+                continue
+            content = ContentFactory.create(text)
+            dependencies = None
+            if content.is_formula():
+                self._formula_evaluator.compile(content, cell)
+                content.set_value(value)
+                dependencies = content.get_dependencies()
+            self._deps_manager.set_dependencies(cell, dependencies)
+            self._spreadsheet.set_content(cell, content)
+        for key, value in values:
+            cell = Coordinates.from_key(key)
+            content = self._spreadsheet.get_content(cell)
+            content.set_value(value)
+            self._spreadsheet.set_content(cell, content)
+
+    def _serve(self, connection: Connection) -> None:
+        """
+        Runs in a worker until the pool is closed. Each request brings the
+        changes of the sheet and a partition, whose values are written to the
+        shared buffer. Replies whether the partition was evaluated, False if
+        a formula raised.
+        """
+        self._spreadsheet.track_changes(False)
+        gc.freeze()  # The collections of the worker skip the objects of the forked sheet
+        buffer = None
+        while (request := connection.recv()) is not None:
+            changes, keys, name, capacity, offset = request
+            self._apply_changes(pickle.loads(changes))
+            if buffer is None or buffer.name != name:
+                if buffer is not None:
+                    buffer.close()
+                buffer = SharedMemory(name)
+            connection.send(self._evaluate_partition(keys, buffer, capacity, offset))
+
+    def _evaluate_partition(self, keys: array, buffer: SharedMemory, capacity: int, offset: int) -> bool:
+        """Runs in a worker. Evaluates the cells of a partition, in order, and writes their values."""
+        get_dependents = self._deps_manager.get_dependents
+        order = [(cell, get_dependents(cell)) for cell in map(Coordinates.from_key, keys)]
+        try:
+            recomputed = {cell for step in self._evaluate_in_steps(order, sys.maxsize) for cell in step}
+        except Exception:
+            return False
+
+        get_content = self._spreadsheet.get_content
+        with (buffer.buf[:FLOAT_SIZE * capacity].cast('d') as values,
+              buffer.buf[FLOAT_SIZE * capacity:] as kinds):
+            for position, (cell, _) in enumerate(order, offset):
+                if cell in recomputed:
+                    value = get_content(cell).get_value_as_float()
+                    if value is None:
+                        kinds[position] = NONE
+                    else:  # Integers are whole sums, exact as floats
+                        values[position] = value
+                        kinds[position] = INT if isinstance(value, int) else FLOAT
+        return True
+
+    def _evaluate_in_parallel(self, order: Order, partitions: list[Order]) -> list[Coordinates] | None:
+        """Returns the recomputed cells, None if a formula raised."""
+        pool = self._start_pool()
+        changes = pickle.dumps(self._take_changes(order))
+        pool.reserve(len(order))
+        try:
+            offset = 0
+            for i, connection in enumerate(pool.connections):  # Idle workers get the changes too
+                partition = partitions[i] if i < len(partitions) else []
+                keys = array('q', (cell.key for cell, _ in partition))
+                connection.send((changes, keys, pool.buffer.name, pool.capacity, offset))
+                offset += len(partition)
+            evaluated = [connection.recv() for connection in pool.connections]
+        except (EOFError, OSError):  # A worker is gone
+            evaluated = [False]
+        if not all(evaluated):
+            self.close()  # The copies of the sheet were left half evaluated
+            return None
+
+        recomputed = []
+        get_content = self._spreadsheet.get_content
+        with (pool.buffer.buf[:FLOAT_SIZE * pool.capacity].cast('d') as values,
+              pool.buffer.buf[FLOAT_SIZE * pool.capacity:] as kinds):
+            cells = (cell for partition in partitions for cell, _ in partition)
+            for position, cell in enumerate(cells):
+                kind = kinds[position]
+                if kind == SKIPPED:
+                    continue
+                content = get_content(cell)
+                if kind == NONE:
+                    content.set_value(None)
+                else:
+                    content.set_value(int(values[position]) if kind == INT else values[position])
+                self._spreadsheet.set_content(cell, content)
+                recomputed.append(cell)
+        return recomputed
+
+    def recalculate(self, cells: Iterable[Coordinates]) -> list[Coordinates]:
+        """
+        Recomputes the formulas in the given cells and in all the cells that
+        depend on them, in parallel if it is worth it. Returns the recomputed
+        cells, each after its precedents.
+        """
+        order = self._topological_order(cells)
+        if self._processes > 1 and _FORK is not None and len(order) >= PARALLEL_MIN_CELLS:
+            components = self._components(order)
+            if len(components) > 1:
+                recomputed = self._evaluate_in_parallel(order, self._partition(components))
+                if recomputed is not None:
+                    return recomputed
+        return [cell for step in self._evaluate_in_steps(order, sys.maxsize) for cell in step]
@@ -0,0 +1,112 @@
+from collections import Counter
+from collections.abc import Iterator
+
+from .coordinates import Coordinates
+from .cell_range import CellRange
+from .consts import MAX_ROWS
+
+MAX_LEVEL = (MAX_ROWS - 1).bit_length()
+
+type BlockKey = tuple[int, int, int]
+
+
+class RangeSet:
+    """
+    Spatial set of ranges.
+
+    Each column of a range is split into aligned blocks of 2^level rows, as in
+    a segment tree, so a range is stored in O(log rows) blocks per column and
+    stabbing a cell takes one lookup per block level in use. Memory grows with
+    the number of distinct ranges, not with the number of cells they cover.
+    """
+
+    def __init__(self) -> None:
+        self._blocks: dict[BlockKey, set[CellRange]] = {}
+        self._levels: Counter[int] = Counter()
+
+    @staticmethod
+    def _split_rows(first_row: int, last_row: int) -> Iterator[tuple[int, int]]:
+        """Splits the (inclusive) rows into aligned blocks, yielded as (level, index)."""
+        start, stop = first_row, last_row + 1
+        while start < stop:
+            level = (start & -start).bit_length() - 1 if start else MAX_LEVEL
+            while start + (1 << level) > stop:
+                level -= 1
+            yield level, start >> level
+            start += 1 << level
+
+    def _block_keys(self, cell_range: CellRange) -> Iterator[BlockKey]:
+        min_row, min_col, max_row, max_col = cell_range.get_bounds()
+        blocks = list(self._split_rows(min_row, max_row))
+        for col in range(min_col, max_col + 1):
+            for level, index in blocks:
+                yield col, level, index
+
+    def add(self, cell_range: CellRange) -> None:
+        for key in self._block_keys(cell_range):
+            block = self._blocks.get(key)
+            if block is None:
+                block = self._blocks[key] = set()
+                self._levels[key[1]] += 1
+            block.add(cell_range)
+
+    def discard(self, cell_range: CellRange) -> None:
+        for key in self._block_keys(cell_range):
+            block = self._blocks.get(key)
+            if block is None:
+                continue
+            block.discard(cell_range)
+            if not block:
+                del self._blocks[key]
+                self._levels[key[1]] -= 1
+                if not self._levels[key[1]]:
+                    del self._levels[key[1]]
+
+    def get_ranges(self, coords: Coordinates) -> set[CellRange]:
+        """Returns the ranges that contain the given coordinates."""
+        row, col = coords.get_indices()
+        ranges = set()
+        for level in self._levels:
+            block = self._blocks.get((col, level, row >> level))
+            if block is not None:
+                ranges.update(block)
+        return ranges
+
+
+class RangeIndex:
+    """Spatial index from ranges to the cells that depend on them."""
+
+    def __init__(self) -> None:
+        self._ranges = RangeSet()
+        self._dependents: dict[CellRange, dict[Coordinates, None]] = {}
+
+    def add(self, cell_range: CellRange, dependent: Coordinates) -> None:
+        dependents = self._dependents.get(cell_range)
+        if dependents is None:
+            dependents = self._dependents[cell_range] = {}
+            self._ranges.add(cell_range)
+        dependents[dependent] = None
+
+    def remove(self, cell_range: CellRange, dependent: Coordinates) -> None:
+        dependents = self._dependents.get(cell_range)
+        if dependents is None or dependent not in dependents:
+            return
+        del dependents[dependent]
+        if not dependents:
+            del self._dependents[cell_range]
+            self._ranges.discard(cell_range)
+
+    def get_ranges(self, coords: Coordinates) -> set[CellRange]:
+        """Returns the indexed ranges that contain the given coordinates."""
+        return self._ranges.get_ranges(coords)
+
+    def get_dependents(self, coords: Coordinates) -> list[Coordinates]:
+        """Returns the cells depending on a range that contains the given coordinates."""
+        ranges = self.get_ranges(coords)
+        if len(ranges) == 1:
+            return list(self._dependents[ranges.pop()])
+
+        dependents = {}
+        for cell_range in ranges:
+            dependents.update(self._dependents[cell_range])
+        return list(dependents)
@@ -0,0 +1,234 @@
+import sys
+from collections.abc import Iterable, Iterator
+
+from .coordinates import Coordinates
+from .spreadsheet import Spreadsheet
+from .contents import Content
+from .dependency_manager import Dependency, DependencyManager, CircularDependencyException
+from .formula_evaluation import FormulaEvaluator
+
+# Shorter runs of the same formula down a column are evaluated formula by formula
+BATCH_MIN_ROWS = 64
+
+# Cells recomputed between two steps of a recalculation that can be stopped
+STEP_CELLS = 2048
+
+
+class Recalculator:
+    """
+    Recomputes the formulas affected by a change. The changed cells and all
+    their transitive dependents are evaluated once each, in topological order.
+    Runs of the same vectorized formula down a column (fill-down) are
+    evaluated at once when none of their formulas depends on another.
+    """
+
+    def __init__(self, spreadsheet: Spreadsheet, formula_evaluator: FormulaEvaluator,
+                 deps_manager: DependencyManager) -> None:
+        self._spreadsheet = spreadsheet
+        self._formula_evaluator = formula_evaluator
+        self._deps_manager = deps_manager
+
+    def _topological_order(self, cells: Iterable[Coordinates]
+                           ) -> list[tuple[Coordinates, set[Coordinates]]]:
+        """
+        Returns the cells and their transitive dependents, each after its
+        precedents, along with the direct dependents of each of them.
+        """
+        order = []
+        visited = set()
+        for root in cells:
+            if root in visited:
+                continue
+            visited.add(root)
+            # Iterative depth-first search, cells are emitted in post-order
+            root_dependents = self._deps_manager.get_dependents(root)
+            stack = [(root, root_dependents, iter(root_dependents))]
+            while stack:
+                cell, cell_dependents, dependents = stack[-1]
+                for dependent in dependents:
+                    if dependent not in visited:
+                        visited.add(dependent)
+                        next_dependents = self._deps_manager.get_dependents(dependent)
+                        stack.append((dependent, next_dependents, iter(next_dependents)))
+                        break
+                else:
+                    stack.pop()
+                    order.append((cell, cell_dependents))
+        order.reverse()
+        return order
+
+    def register_formulas(self, cells: Iterable[Coordinates]) -> None:
+        """Parses the formulas in the given cells and registers their dependencies."""
+        for cell in cells:
+            content = self._spreadsheet.get_content(cell)
+            self._formula_evaluator.compile(content, cell)
+            dependencies = content.get_dependencies()
+            self._deps_manager.has_circular_dependency(cell, dependencies)
+            self._deps_manager.set_dependencies(cell, dependencies)
+            self._formula_evaluator.record(cell, content)
+
+    def set_contents(self, contents: dict[Coordinates, Content]) -> list[Coordinates]:
+        """
+        Sets the contents of several cells at once, formulas must be compiled.
+        Cycles are searched once over the final graph, then the cells and their
+        dependents are recomputed in a single pass. Nothing is changed if there
+        is a cycle or one of the formulas recomputed raises, as with the edit
+        of a single cell. Returns the recomputed cells in evaluation order.
+        """
+        previous = {}
+        formulas = []
+        for cell, content in contents.items():
+            dependencies = content.get_dependencies() if content.is_formula() else None
+            previous[cell] = self._spreadsheet.get_content(cell), self._deps_manager.get_precedents(cell)
+            self._deps_manager.set_dependencies(cell, dependencies)
+            if dependencies:
+                formulas.append(cell)
+        try:
+            self._deps_manager.check_cycles(formulas)
+        except CircularDependencyException:
+            for cell, (_, dependencies) in previous.items():
+                self._deps_manager.set_dependencies(cell, dependencies)
+            raise
+
+        for cell, content in contents.items():
+            self._spreadsheet.set_content(cell, content)
+        try:
+            recomputed = self.recalculate(contents)
+        except Exception:
+            self._restore(previous)
+            raise
+        for cell, content in contents.items():
+            self._formula_evaluator.record(cell, content)
+        return recomputed
+
+    def _restore(self, previous: dict[Coordinates, tuple[Content | None, set[Dependency]]]) -> None:
+        """Puts back the previous contents and dependencies of the cells, recomputing their dependents."""
+        for cell, (content, dependencies) in previous.items():
+            self._deps_manager.set_dependencies(cell, dependencies)
+            if content is None:
+                self._spreadsheet.remove_content(cell)
+            else:
+                self._spreadsheet.set_content(cell, content)
+        self.recalculate(previous)
+
+    @staticmethod
+    def _levels(order: list[tuple[Coordinates, set[Coordinates]]]) -> dict[Coordinates, int]:
+        """
+        Longest path to each cell from the changed cells, missing if 0.
+        Cells of the same level do not depend on each other.
+        """
+        levels = {}
+        for cell, dependents in order:
+            if dependents:
+                level = levels.get(cell, 0) + 1
+                for dependent in dependents:
+                    if levels.get(dependent, 0) < level:
+                        levels[dependent] = level
+        return levels
+
+    def _schedule(self, order: list[tuple[Coordinates, set[Coordinates]]]
+                  ) -> list[Coordinates | list[Coordinates]] | None:
+        """
+        Groups the cells into steps, single cells or runs of the same vectorized
+        formula in consecutive rows of a column, all of the same level. Steps
+        are sorted by level. None if there are no runs.
+        """
+        get_content = self._spreadsheet.get_content
+        groups: dict[tuple, list[Coordinates]] = {}
+        singles = []
+        for cell, _ in order:
+            content = get_content(cell)
+            program = content.get_program() if content is not None and content.is_formula() else None
+            if program is not None and program.vectorized:
+                groups.setdefault((program, cell.col), []).append(cell)
+            else:
+                singles.append(cell)
+        if all(len(cells) < BATCH_MIN_ROWS for cells in groups.values()):
+            return None
+
+        levels = self._levels(order)
+        steps_by_level: dict[int, list[Coordinates | list[Coordinates]]] = {}
+        for cells in groups.values():
+            if len(cells) < BATCH_MIN_ROWS:
+                singles.extend(cells)
+                continue
+            by_row = {cell.row: cell for cell in cells}
+            rows = sorted(by_row)
+            run_levels = [levels.get(by_row[row], 0) for row in rows]
+            start = 0
+            for i in range(1, len(rows) + 1):
+                if i < len(rows) and rows[i] == rows[i - 1] + 1 and run_levels[i] == run_levels[i - 1]:
+                    continue
+                run = [by_row[row] for row in rows[start:i]]
+                if len(run) >= BATCH_MIN_ROWS:
+                    steps_by_level.setdefault(run_levels[start], []).append(run)
+                else:
+                    singles.extend(run)
+                start = i
+
+        for cell in singles:
+            steps_by_level.setdefault(levels.get(cell, 0), []).append(cell)
+        return [step for level in sorted(steps_by_level) for step in steps_by_level[level]]
+
+    def _evaluate(self, cell: Coordinates) -> bool:
+        content = self._spreadsheet.get_content(cell)
+        if content is None or not content.is_formula():
+            return False
+        self._formula_evaluator.evaluate(content, self._spreadsheet)
+        self._spreadsheet.set_content(cell, content)
+        return True
+
+    def _evaluate_run(self, run: list[Coordinates]) -> None:
+        content = self._spreadsheet.get_content(run[0])
+        values = self._formula_evaluator.evaluate_run(content, len(run), self._spreadsheet)
+        if values is None:  # Evaluated one by one, so the first formula that fails raises
+            for cell in run:
+                self._evaluate(cell)
+        else:
+            self._spreadsheet.set_formula_values(run, values)
+
+    def refresh(self, cell: Coordinates) -> None:
+        """Brings the value of a cell up to date before it is read, values are always up to date here."""
+
+    def refresh_all(self) -> None:
+        """Brings every value up to date, they always are here."""
+
+    def close(self) -> None:
+        """Releases what the recalculator holds once its spreadsheet is replaced, nothing here."""
+
+    def recalculate_in_steps(self, cells: Iterable[Coordinates],
+                             step_size: int = STEP_CELLS) -> Iterator[list[Coordinates]]:
+        """
+        Recomputes the formulas in the given cells and in all the cells that
+        depend on them, yielding the recomputed cells in evaluation order
+        every `step_size` cells or so. The caller may stop between two steps,
+        as long as the sheet is not edited in between.
+        """
+        return self._evaluate_in_steps(self._topological_order(cells), step_size)
+
+    def _evaluate_in_steps(self, order: list[tuple[Coordinates, set[Coordinates]]],
+                           step_size: int) -> Iterator[list[Coordinates]]:
+        """Evaluates the cells of a topological order, yielding them every `step_size` cells."""
+        steps = self._schedule(order) if len(order) >= BATCH_MIN_ROWS else None
+        if steps is None:
+            steps = [cell for cell, _ in order]
+
+        recomputed = []
+        for step in steps:
+            if isinstance(step, list):
+                self._evaluate_run(step)
+                recomputed.extend(step)
+            elif self._evaluate(step):
+                recomputed.append(step)
+            if len(recomputed) >= step_size:
+                yield recomputed
+                recomputed = []
+        if recomputed:
+            yield recomputed
+
+    def recalculate(self, cells: Iterable[Coordinates]) -> list[Coordinates]:
+        """
+        Recomputes the formulas in the given cells and in all the cells that
+        depend on them. Returns the recomputed cells in evaluation order.
+        """
+        return [cell for step in self.recalculate_in_steps(cells, sys.maxsize) for cell in step]
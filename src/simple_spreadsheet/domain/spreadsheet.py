@@ -1,31 +1,54 @@
+from array import array
+from collections.abc import Iterator, Sequence
 from functools import singledispatchmethod
 
 from .cell import Cell
 from .contents import Content
-from .coordinates import Coordinates, Column
-from .consts import NUM_ROWS, NUM_COLS
+from .coordinates import Coordinates, ColumnLabels
+from .consts import NUM_ROWS, NUM_COLS, MAX_ROWS, MAX_COLS
+from .numeric_store import NumericStore, EMPTY, NUMBER, NOT_NUMBER
+from .aggregates import AggregateCache
+from .functions import Function
 
 
 class Spreadsheet:
-    def __init__(self) -> None:
-        self._cells = [[Cell() for _ in range(NUM_COLS)]
-                       for _ in range(NUM_ROWS)]
+    def __init__(self, rows: int = NUM_ROWS, cols: int = NUM_COLS) -> None:
+        if not (0 < rows <= MAX_ROWS and 0 < cols <= MAX_COLS):
+            raise ValueError(
+                f"Spreadsheet dimensions must be within {MAX_ROWS}x{MAX_COLS}")
 
-        self._rows = [i + 1 for i in range(NUM_ROWS)]
-        self._cols = self._generate_cols()
+        # Sparse storage: only occupied cells are kept, keyed by packed coordinates
+        self._cells: dict[int, Cell] = {}
+        # Column-major copy of the numeric values, used for fast range reads
+        self._numbers = NumericStore()
+        # Results of functions over large ranges, updated as their cells change
+        self._aggregates = AggregateCache()
+        # Keys of the cells changed since take_changes, True if their content was replaced
+        self._changes: dict[int, bool] | None = None  # Not tracked
 
-    def _generate_cols(self) -> list[str]:
-        cols = []
-        for i in range(NUM_COLS):
-            col = Column.letters_from_number(i)
-            cols.append(col)
-        return cols
+        self._num_rows = rows
+        self._num_cols = cols
 
-    def get_rows(self) -> list[int]:
-        return self._rows
+    def _grow_to_fit(self, coords: Coordinates) -> None:
+        """Extends the dimensions so that they include the given coordinates."""
+        if coords.row >= self._num_rows:
+            self._num_rows = coords.row + 1
+        if coords.col >= self._num_cols:
+            self._num_cols = coords.col + 1
 
-    def get_columns(self) -> list[str]:
-        return self._cols
+    @property
+    def num_rows(self) -> int:
+        return self._num_rows
+
+    @property
+    def num_cols(self) -> int:
+        return self._num_cols
+
+    def get_rows(self) -> range:
+        return range(1, self._num_rows + 1)
+
+    def get_columns(self) -> ColumnLabels:
+        return ColumnLabels(self._num_cols)
 
     @singledispatchmethod
     def get_cell(self, _) -> Cell:
@@ -33,8 +56,8 @@ class Spreadsheet:
 
     @get_cell.register
     def _(self, coords: Coordinates) -> Cell:
-        row, col = coords.get_indices()
-        return self._cells[row][col]
+        cell = self._cells.get(coords.key)
+        return cell if cell is not None else Cell()
 
     @get_cell.register
     def _(self, cell_id: str) -> Cell:
@@ -46,15 +69,130 @@ class Spreadsheet:
         coords = Coordinates(row, col)
         return self.get_cell(coords)
 
-    def get_all_values_as_str(self) -> list[list[Content]]:
-        return [[cell.get_value_as_str() for cell in row] for row in self._cells]
+    def get_content(self, coords: Coordinates) -> Content | None:
+        """Returns the content of a cell, skipping the type dispatch of get_cell."""
+        cell = self._cells.get(coords.key)
+        return cell.get_content() if cell is not None else None
+
+    def occupied_cells(self) -> Iterator[tuple[Coordinates, Cell]]:
+        """Yields the occupied cells in row-major order."""
+        for key in sorted(self._cells):
+            yield Coordinates.from_key(key), self._cells[key]
+
+    def get_all_values_as_str(self) -> dict[Coordinates, str]:
+        """Returns the string value of every occupied cell."""
+        return {coords: cell.get_value_as_str() for coords, cell in self.occupied_cells()}
 
     def set_content(self, coordinates, content: Content) -> None:
         if not isinstance(content, Content):
             raise TypeError(f"Invalid content type: {type(content)}")
-        cell = self.get_cell(coordinates)
+        if not isinstance(coordinates, Coordinates):
+            coordinates = Coordinates.from_id(coordinates)
+        cell = self._cells.get(coordinates.key)
+        if cell is None:
+            self._grow_to_fit(coordinates)
+            cell = self._cells[coordinates.key] = Cell()
+        if self._changes is not None:
+            replaced = cell.get_content() is not content
+            self._changes[coordinates.key] = replaced or self._changes.get(coordinates.key, False)
         cell.set_content(content)
+        self._update_number(coordinates, cell)
 
-    @property
-    def cells(self) -> list[list[Cell]]:
-        return self._cells
+    def remove_content(self, coords: Coordinates) -> None:
+        """Empties a cell, the dimensions are kept."""
+        if self._cells.pop(coords.key, None) is not None:
+            if self._changes is not None:
+                self._changes[coords.key] = True
+            self._update_number(coords, Cell())
+
+    def track_changes(self, track: bool = True) -> None:
+        """Starts or stops recording the cells whose content or value change, see take_changes."""
+        self._changes = {} if track else None
+
+    def take_changes(self) -> dict[int, bool]:
+        """
+        Returns the keys of the cells changed since the previous call, or since
+        the changes are tracked, and whether their content was replaced or only
+        their value changed.
+        """
+        changes, self._changes = self._changes, {}
+        return changes
+
+    def _update_number(self, coords: Coordinates, cell: Cell) -> None:
+        """Keeps the numeric store in sync with the value of a cell."""
+        try:
+            value = cell.get_value_as_float()
+            state = EMPTY if value is None else NUMBER
+        except ValueError:
+            value, state = None, NOT_NUMBER
+        if self._aggregates:
+            self._aggregates.update(coords, self._numbers.get(coords.row, coords.col), value)
+        self._numbers.set(coords.row, coords.col, value, state)
+
+    def get_number(self, coords: Coordinates) -> float | None:
+        """
+        Returns the numeric value of a cell, or None if it is empty.
+        Raises ValueError if the cell holds a non-numeric value.
+        """
+        return self.get_number_at(coords.row, coords.col)
+
+    def get_number_at(self, row: int, col: int) -> float | None:
+        value = self._numbers.get(row, col)
+        if value is None and self._numbers.get_state(row, col) == NOT_NUMBER:
+            return self.get_cell(Coordinates(row, col)).get_value_as_float()
+        return value
+
+    def get_range_values(self, top_left: Coordinates, bottom_right: Coordinates) -> Sequence[float]:
+        """
+        Returns the numeric values inside a range, skipping empty cells.
+        Raises ValueError if any cell holds a non-numeric value.
+        """
+        return self.get_range_values_at(top_left.row, top_left.col, bottom_right.row, bottom_right.col)
+
+    def get_range_values_at(self, min_row: int, min_col: int, max_row: int, max_col: int) -> Sequence[float]:
+        if self._numbers.has_non_numbers(min_row, min_col, max_row, max_col):
+            # Slow path, reports the first offending cell in row-major order
+            for row in range(min_row, max_row + 1):
+                for col in range(min_col, max_col + 1):
+                    self.get_number_at(row, col)
+        return self._numbers.read(min_row, min_col, max_row, max_col)
+
+    def get_column_values_at(self, row: int, col: int, num_rows: int) -> array | None:
+        """
+        Returns the values of `num_rows` cells down a column, empty cells are 0.
+        None if any cell holds a non-numeric value.
+        """
+        if self._numbers.has_non_numbers(row, col, row + num_rows - 1, col):
+            return None
+        return self._numbers.read_rows(row, col, num_rows)
+
+    def set_formula_values(self, cells: Sequence[Coordinates], values: array) -> None:
+        """Sets the values of the formulas in consecutive rows of a column, at once."""
+        if self._aggregates:
+            for coords, value in zip(cells, values):
+                self._aggregates.update(coords, self._numbers.get(coords.row, coords.col), value)
+        if self._changes is not None:
+            for coords in cells:
+                self._changes.setdefault(coords.key, False)
+        for coords, value in zip(cells, values):
+            self._cells[coords.key].content.set_value(value)
+        self._numbers.set_numbers(cells[0].row, cells[0].col, values)
+
+    def get_range_aggregate(self, function: type[Function], top_left: Coordinates,
+                            bottom_right: Coordinates) -> float:
+        """
+        Returns the result of a function whose only argument is a range.
+        Raises ValueError if any cell holds a non-numeric value.
+        """
+        return self.get_range_aggregate_at(function, top_left.row, top_left.col,
+                                           bottom_right.row, bottom_right.col)
+
+    def get_range_aggregate_at(self, function: type[Function], min_row: int, min_col: int,
+                               max_row: int, max_col: int) -> float:
+        if self._numbers.has_non_numbers(min_row, min_col, max_row, max_col):
+            return function.reduce(self.get_range_values_at(min_row, min_col, max_row, max_col))
+        return self._aggregates.get(function, min_row, min_col, max_row, max_col, self._numbers)
+
+    def get_aggregate_counters(self) -> tuple[int, int]:
+        """Hits and misses of the range aggregates cache."""
+        return self._aggregates.hits, self._aggregates.misses
@@ -0,0 +1,160 @@
+import math
+from array import array
+from collections.abc import Sequence
+from functools import cache
+from itertools import chain, compress
+
+# Below this size the overhead of calling NumPy outweighs the vectorization
+VECTORIZE_MIN_SIZE = 256
+
+# Values checked and summed at a time by the exact sums
+_CHUNK_SIZE = 16384
+
+# Largest exponent of the power of two used to scale exact sums
+_MAX_SCALE_EXPONENT = 1000
+
+# Every finite float is an integer multiple of the smallest subnormal, 2**-1074
+_UNIT_EXPONENT = 1074
+_UNITS_PER_ONE = 1 << _UNIT_EXPONENT
+
+
+@cache
+def numpy_module():
+    """NumPy, imported on first use so that importing the engine stays fast. None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional, the pure Python reductions give the same results
+        return None
+    return numpy
+
+
+def _as_vector(values: Sequence[float]):
+    """Returns a NumPy view of a large float buffer, None if it is not worth vectorizing."""
+    if type(values) is not array or len(values) < VECTORIZE_MIN_SIZE:
+        return None
+    np = numpy_module()
+    if np is None:
+        return None
+    return np.frombuffer(values, dtype=np.float64)
+
+
+def _exact_vector_sum(vector) -> float | None:
+    """
+    Sum of the vector computed with NumPy if every partial sum is exact, so
+    the result does not depend on the summation order. None otherwise.
+    """
+    largest = max(-float(vector.min()), float(vector.max()))
+    if not math.isfinite(largest):
+        return None
+    # Every partial sum is below 2**exponent in magnitude
+    exponent = math.frexp(largest)[1] + len(vector).bit_length()
+    if 53 - exponent > _MAX_SCALE_EXPONENT:
+        return None
+    scale = math.ldexp(1.0, 53 - exponent)
+    np = numpy_module()
+
+    # Scaled by a power of two, the values must be integers whose sums fit in a
+    # float. Chunks stay in cache and most vectors are rejected on the first one.
+    result = 0.0
+    for start in range(0, len(vector), _CHUNK_SIZE):
+        scaled = vector[start:start + _CHUNK_SIZE] * scale
+        if not np.array_equal(np.trunc(scaled), scaled):
+            return None
+        result += float(scaled.sum())
+    return 0.0 + result / scale
+
+
+def exact_units(value: float) -> int:
+    """Exact value of a finite float, in units of 2**-1074."""
+    numerator, denominator = value.as_integer_ratio()
+    return numerator << (_UNIT_EXPONENT + 1 - denominator.bit_length())
+
+
+def units_to_float(units: int) -> float:
+    """Correctly rounded value of an exact sum in units of 2**-1074."""
+    try:
+        return units / _UNITS_PER_ONE
+    except OverflowError:
+        return math.inf if units > 0 else -math.inf
+
+
+def exact_total(values: Sequence[float]) -> int:
+    """
+    Exact sum of the values, in units of 2**-1074.
+    Raises ValueError or OverflowError if a value is not finite.
+    """
+    vector = _as_vector(values)
+    if vector is not None and (result := _exact_vector_sum(vector)) is not None:
+        return exact_units(result)
+
+    # Each correctly rounded sum of the remainder adds about 53 exact bits
+    parts = []
+    try:
+        part = math.fsum(values)
+        while part:
+            if not math.isfinite(part):
+                raise ValueError("Values must be finite")
+            parts.append(part)
+            part = math.fsum(chain(values, (-previous for previous in parts)))
+    except OverflowError:  # An intermediate sum overflowed
+        parts = values
+    return sum(map(exact_units, parts))
+
+
+def total(values: Sequence[float]) -> float:
+    """
+    Correctly rounded sum, as math.fsum, so it does not depend on the order
+    of the values. 0 if there are no values.
+    """
+    if not len(values):
+        return 0
+    vector = _as_vector(values)
+    if vector is not None and (result := _exact_vector_sum(vector)) is not None:
+        return result
+
+    try:
+        return math.fsum(values)
+    except OverflowError:  # An intermediate sum overflowed, the exact sum may still fit
+        if all(map(math.isfinite, values)):
+            return units_to_float(sum(map(exact_units, values)))
+        return sum(values)
+    except ValueError:  # Infinities of both signs
+        return math.nan
+
+
+def _extreme(vector, result: float) -> float | None:
+    """
+    Checks an extreme found by NumPy against the builtins, which return the
+    first value equal to it. None if the builtins must decide.
+    """
+    if result != result:  # NaNs depend on the order in which values are compared
+        return None
+    if result == 0.0:  # 0 and -0 are equal, the first one seen wins
+        return float(vector[numpy_module().argmax(vector == 0.0)])
+    return result
+
+
+def minimum(values: Sequence[float]) -> float:
+    """Same result as the builtin min, 0 if there are no values."""
+    vector = _as_vector(values)
+    if vector is not None and (result := _extreme(vector, float(vector.min()))) is not None:
+        return result
+    return min(values, default=0.0)
+
+
+def maximum(values: Sequence[float]) -> float:
+    """Same result as the builtin max, 0 if there are no values."""
+    vector = _as_vector(values)
+    if vector is not None and (result := _extreme(vector, float(vector.max()))) is not None:
+        return result
+    return max(values, default=0.0)
+
+
+def select(values: array, mask: bytes) -> array:
+    """Returns the values whose mask byte is not zero."""
+    np = numpy_module() if len(mask) >= VECTORIZE_MIN_SIZE else None
+    if np is None:
+        return array('d', compress(values, mask))
+    vector = np.frombuffer(values, dtype=np.float64, count=len(mask))
+    selected = vector[np.frombuffer(mask, dtype=np.uint8) != 0]
+    return array('d', selected.tobytes())
@@ -46,34 +46,29 @@ class FileManager:
             for row in output:
                 file.write(";".join(row) + "\n")
 
+    def _collect_rows(self, spreadsheet: Spreadsheet) -> dict[int, dict[int, str]]:
+        """Groups the non-empty dumped values of the occupied cells by row."""
+        rows: dict[int, dict[int, str]] = {}
+        for coords, cell in spreadsheet.occupied_cells():
+            cell_output = cell.get_value_to_dump()
+            if cell_output != "":
+                rows.setdefault(coords.row, {})[coords.col] = cell_output
+        return rows
+
     def save(self, spreadsheet: Spreadsheet, file_path: str) -> None:
         """Saves a Spreadsheet object to a file."""
         try:
-            cells = spreadsheet.cells
+            rows = self._collect_rows(spreadsheet)
             output = []
-            last_non_empty_row = -1
-
-            for row_index, row in enumerate(cells):
-                row_output = []
-                last_non_empty_col = -1
-
-                for col_index, cell in enumerate(row):
-                    cell_output = cell.get_value_to_dump()
-                    row_output.append(cell_output)
-                    if cell_output != "":
-                        last_non_empty_col = col_index
-
-                # Trim to the last non-empty column
-                if last_non_empty_col >= 0:
-                    row_output = row_output[:last_non_empty_col + 1]
-                    last_non_empty_row = row_index
-                else:
-                    row_output = []  # Skip empty rows
 
-                output.append(row_output)
+            # Rows and columns are trimmed to the last non-empty cell
+            last_non_empty_row = max(rows, default=-1)
+            for row_index in range(last_non_empty_row + 1):
+                row = rows.get(row_index, {})
+                last_non_empty_col = max(row, default=-1)
+                output.append([row.get(col_index, "")
+                               for col_index in range(last_non_empty_col + 1)])
 
-            # Trim to the last non-empty row
-            output = output[:last_non_empty_row + 1]
             self._write_file(file_path, output)
         except Exception as e:
             raise SavingSpreadsheetException(str(e))
@@ -20,11 +20,14 @@ class Grid(DataTable):
         self.fixed_columns = 1
 
         rows = self.controller.spreadsheet.get_rows()
-        vals = self.controller.spreadsheet.get_all_values_as_str()
+        empty_row = [""] * len(cols)
+        for row_name in rows:
+            self.add_row(row_name, *empty_row, key=row_name)
 
-        for i, row_name in enumerate(rows):
-            row_vals = vals[i]
-            self.add_row(row_name, *row_vals, key=row_name)
+        # Only occupied cells need to be filled in
+        vals = self.controller.spreadsheet.get_all_values_as_str()
+        for coords, value in vals.items():
+            self.update_cell_at((coords.row, coords.col + 1), value)
 
     def compose(self) -> ComposeResult:
         self.refresh_grid()
@@ -2,11 +2,16 @@ from textual.app import App, ComposeResult
 from textual.widgets import Footer, Input, Header
 from textual.binding import Binding
 from textual import work
+from textual.worker import Worker, get_current_worker
 
 from simple_spreadsheet.domain.coordinates import Coordinates
 from .grid import Grid
 from .dialogs import ConfirmDialog, SaveDialog, LoadDialog
 
+# Worker group of the recalculations, a new one cancels the previous
+RECALCULATION = "recalculation"
+CALCULATING = "calculating…"
+
 
 class UserInterface(App):
     """App to display an Excel-like grid in Textual."""
@@ -93,6 +98,8 @@ class UserInterface(App):
         """Handle the create action with confirmation."""
         dialog = ConfirmDialog()
         if await self.push_screen_wait(dialog):
+            self.workers.cancel_group(self, RECALCULATION)
+            self.sub_title = ""
             self.controller.create_new_spreadsheet()
             self.grid.refresh_grid()
             self.text_input.value = ""
@@ -115,10 +122,16 @@ class UserInterface(App):
         load_dialog = LoadDialog()
         file_path = await self.push_screen_wait(load_dialog)
         if file_path:
+            self.workers.cancel_group(self, RECALCULATION)
+            self.sub_title = ""
             self.controller.load_spreadsheet(file_path)
             self.grid.refresh_grid()
             self.text_input.value = ""
             self.refresh()
+            eliminated = self.controller.get_eliminated_formula_nodes()
+            if eliminated:
+                self.notify(f"{eliminated} formula nodes optimized away",
+                            title="Spreadsheet loaded")
 
     def action_unfocus_input(self) -> None:
         """Handle unfocusing the input widget when 'esc' is pressed."""
@@ -131,12 +144,17 @@ class UserInterface(App):
             # Ensure we're working with string values
             new_value = message.value
 
-            # Update the spreadsheet
-            self.controller.edit_cell(
-                self.grid.selected_cell.row,
-                self.grid.selected_cell.col,
-                new_value
-            )
+            # Stop the stale recalculation at its next step, then update the spreadsheet
+            self.workers.cancel_group(self, RECALCULATION)
+            try:
+                self.controller.edit_cell_deferred(
+                    self.grid.selected_cell.row,
+                    self.grid.selected_cell.col,
+                    new_value
+                )
+            finally:  # Also resumes the cancelled recalculation if the edit is rejected
+                self.sub_title = CALCULATING
+                self._recalculate()
 
             display_value = self.controller.spreadsheet.get_cell(
                 self.grid.selected_cell).get_value_as_str()
@@ -171,3 +189,27 @@ class UserInterface(App):
         """Edit a cell in the spreadsheet."""
         position = (coords.row, coords.col+1)
         self.grid.update_cell_at(position, value, update_width=True)
+
+    def update_cells_view(self, values: dict[Coordinates, str]) -> None:
+        """Edit several cells in the spreadsheet, refreshing the screen once."""
+        with self.batch_update():
+            for coords, value in values.items():
+                self.update_cell_view(coords, value)
+
+    @work(thread=True, exclusive=True, group=RECALCULATION, exit_on_error=False)
+    def _recalculate(self) -> None:
+        """Recomputes the dependents of the edits in a thread, streaming their values to the grid."""
+        worker = get_current_worker()
+        try:
+            finished = self.controller.recalculate_deferred(
+                lambda values: self.call_from_thread(self.update_cells_view, values),
+                lambda: worker.is_cancelled)
+        except Exception as e:
+            self.call_from_thread(self.notify, str(e), title="Ooops...", severity="error", timeout=None)
+            finished = True
+        if finished:
+            self.call_from_thread(self._end_recalculation, worker)
+
+    def _end_recalculation(self, worker: Worker) -> None:
+        if not worker.is_cancelled:  # Otherwise a newer recalculation is pending
+            self.sub_title = ""
@@ -1,56 +1,37 @@
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from functools import singledispatchmethod
 
 from ..domain.spreadsheet import Spreadsheet
 from ..domain.coordinates import Coordinates
-from ..domain.contents import ContentFactory, Content
-from ..domain.formula_evaluation import FormulaEvaluator
-from ..domain.dependency_manager import DependencyManager
 from ..framework.ui import UserInterface
-from ..framework.file_manager import FileManager
+from .spreadsheet_engine import SpreadsheetEngine
 
 
 class Controller:
+    """Connects the user interface to the spreadsheet engine, showing the values it changes."""
 
     def __init__(self) -> None:
-        self._spreadsheet = Spreadsheet()
-        self._formula_evaluator = FormulaEvaluator()
-        self._deps_manager = DependencyManager()
-        self._file_manager = FileManager()
+        self._engine = SpreadsheetEngine(on_update=self._show_values)
         self._ui = UserInterface(self)
         self._ui.run()
 
+    def _show_values(self, cells: list[Coordinates]) -> None:
+        self._ui.update_cells_view({cell: self._engine.get_value_as_str(cell) for cell in cells})
+
     def create_new_spreadsheet(self) -> None:
-        self._spreadsheet = Spreadsheet()
-        self._deps_manager = DependencyManager()
-
-    def _recompute_cells(self, cells: list[Coordinates]) -> None:
-        for cell in cells:
-            content = self._spreadsheet.get_cell(cell).get_content()
-            if content.is_formula():
-                self._formula_evaluator.evaluate(content, self._spreadsheet)
-                self._spreadsheet.set_content(cell, content)
-                self._ui.update_cell_view(cell, content.get_value_as_str())
-                dependants = self._deps_manager.get_dependents(cell)
-                self._recompute_cells(dependants)
-
-    def _create_content(self, value: str, coords: Coordinates,) -> tuple[Content, list[Coordinates]]:
-        new_content = ContentFactory.create(value)
-        dependencies = None
-        if new_content.is_formula():
-            self._formula_evaluator.get_postfix(new_content)
-            dependencies = new_content.get_dependencies()
-            self._deps_manager.has_circular_dependency(coords, dependencies)
-            self._formula_evaluator.evaluate(new_content, self._spreadsheet)
-        return new_content, dependencies
-
-    def _assign_content(self, coords: Coordinates, content: Content, dependencies: list[Coordinates]) -> None:
-        self._spreadsheet.set_content(coords, content)
-        self._deps_manager.set_dependencies(coords, dependencies)
-        self._recompute_cells(self._deps_manager.get_dependents(coords))
+        self._engine.new_spreadsheet()
 
     def set_cell_content(self, coords: Coordinates, new_value: str) -> None:
-        content, dependencies = self._create_content(new_value, coords)
-        self._assign_content(coords, content, dependencies)
+        self._engine.set_cell_content(coords, new_value)
+
+    def batch(self) -> AbstractContextManager[None]:
+        """Defers the edits made inside the block, see SpreadsheetEngine.batch."""
+        return self._engine.batch()
+
+    def set_many(self, values: dict[Coordinates, str]) -> None:
+        """Sets the contents of several cells, recomputing their dependents once."""
+        self._engine.set_many(values)
 
     @singledispatchmethod
     def edit_cell(self, _) -> None:
@@ -66,16 +47,29 @@ class Controller:
         coords = Coordinates(row, col)
         self.set_cell_content(coords, value)
 
+    def edit_cell_deferred(self, row: int, col: int, value: str) -> None:
+        """Sets the content of a cell, leaving its dependents to recalculate_deferred."""
+        self._engine.set_cell_content_deferred(Coordinates(row, col), value)
+
+    def recalculate_deferred(self, show_values: Callable[[dict[Coordinates, str]], None],
+                             is_cancelled: Callable[[], bool]) -> bool:
+        """Recomputes the dependents of the deferred edits step by step, see SpreadsheetEngine."""
+        return self._engine.recalculate_deferred(show_values, is_cancelled)
+
+    def get_eliminated_formula_nodes(self) -> int:
+        """Formula nodes removed by the optimizer in the current spreadsheet."""
+        return self._engine.get_eliminated_formula_nodes()
+
     def save_spreadsheet(self, file_path: str) -> None:
-        self._file_manager.save(self._spreadsheet, file_path)
+        self._engine.save(file_path)
 
     def load_spreadsheet(self, file_path: str) -> None:
-        spreadsheet, coords_with_formulas = self._file_manager.read(file_path)
-        self._formula_evaluator = FormulaEvaluator()
-        self._deps_manager = DependencyManager()
-        self._spreadsheet = spreadsheet
-        self._recompute_cells(coords_with_formulas)
+        self._engine.load(file_path)
+
+    def get_aggregate_counters(self) -> tuple[int, int]:
+        """Hits and misses of the range aggregates cache of the current spreadsheet."""
+        return self._engine.get_aggregate_counters()
 
     @property
     def spreadsheet(self) -> Spreadsheet:
-        return self._spreadsheet
+        return self._engine.spreadsheet
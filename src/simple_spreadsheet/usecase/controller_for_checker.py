@@ -1,77 +1,56 @@
+from contextlib import AbstractContextManager
 
 from ..domain.spreadsheet import Spreadsheet
 from ..domain.coordinates import Coordinates
-from ..domain.contents import ContentFactory, Content
-from ..domain.formula_evaluation import FormulaEvaluator
-from ..domain.dependency_manager import DependencyManager
-from ..framework.file_manager import FileManager
+from .spreadsheet_engine import SpreadsheetEngine
 
 from tests.automatic_grader.usecasesmarker import ISpreadsheetControllerForChecker
 from tests.automatic_grader.entities.no_number_exception import NoNumberException
 
 
 class ControllerForChecker(ISpreadsheetControllerForChecker):
-    def __init__(self) -> None:
-        self._spreadsheet = Spreadsheet()
-        self._formula_evaluator = FormulaEvaluator()
-        self._deps_manager = DependencyManager()
-        self._file_manager = FileManager()
+    def __init__(self, lazy: bool = False, processes: int = 1) -> None:
+        """
+        In lazy mode formulas are only evaluated when their values are read.
+        With several processes, large recalculations are spread over them.
+        """
+        self._engine = SpreadsheetEngine(lazy, processes)
 
-    def _recompute_cells(self, cells: list[Coordinates]) -> None:
-        for cell in cells:
-            content = self._spreadsheet.get_cell(cell).get_content()
-            if content.is_formula():
-                self._formula_evaluator.evaluate(content, self._spreadsheet)
-                self._spreadsheet.set_content(cell, content)
-
-                dependants = self._deps_manager.get_dependents(cell)
-                self._recompute_cells(dependants)
-
-    def _create_content(self, value: str, coords: Coordinates,) -> tuple[Content, list[Coordinates]]:
-        new_content = ContentFactory.create(value)
-        dependencies = None
-        if new_content.is_formula():
-            self._formula_evaluator.get_postfix(new_content)
-            dependencies = new_content.get_dependencies()
-            self._deps_manager.has_circular_dependency(coords, dependencies)
-            self._formula_evaluator.evaluate(new_content, self._spreadsheet)
-        return new_content, dependencies
+    def set_cell_content(self, coord, str_content) -> None:
+        self._engine.set_cell_content(Coordinates.from_id(coord), str_content)
 
-    def _assign_content(self, coords: Coordinates, content: Content, dependencies: list[Coordinates]) -> None:
-        self._spreadsheet.set_content(coords, content)
-        self._deps_manager.set_dependencies(coords, dependencies)
-        self._recompute_cells(self._deps_manager.get_dependents(coords))
+    def batch(self) -> AbstractContextManager[None]:
+        """Defers the edits made inside the block, see SpreadsheetEngine.batch."""
+        return self._engine.batch()
 
-    def set_cell_content(self, coord, str_content) -> None:
-        coords = Coordinates.from_id(coord)
-        content, dependencies = self._create_content(str_content, coords)
-        self._assign_content(coords, content, dependencies)
+    def set_many(self, contents: dict[str, str]) -> None:
+        """Sets the contents of several cells, recomputing their dependents once."""
+        self._engine.set_many({Coordinates.from_id(coord): str_content
+                               for coord, str_content in contents.items()})
 
     def get_cell_content_as_float(self, coord) -> float:
-        coords = Coordinates.from_id(coord)
-        cell = self._spreadsheet.get_cell(coords)
-        value = cell.get_value_as_float()
+        value = self._engine.get_value_as_float(Coordinates.from_id(coord))
         if value is None:
             raise NoNumberException(f"Cell {coord} does not contain a number")
         return value
 
     def get_cell_content_as_string(self, coord) -> str:
-        coords = Coordinates.from_id(coord)
-        cell = self._spreadsheet.get_cell(coords)
-        return cell.get_value_as_str()
+        return self._engine.get_value_as_str(Coordinates.from_id(coord))
 
     def get_cell_formula_expression(self, coord) -> str:
-        coords = Coordinates.from_id(coord)
-        cell = self._spreadsheet.get_cell(coords)
-        return cell.get_content().expression
+        return self._engine.get_content(Coordinates.from_id(coord)).expression
 
     def save_spreadsheet_to_file(self, s_name_in_user_dir) -> None:
-        self._file_manager.save(self._spreadsheet, s_name_in_user_dir)
+        self._engine.save(s_name_in_user_dir)
 
     def load_spreadsheet_from_file(self, s_name_in_user_dir) -> None:
-        spreadsheet, coords_with_formulas = self._file_manager.read(
-            s_name_in_user_dir)
-        self._formula_evaluator = FormulaEvaluator()
-        self._deps_manager = DependencyManager()
-        self._spreadsheet = spreadsheet
-        self._recompute_cells(coords_with_formulas)
+        self._engine.load(s_name_in_user_dir)
+
+    def get_aggregate_counters(self) -> tuple[int, int]:
+        """Hits and misses of the range aggregates cache of the current spreadsheet."""
+        return self._engine.get_aggregate_counters()
+
+    @property
+    def spreadsheet(self) -> Spreadsheet:
+        """The current spreadsheet, with every value up to date."""
+        return self._engine.spreadsheet
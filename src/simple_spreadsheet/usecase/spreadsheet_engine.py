@@ -0,0 +1,226 @@
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from ..domain.spreadsheet import Spreadsheet
+from ..domain.coordinates import Coordinates
+from ..domain.contents import ContentFactory, Content
+from ..domain.formula_evaluation import FormulaEvaluator
+from ..domain.dependency_manager import DependencyManager
+from ..domain.recalculator import Recalculator
+from ..domain.lazy_recalculator import LazyRecalculator
+from ..framework.file_manager import FileManager
+
+# Called with the cells whose values may have changed
+type UpdateListener = Callable[[list[Coordinates]], None]
+
+
+class SpreadsheetEngine:
+    """
+    Spreadsheet without user interface: owns the cells, the evaluation of
+    their formulas, the dependencies between them and the files. The user
+    interface and the checker controllers are adapters around it, importing
+    it imports neither Textual nor the grader.
+    """
+
+    def __init__(self, lazy: bool = False, processes: int = 1,
+                 on_update: UpdateListener | None = None) -> None:
+        """
+        In lazy mode formulas are only evaluated when their values are read.
+        With several processes, large recalculations are spread over them.
+        `on_update` is told about the cells changed by each edit, loading a
+        file changes them all and is not reported.
+        """
+        if processes < 1:
+            raise ValueError("There must be at least one process")
+        if lazy and processes > 1:
+            raise ValueError("Lazy evaluation is not done in parallel")
+        self._lazy = lazy
+        self._processes = processes
+        self._on_update = on_update
+        self._spreadsheet = Spreadsheet()
+        self._formula_evaluator = FormulaEvaluator()
+        self._deps_manager = DependencyManager()
+        self._file_manager = FileManager()
+        self._recalculator = self._create_recalculator(self._spreadsheet, self._formula_evaluator,
+                                                       self._deps_manager)
+        self._pending: dict[Coordinates, Content] | None = None  # Edits of the current batch
+        # Edited cells whose dependents are left to recalculate_deferred
+        self._deferred: set[Coordinates] = set()
+        # Held by deferred edits and by each step of a deferred recalculation
+        self._lock = threading.Lock()
+
+    def _create_recalculator(self, spreadsheet: Spreadsheet, formula_evaluator: FormulaEvaluator,
+                             deps_manager: DependencyManager) -> Recalculator:
+        if self._lazy:
+            return LazyRecalculator(spreadsheet, formula_evaluator, deps_manager)
+        if self._processes > 1:
+            # Imported on demand, multiprocessing takes longer to import than the engine
+            from ..domain.parallel_recalculator import ParallelRecalculator
+            return ParallelRecalculator(spreadsheet, formula_evaluator, deps_manager, self._processes)
+        return Recalculator(spreadsheet, formula_evaluator, deps_manager)
+
+    def _notify(self, cells: list[Coordinates]) -> None:
+        if self._on_update is not None and cells:
+            self._on_update(cells)
+
+    def new_spreadsheet(self) -> None:
+        with self._lock:
+            self._recalculator.close()
+            self._spreadsheet = Spreadsheet()
+            self._formula_evaluator = FormulaEvaluator()
+            self._deps_manager = DependencyManager()
+            self._recalculator = self._create_recalculator(self._spreadsheet, self._formula_evaluator,
+                                                           self._deps_manager)
+            self._deferred.clear()
+
+    def _compile_content(self, value: str, coords: Coordinates) -> Content:
+        new_content = ContentFactory.create(value)
+        if new_content.is_formula():
+            self._formula_evaluator.compile(new_content, coords)
+        return new_content
+
+    def _create_content(self, value: str, coords: Coordinates) -> tuple[Content, list[Coordinates] | None]:
+        new_content = self._compile_content(value, coords)
+        dependencies = None
+        if new_content.is_formula():
+            dependencies = new_content.get_dependencies()
+            self._deps_manager.has_circular_dependency(coords, dependencies)
+            if not self._lazy:
+                self._formula_evaluator.evaluate(new_content, self._spreadsheet)
+        return new_content, dependencies
+
+    def _assign_content(self, coords: Coordinates, content: Content,
+                        dependencies: list[Coordinates] | None) -> None:
+        self._spreadsheet.set_content(coords, content)
+        self._deps_manager.set_dependencies(coords, dependencies)
+        self._formula_evaluator.record(coords, content)
+        if self._lazy:
+            self._recalculator.recalculate([coords])
+            self._notify([coords])
+        else:
+            self._notify([coords, *self._recalculator.recalculate(self._deps_manager.get_dependents(coords))])
+
+    def set_cell_content(self, coords: Coordinates, value: str) -> None:
+        if self._pending is not None:
+            self._pending[coords] = self._compile_content(value, coords)
+            return
+        content, dependencies = self._create_content(value, coords)
+        self._assign_content(coords, content, dependencies)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defers the edits made inside the block, they are applied together when
+        it ends: cycles are checked once and the changed cells are recomputed
+        in a single pass. Nothing is changed if the block raises, the edits
+        close a cycle or one of the formulas recomputed raises. Nested blocks
+        join the outer one.
+        """
+        if self._pending is not None:
+            yield
+            return
+        self._pending = {}
+        try:
+            yield
+            pending = self._pending
+        finally:
+            self._pending = None
+        recomputed = self._recalculator.set_contents(pending)
+        self._notify(list(dict.fromkeys([*pending, *recomputed])))
+
+    def set_many(self, values: dict[Coordinates, str]) -> None:
+        """Sets the contents of several cells, recomputing their dependents once."""
+        with self.batch():
+            for coords, value in values.items():
+                self.set_cell_content(coords, value)
+
+    def set_cell_content_deferred(self, coords: Coordinates, value: str) -> None:
+        """
+        Sets the content of a cell, leaving its dependents to
+        recalculate_deferred. Waits for the step of a deferred recalculation
+        in progress, which must have been cancelled beforehand.
+        """
+        with self._lock:
+            content, dependencies = self._create_content(value, coords)
+            self._spreadsheet.set_content(coords, content)
+            self._deps_manager.set_dependencies(coords, dependencies)
+            self._formula_evaluator.record(coords, content)
+            self._deferred.add(coords)
+
+    def recalculate_deferred(self, show_values: Callable[[dict[Coordinates, str]], None],
+                             is_cancelled: Callable[[], bool]) -> bool:
+        """
+        Recomputes the dependents of the deferred edits step by step, passing
+        the values of each step to `show_values`. It stops at the next step
+        once `is_cancelled` is true, the edits then stay deferred for the next
+        pass. Returns whether the pass finished.
+        """
+        with self._lock:
+            roots = list(self._deferred)
+            steps = self._recalculator.recalculate_in_steps(roots)
+        while True:
+            with self._lock:  # Checked with the lock held, edits cancel the pass before taking it
+                if is_cancelled():
+                    return False
+                try:
+                    cells = next(steps, None)
+                except Exception:
+                    # As with any edit, the cells evaluated before the error keep their values
+                    self._deferred.difference_update(roots)
+                    raise
+                if cells is None:
+                    self._deferred.difference_update(roots)
+                    return True
+                values = {cell: self._spreadsheet.get_cell(cell).get_value_as_str() for cell in cells}
+            show_values(values)
+
+    def get_content(self, coords: Coordinates) -> Content | None:
+        return self._spreadsheet.get_content(coords)
+
+    def get_value_as_float(self, coords: Coordinates) -> float | None:
+        """Value of a cell as a number, None if it is empty."""
+        self._recalculator.refresh(coords)
+        return self._spreadsheet.get_cell(coords).get_value_as_float()
+
+    def get_value_as_str(self, coords: Coordinates) -> str:
+        self._recalculator.refresh(coords)
+        return self._spreadsheet.get_cell(coords).get_value_as_str()
+
+    def save(self, file_path: str) -> None:
+        with self._lock:
+            self._file_manager.save(self._spreadsheet, file_path)
+
+    def load(self, file_path: str) -> None:
+        """Replaces the spreadsheet with the one in the file, which is left unchanged if it can not be loaded."""
+        spreadsheet, coords_with_formulas = self._file_manager.read(file_path)
+        formula_evaluator = FormulaEvaluator()
+        deps_manager = DependencyManager()
+        recalculator = self._create_recalculator(spreadsheet, formula_evaluator, deps_manager)
+        try:
+            recalculator.register_formulas(coords_with_formulas)
+            recalculator.recalculate(coords_with_formulas)
+        except Exception:
+            recalculator.close()
+            raise
+        with self._lock:
+            self._recalculator.close()
+            self._spreadsheet = spreadsheet
+            self._formula_evaluator = formula_evaluator
+            self._deps_manager = deps_manager
+            self._recalculator = recalculator
+            self._deferred.clear()
+
+    def get_eliminated_formula_nodes(self) -> int:
+        """Formula nodes removed by the optimizer in the current spreadsheet."""
+        return self._formula_evaluator.eliminated_nodes
+
+    def get_aggregate_counters(self) -> tuple[int, int]:
+        """Hits and misses of the range aggregates cache of the current spreadsheet."""
+        return self._spreadsheet.get_aggregate_counters()
+
+    @property
+    def spreadsheet(self) -> Spreadsheet:
+        """The current spreadsheet, with every value up to date."""
+        self._recalculator.refresh_all()
+        return self._spreadsheet
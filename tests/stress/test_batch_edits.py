@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from simple_spreadsheet.domain.dependency_manager import CircularDependencyException
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 25_000
+NUM_UPDATES = 5_000
+
+
+class BatchEditsTest(unittest.TestCase):
+    """Edits applied in a batch must leave the sheet as the same edits applied one by one."""
+
+    @staticmethod
+    def _values(controller: ControllerForChecker) -> dict[str, str]:
+        return {coords.id: value for coords, value in controller.spreadsheet.get_all_values_as_str().items()}
+
+    def test_set_many_matches_sequential_edits(self) -> None:
+        rng = random.Random(2024)
+        edits = {"D1": f"=SUMA(A1:A{NUM_ROWS})", "E1": f"=MAX(B1:B{NUM_ROWS})"}
+        for row in range(1, NUM_ROWS + 1):
+            edits[f"A{row}"] = "" if rng.random() < 0.05 else f"{rng.uniform(-100, 100):.2f}"
+            edits[f"B{row}"] = f"=A{row}*2+1"
+        updates = {}
+        for _ in range(NUM_UPDATES):
+            updates[f"A{rng.randint(1, NUM_ROWS)}"] = f"{rng.uniform(-100, 100):.2f}"
+        updates["C1"] = "=D1/E1"
+
+        sequential, batched = ControllerForChecker(), ControllerForChecker()
+        for changes in (edits, updates):
+            for coord, content in changes.items():
+                sequential.set_cell_content(coord, content)
+            batched.set_many(changes)
+            self.assertEqual(self._values(batched), self._values(sequential))
+
+    def test_cycle_discards_the_batch(self) -> None:
+        controller = ControllerForChecker()
+        controller.set_many({"A1": "1", "B1": "=A1+1"})
+        with self.assertRaises(CircularDependencyException):
+            with controller.batch():
+                controller.set_cell_content("C1", "5")
+                controller.set_cell_content("A1", "=B1")
+
+        self.assertEqual(controller.get_cell_content_as_float("A1"), 1.0)
+        self.assertEqual(controller.get_cell_content_as_string("C1"), "")
+        controller.set_cell_content("A1", "3")
+        self.assertEqual(controller.get_cell_content_as_float("B1"), 4.0)
+        controller.set_cell_content("B1", "=A1*2")  # Checked against the graph before the batch
+        self.assertEqual(controller.get_cell_content_as_float("B1"), 6.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.dependency_manager import CircularDependencyException
+from simple_spreadsheet.usecase.spreadsheet_engine import SpreadsheetEngine
+
+# Imported on first use, the engine must start without them
+DEFERRED_MODULES = ["numpy", "multiprocessing", "concurrent.futures", "textual"]
+
+
+class EngineStartupTest(unittest.TestCase):
+    """The headless engine must start without the heavy modules and work without a user interface."""
+
+    def test_import_defers_heavy_modules(self) -> None:
+        check = ("import sys\n"
+                 "from simple_spreadsheet.usecase.spreadsheet_engine import SpreadsheetEngine\n"
+                 "SpreadsheetEngine()\n"
+                 f"print([name for name in {DEFERRED_MODULES!r} if name in sys.modules])\n")
+        result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_headless_edits_and_files(self) -> None:
+        updates = []
+        engine = SpreadsheetEngine(on_update=updates.append)
+        a1, b1, c1 = Coordinates.from_id("A1"), Coordinates.from_id("B1"), Coordinates.from_id("C1")
+        engine.set_many({a1: "2", b1: "=A1*3"})
+        engine.set_cell_content(a1, "5")
+        self.assertEqual(engine.get_value_as_float(b1), 15.0)
+        self.assertIsNone(engine.get_value_as_float(c1))
+        self.assertEqual(updates[-1], [a1, b1])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sheet.s2v")
+            engine.save(path)
+            loaded = SpreadsheetEngine()
+            loaded.load(path)
+        self.assertEqual(loaded.get_value_as_float(b1), 15.0)
+        self.assertEqual(loaded.get_content(b1).expression, "=A1*3")
+
+    def test_failed_load_keeps_the_spreadsheet(self) -> None:
+        updates = []
+        engine = SpreadsheetEngine(on_update=updates.append)
+        a1, b1 = Coordinates.from_id("A1"), Coordinates.from_id("B1")
+        engine.set_many({a1: "2", b1: "=A1*3"})
+        updates.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cycle.s2v")
+            with open(path, "w") as file:
+                file.write("=B1;=A1\n")
+            with self.assertRaises(CircularDependencyException):
+                engine.load(path)
+        self.assertEqual(updates, [])
+        engine.set_cell_content(a1, "4")
+        self.assertEqual(engine.get_value_as_float(b1), 12.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
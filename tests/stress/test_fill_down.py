@@ -0,0 +1,70 @@
+import os
+import random
+import tempfile
+import unittest
+
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+from tests.automatic_grader.entities.no_number_exception import NoNumberException
+
+NUM_ROWS = 100_000
+
+
+class FillDownTest(unittest.TestCase):
+    """Runs of the same formula down a column must match the formula by formula results."""
+
+    def test_load_fill_down_columns(self) -> None:
+        rng = random.Random(2024)
+        rows = []
+        for _ in range(NUM_ROWS):
+            a = "" if rng.random() < 0.05 else f"{rng.uniform(-100, 100):.2f}"
+            rows.append((a, f"{rng.uniform(1, 100):.2f}"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "fill_down.s2v")
+            with open(file_path, "w") as file:
+                for row, (a, b) in enumerate(rows, start=1):
+                    # Column E depends on the row above, so it is not evaluated as a run
+                    previous = f"E{row - 1}" if row > 1 else "0"
+                    file.write(f"{a};{b};=A{row}*B{row}+A{row};=C{row}/B{row}-1;={previous}+D{row}\n")
+
+            controller = ControllerForChecker()
+            controller.load_spreadsheet_from_file(file_path)
+
+        running = 0.0
+        for row, (a, b) in enumerate(rows, start=1):
+            a, b = float(a or 0.0), float(b)
+            c = a * b + a
+            d = c / b - 1
+            running = running + d
+            self.assertEqual(repr(controller.get_cell_content_as_float(f"C{row}")), repr(c))
+            self.assertEqual(repr(controller.get_cell_content_as_float(f"D{row}")), repr(d))
+            self.assertEqual(repr(controller.get_cell_content_as_float(f"E{row}")), repr(running))
+
+        controller.set_cell_content("A1", "7")
+        self.assertEqual(controller.get_cell_content_as_float("C1"), 7 * float(rows[0][1]) + 7)
+
+    def test_fill_down_over_empty_cells_matches_cell_by_cell(self) -> None:
+        rng = random.Random(2025)
+        inputs = {f"A{row}": f"{rng.uniform(-100, 100):.2f}" for row in range(1, 1001) if rng.random() < 0.5}
+        formulas = {}
+        for row in range(1, 1001):
+            formulas[f"B{row}"] = f"=A{row}"
+            formulas[f"C{row}"] = f"=(A{row})*2"
+            formulas[f"D{row}"] = f"=B{row}+1"
+
+        batched, cell_by_cell = ControllerForChecker(), ControllerForChecker()
+        for contents in (inputs, formulas):
+            batched.set_many(contents)
+            for coord, content in contents.items():
+                cell_by_cell.set_cell_content(coord, content)
+        for row in range(1, 1001):
+            for col in "BCD":
+                self.assertEqual(batched.get_cell_content_as_string(f"{col}{row}"),
+                                 cell_by_cell.get_cell_content_as_string(f"{col}{row}"))
+            if f"A{row}" not in inputs:
+                with self.assertRaises(NoNumberException):
+                    batched.get_cell_content_as_float(f"B{row}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 2_000
+NUM_UPDATES = 500
+
+
+class LazyEvaluationTest(unittest.TestCase):
+    """Values evaluated when read must match the values evaluated on each edit."""
+
+    def test_reads_match_eager_evaluation(self) -> None:
+        rng = random.Random(2024)
+        eager, lazy = ControllerForChecker(), ControllerForChecker(lazy=True)
+        contents = {"D1": f"=SUMA(C1:C{NUM_ROWS})", "D2": f"=MAX(B1:B{NUM_ROWS})/D1", "D3": "=D1+D2"}
+        for row in range(1, NUM_ROWS + 1):
+            contents[f"A{row}"] = f"{rng.uniform(1, 100):.2f}"
+            contents[f"B{row}"] = f"=A{row}*2+1"
+            previous = f"C{row - 1}" if row > 1 else "0"
+            contents[f"C{row}"] = f"={previous}+B{row}/100"
+        for controller in (eager, lazy):
+            controller.set_many(contents)
+
+        outputs = ["D1", "D2", "D3", f"C{NUM_ROWS}"]
+        for _ in range(NUM_UPDATES):
+            coord, content = f"A{rng.randint(1, NUM_ROWS)}", f"{rng.uniform(1, 100):.2f}"
+            if rng.random() < 0.05:
+                coord, content = f"B{rng.randint(1, NUM_ROWS)}", f"=A{rng.randint(1, NUM_ROWS)}-1"
+            eager.set_cell_content(coord, content)
+            lazy.set_cell_content(coord, content)
+            if rng.random() < 0.05:
+                for output in outputs + [f"C{rng.randint(1, NUM_ROWS)}"]:
+                    self.assertEqual(lazy.get_cell_content_as_string(output),
+                                     eager.get_cell_content_as_string(output))
+
+        self.assertEqual(lazy.spreadsheet.get_all_values_as_str(), eager.spreadsheet.get_all_values_as_str())
+
+
+if __name__ == '__main__':
+    unittest.main()
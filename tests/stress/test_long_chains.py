@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.dependency_manager import DependencyManager, CircularDependencyException
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+CHAIN_LENGTH = 1_000_000
+
+
+class LongChainTest(unittest.TestCase):
+    """Chains of references far deeper than the interpreter's recursion limit."""
+
+    def test_cycle_detection_on_chain(self) -> None:
+        deps_manager = DependencyManager()
+        for row in range(1, CHAIN_LENGTH):
+            deps_manager.set_dependencies(
+                Coordinates(row, 0), {Coordinates(row - 1, 0)})
+
+        last = Coordinates(CHAIN_LENGTH - 1, 0)
+        with self.assertRaises(CircularDependencyException):
+            deps_manager.has_circular_dependency(Coordinates(0, 0), {last})
+
+    def test_load_and_recalculate_chain(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "chain.s2v")
+            with open(file_path, "w") as file:
+                file.write("1\n")
+                for row in range(2, CHAIN_LENGTH + 1):
+                    file.write(f"=A{row - 1}+1\n")
+
+            controller = ControllerForChecker()
+            controller.load_spreadsheet_from_file(file_path)
+
+        last = f"A{CHAIN_LENGTH}"
+        self.assertEqual(controller.get_cell_content_as_float(last), CHAIN_LENGTH)
+
+        controller.set_cell_content("A1", "2")
+        self.assertEqual(controller.get_cell_content_as_float(last), CHAIN_LENGTH + 1)
+
+        with self.assertRaises(CircularDependencyException):
+            controller.set_cell_content("A1", f"={last}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from simple_spreadsheet.domain.coordinates import Column
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 1_000
+NUM_BLOCKS = 8
+# Rows of independent formulas reading the same inputs
+NUM_INDEPENDENT_ROWS = 2_000
+
+
+class ParallelRecalcTest(unittest.TestCase):
+    """Recalculations spread over several processes must match the serial ones."""
+
+    def test_independent_blocks_match_serial_recalculation(self) -> None:
+        rng = random.Random(2024)
+        contents, updates = {}, {}
+        for block in range(NUM_BLOCKS):
+            # Column e is left empty: d reads it, giving None or int sums
+            a, b, c, d, e = (Column.letters_from_number(5 * block + i) for i in range(5))
+            for row in range(1, NUM_ROWS + 1):
+                contents[f"{a}{row}"] = f"{rng.uniform(1, 100):.2f}"
+                contents[f"{b}{row}"] = f"={a}{row}*2+1"
+                previous = f"{c}{row - 1}" if row > 1 else "0"
+                contents[f"{c}{row}"] = f"={previous}+{b}{row}/{a}{row}+SUMA({a}1:{a}{row // 10 + 1})"
+                contents[f"{d}{row}"] = f"={e}{row}" if row % 2 else f"=SUMA({e}1:{e}{row})"
+            updates[f"{a}{rng.randint(1, NUM_ROWS)}"] = f"{rng.uniform(1, 100):.2f}"
+        # Joins the first two blocks into a single component
+        contents["ZZ1"] = "=A1+F1"
+        updates["A1"] = "7"
+
+        serial, parallel = ControllerForChecker(), ControllerForChecker(processes=4)
+        for changes in (contents, updates):
+            serial.set_many(changes)
+            parallel.set_many(changes)
+            self.assertEqual(parallel.spreadsheet.get_all_values_as_str(), serial.spreadsheet.get_all_values_as_str())
+
+        with self.assertRaises(ZeroDivisionError):
+            parallel.set_cell_content("F5", "0")
+
+    def test_edits_between_and_errors_in_parallel_recalculations(self) -> None:
+        contents = {"ZZ1": "0.5", "ZZ2": "2"}
+        for row in range(1, NUM_INDEPENDENT_ROWS + 1):
+            contents[f"A{row}"] = f"=ZZ1*{row}"
+            contents[f"B{row}"] = f"=A{row}/(ZZ1-{row})+ZZ2"
+            contents[f"C{row}"] = f"=B{row}*2"
+
+        serial, parallel = ControllerForChecker(), ControllerForChecker(processes=4)
+        serial.set_many(contents)
+        parallel.set_many(contents)
+        # ZZ2 and A7 are recomputed serially, the next parallel recalculation reads their new values.
+        # While ZZ1 is 1500 B1500 raises, the workers are then forked again.
+        raised = []
+        edits = (("ZZ2", "5"), ("A7", "3"), ("ZZ1", "0.75"), ("ZZ1", "1500"), ("ZZ2", "7"), ("ZZ1", "0.25"))
+        for cell, value in edits:
+            outcomes = []
+            for controller in (serial, parallel):
+                try:
+                    controller.set_cell_content(cell, value)
+                    outcomes.append(None)
+                except ZeroDivisionError as e:
+                    outcomes.append(str(e))
+            self.assertEqual(outcomes[1], outcomes[0])
+            self.assertEqual(parallel.spreadsheet.get_all_values_as_str(), serial.spreadsheet.get_all_values_as_str())
+            raised.append(outcomes[0] is not None)
+        self.assertEqual(raised, [False, False, False, True, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from simple_spreadsheet.domain.cell_range import CellRange
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.functions import FunctionFactory
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+NUM_ROWS = 100_000
+NUM_UPDATES = 500
+FUNCTIONS = ['SUMA', 'PROMEDIO', 'MAX', 'MIN']
+
+
+class RangeAggregatesTest(unittest.TestCase):
+    """Aggregates kept up to date cell by cell must match a full read of the range."""
+
+    def test_streaming_updates_match_full_reads(self) -> None:
+        rng = random.Random(2024)
+        controller = ControllerForChecker()
+        for row in range(1, NUM_ROWS + 1):
+            controller.set_cell_content(f"A{row}", f"{rng.uniform(-100, 100):.2f}")
+
+        top_left, bottom_right = Coordinates.from_id("A1"), Coordinates.from_id(f"A{NUM_ROWS}")
+        column = CellRange(top_left, bottom_right)
+        cells = {}
+        for col, name in enumerate(FUNCTIONS, start=1):
+            cell = Coordinates(0, col).id
+            controller.set_cell_content(cell, f"={name}(A1:A{NUM_ROWS})")
+            cells[cell] = FunctionFactory.create(name, [column])
+
+        values = ["", "0", "-0", "1e300", "nan", "inf", "7"]
+        for _ in range(NUM_UPDATES):
+            value = rng.choice(values) if rng.random() < 0.2 else f"{rng.uniform(-100, 100):.2f}"
+            controller.set_cell_content(f"A{rng.randint(1, NUM_ROWS)}", value)
+
+            numbers = controller.spreadsheet.get_range_values(top_left, bottom_right)
+            for cell, function in cells.items():
+                expected = function.reduce(numbers)
+                self.assertEqual(repr(controller.get_cell_content_as_float(cell)), repr(expected))
+
+    def test_overlapping_windows_match_full_reads(self) -> None:
+        rng = random.Random(2025)
+        controller = ControllerForChecker()
+        for row in range(1, NUM_ROWS + 1):
+            controller.set_cell_content(f"A{row}", f"{rng.uniform(-100, 100):.2f}")
+
+        windows = [(rng.randint(1, NUM_ROWS), rng.randint(1, NUM_ROWS)) for _ in range(100)]
+        for start, stop in windows:
+            start, stop = min(start, stop), max(start, stop)
+            top_left, bottom_right = Coordinates.from_id(f"A{start}"), Coordinates.from_id(f"A{stop}")
+            numbers = controller.spreadsheet.get_range_values(top_left, bottom_right)
+            for name in FUNCTIONS:
+                function = FunctionFactory.create(name, [CellRange(top_left, bottom_right)])
+                controller.set_cell_content("B1", f"={name}(A{start}:A{stop})")
+                self.assertEqual(repr(controller.get_cell_content_as_float("B1")),
+                                 repr(function.reduce(numbers)))
+        _, misses = controller.get_aggregate_counters()
+        self.assertGreater(misses, 0)
+
+    def test_extremes_after_edit_outside_queried_blocks(self) -> None:
+        controller = ControllerForChecker()
+        controller.set_many({f"A{row}": "1" for row in range(1, 3073)})
+        controller.set_cell_content("C1", "=MAX(A1:A3072)")
+        controller.set_cell_content("A3000", "100")
+        controller.set_cell_content("D1", "=MAX(A1:A1024)")  # Rebuilds the tables before the edited block
+        controller.set_cell_content("E1", "=MAX(A2:A3072)")
+        controller.set_cell_content("F1", "=MIN(A2:A3072)")
+        self.assertEqual(controller.get_cell_content_as_float("C1"), 100.0)
+        self.assertEqual(controller.get_cell_content_as_float("D1"), 1.0)
+        self.assertEqual(controller.get_cell_content_as_float("E1"), 100.0)
+        self.assertEqual(controller.get_cell_content_as_float("F1"), 1.0)
+
+    def test_multi_column_ranges_reduce_row_by_row(self) -> None:
+        rng = random.Random(2026)
+        controller = ControllerForChecker()
+        contents = {}
+        for row in range(1, 1001):
+            for col in "ABC":
+                if rng.random() < 0.5:  # Zeros of both signs and a few NaNs, results depend on the order
+                    contents[f"{col}{row}"] = "nan" if rng.random() < 0.05 else rng.choice(["0", "-0"])
+        controller.set_many(contents)
+
+        for start, stop in [(1, 2), (1, 50), (1, 1000), (300, 900)]:
+            for first, last in [("A", "B"), ("A", "C"), ("B", "C")]:
+                top_left = Coordinates.from_id(f"{first}{start}")
+                bottom_right = Coordinates.from_id(f"{last}{stop}")
+                cell_range = CellRange(top_left, bottom_right)
+                numbers = [value for value in map(controller.spreadsheet.get_number, cell_range)
+                           if value is not None]
+                for name in FUNCTIONS:
+                    controller.set_cell_content("E1", f"={name}({first}{start}:{last}{stop})")
+                    self.assertEqual(repr(controller.get_cell_content_as_float("E1")),
+                                     repr(FunctionFactory.create(name, [cell_range]).reduce(numbers)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.dependency_manager import CircularDependencyException
+from simple_spreadsheet.usecase.spreadsheet_engine import SpreadsheetEngine
+
+
+def _cells(values: dict[str, str]) -> dict[Coordinates, str]:
+    return {Coordinates.from_id(cell_id): value for cell_id, value in values.items()}
+
+
+class BatchEditsTest(unittest.TestCase):
+    """A rejected batch leaves the sheet, its dependencies and its counters as they were."""
+
+    def setUp(self) -> None:
+        self._updates = []
+        self._engine = SpreadsheetEngine(on_update=self._updates.append)
+        self._engine.set_many(_cells({"A1": "hello", "B1": "5", "D1": "=B1*2", "E1": "=1+2*3"}))
+        self._updates.clear()
+
+    def _value(self, cell_id: str) -> str:
+        return self._engine.get_value_as_str(Coordinates.from_id(cell_id))
+
+    def _saved(self) -> str:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sheet.csv")
+            self._engine.save(path)
+            with open(path) as file:
+                return file.read()
+
+    def _assert_unchanged(self) -> None:
+        self.assertEqual(self._updates, [])
+        self.assertEqual([self._value(cell_id) for cell_id in ("B1", "C1", "D1", "E1")], ["5.0", "", "10.0", "7.0"])
+        self.assertIsNone(self._engine.get_content(Coordinates.from_id("C1")))
+        self.assertEqual(self._saved(), "hello;5;;=B1*2;=1+2*3\n")
+        self.assertEqual(self._engine.get_eliminated_formula_nodes(), 4)
+
+        # The dependencies are the previous ones too
+        self._engine.set_cell_content(Coordinates.from_id("B1"), "6")
+        self.assertEqual(self._value("D1"), "12.0")
+
+    def test_formula_that_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            self._engine.set_cell_content(Coordinates.from_id("B1"), "=A1+1")
+        self._assert_unchanged()
+
+        self._engine.set_cell_content(Coordinates.from_id("B1"), "5")
+        self._updates.clear()
+        with self.assertRaises(ValueError):
+            self._engine.set_many(_cells({"B1": "=A1+1", "C1": "7", "E1": "=2*3"}))
+        self._assert_unchanged()
+
+    def test_dependent_that_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            self._engine.set_many(_cells({"C1": "7", "B1": "=C1", "D1": "=B1+A1", "E1": "=2*3"}))
+        self._assert_unchanged()
+
+    def test_cycle(self) -> None:
+        with self.assertRaises(CircularDependencyException):
+            self._engine.set_cell_content(Coordinates.from_id("B1"), "=D1+1*2")
+        self._assert_unchanged()
+
+        self._engine.set_cell_content(Coordinates.from_id("B1"), "5")
+        self._updates.clear()
+        with self.assertRaises(CircularDependencyException):
+            self._engine.set_many(_cells({"C1": "7", "B1": "=D1+1*2", "E1": "=2*3"}))
+        self._assert_unchanged()
+
+
+if __name__ == '__main__':
+    unittest.main()
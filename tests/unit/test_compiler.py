@@ -0,0 +1,60 @@
+import unittest
+
+from simple_spreadsheet.domain.contents import ContentFactory
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.spreadsheet import Spreadsheet
+from simple_spreadsheet.domain.formula_evaluation.compiler import Compiler
+from simple_spreadsheet.domain.formula_evaluation.parser import Parser
+from simple_spreadsheet.domain.formula_evaluation.postfix_evaluator import PostfixEvaluator
+from simple_spreadsheet.domain.formula_evaluation.program import InterpretedProgram
+from simple_spreadsheet.domain.formula_evaluation.tokenizer import Tokenizer
+
+# Column D is left empty
+CELLS = {"A1": "2", "A2": "-0.5", "A3": "0", "A4": "1e308", "B1": "3", "B2": "text",
+         "C1": "-0", "C2": "nan", "C3": "inf"}
+
+FORMULAS = [
+    # Operators
+    "A1+B1*2", "A1-A2", "(A1-A2)/B1", "A4*10", "A4*10-A4*10", "C2+1", "1/(A3-A3)", "A1/A3",
+    # Empty cells
+    "D1", "(D1)", "D1+1", "D1*2", "A1/D1",
+    # Non-numeric cells
+    "B2+1", "SUMA(B1:B2)",
+    # Functions and ranges
+    "SUMA(A1:B1)", "SUMA(A1:A4;5)", "MIN(A1:A3)", "MAX(A1:C1)", "MAX(C1:C3)", "MIN(C1;A3)", "C1",
+    "SUMA(C1)", "MIN(C1:C1)", "PROMEDIO(A1;D1)", "PROMEDIO(D1:D3)", "MAX(D1:D3)", "SUMA(D1)",
+    "SUMA(SUMA(A1);B1)", "SUMA(A1:A2)/PROMEDIO(A1:A3)", "MAX(A1:A3)-MIN(A1:A3)*SUMA(A1;B1;3)",
+]
+
+
+def _outcome(evaluate) -> str:
+    """Value of an evaluation, or its exception, as text."""
+    try:
+        return repr(evaluate())
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+class CompilerTest(unittest.TestCase):
+    """Compiled programs give the same values and raise the same errors as interpreted evaluation."""
+
+    def setUp(self) -> None:
+        self._spreadsheet = Spreadsheet()
+        for cell_id, value in CELLS.items():
+            self._spreadsheet.set_content(Coordinates.from_id(cell_id), ContentFactory.create(value))
+
+    def test_compiled_matches_interpreted(self) -> None:
+        origin = Coordinates.from_id("E5")
+        for expression in FORMULAS:
+            with self.subTest(expression):
+                postfix = Parser().parse(Tokenizer().tokenize(expression))
+                program = Compiler().compile(postfix, origin)
+                self.assertIsNotNone(program)
+                expected = _outcome(lambda: PostfixEvaluator(self._spreadsheet).evaluate(postfix))
+                self.assertEqual(_outcome(lambda: program.evaluate(self._spreadsheet, origin)), expected)
+                self.assertEqual(_outcome(lambda: InterpretedProgram(postfix).evaluate(self._spreadsheet, origin)),
+                                 expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
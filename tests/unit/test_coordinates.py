@@ -0,0 +1,26 @@
+import gc
+import unittest
+
+from simple_spreadsheet.domain.cell_range import CellRange
+from simple_spreadsheet.domain.coordinates import Coordinates
+
+
+class CoordinatesTest(unittest.TestCase):
+    """Coordinates are shared while in use and freed once nothing references them."""
+
+    def test_interned_while_referenced(self) -> None:
+        coords = Coordinates(500_000, 7)
+        self.assertIs(Coordinates(500_000, 7), coords)
+        self.assertIs(Coordinates.from_key(coords.key), coords)
+
+    def test_unreferenced_coordinates_are_freed(self) -> None:
+        before = len(Coordinates._instances)
+        cell_range = CellRange(Coordinates(900_000, 0), Coordinates(909_999, 3))
+        self.assertEqual(sum(1 for _ in cell_range), 40_000)
+        del cell_range
+        gc.collect()
+        self.assertLessEqual(len(Coordinates._instances), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+
+from simple_spreadsheet.domain.cell_range import CellRange
+from simple_spreadsheet.domain.contents import Number
+from simple_spreadsheet.domain.coordinates import BadCoordinateException, Coordinates
+from simple_spreadsheet.domain.functions import Function
+from simple_spreadsheet.domain.operators import BinaryOperator
+from simple_spreadsheet.domain.formula_evaluation.tokenizer import Tokenizer, TokenizationError
+from simple_spreadsheet.domain.formula_evaluation.parser import Parser
+from simple_spreadsheet.usecase.controller_for_checker import ControllerForChecker
+
+# Well over the interpreter's recursion limit
+NESTING_DEPTH = 5_000
+
+
+def _describe(component) -> str:
+    """Short text of a token or postfix component, to compare them with the expected ones."""
+    if isinstance(component, Number):
+        return str(component)
+    if isinstance(component, Coordinates):
+        return component.id
+    if isinstance(component, BinaryOperator):
+        return component.symbol
+    if isinstance(component, CellRange):
+        return repr(component)
+    if isinstance(component, Function):
+        return f"{type(component).__name__}({', '.join(map(_describe, component.args))})"
+    return component
+
+
+class TokenizerTest(unittest.TestCase):
+    """Tokens, positions and errors of the single pass tokenizer, as given by the previous one."""
+
+    def _tokenize(self, expression: str) -> list[str]:
+        return [_describe(token) for token in Tokenizer().tokenize(expression)]
+
+    def test_tokens_and_positions(self) -> None:
+        tokenizer = Tokenizer()
+        tokenizer.tokenize(" A1 * -3+ suma(B1:b2)")
+        self.assertEqual([_describe(token) for token in tokenizer.get_tokens()],
+                         ["A1", "*", "-3.0", "+", "SUMA", "(", "B1", ":", "B2", ")"])
+        self.assertEqual(tokenizer.get_positions(), [1, 4, 6, 8, 10, 14, 15, 17, 18, 20])
+
+    def test_signs(self) -> None:
+        cases = {
+            "-3+A1": ["-3.0", "+", "A1"],
+            "+2": ["2.0"],
+            "2--3": ["2.0", "-", "-3.0"],
+            "2 - -3": ["2.0", "-", "-3.0"],
+            "A1-3": ["A1", "-", "3.0"],
+            "(1)-2": ["(", "1.0", ")", "-", "2.0"],
+            "1*+2": ["1.0", "*", "2.0"],
+            "-.5": ["-0.5"],
+            "5.": ["5.0"],
+            "1e5": ["1.0", "E5"],
+        }
+        for expression, tokens in cases.items():
+            with self.subTest(expression):
+                self.assertEqual(self._tokenize(expression), tokens)
+
+    def test_errors(self) -> None:
+        cases = {
+            "-": (TokenizationError, "Invalid number at position 0"),
+            "- 2": (TokenizationError, "Invalid number at position 0"),
+            "-A1": (TokenizationError, "Invalid number at position 0"),
+            "3*-": (TokenizationError, "Invalid number at position 2"),
+            "1-+-2": (TokenizationError, "Invalid number at position 2"),
+            "SUMA(A1;-B1)": (TokenizationError, "Invalid number at position 8"),
+            "1.5.2": (TokenizationError, "A number contains multiple decimal separators"),
+            "1 $ 2": (TokenizationError, 'Invalid character "$" at position 2'),
+            "2^3": (TokenizationError, 'Invalid character "^" at position 1'),
+            "FOO(1)": (TokenizationError, 'Invalid function "FOO" at position 0'),
+            "1A": (TokenizationError, 'Invalid function "A" at position 1'),
+            "1+ñ": (TokenizationError, 'Invalid function "ñ" at position 2'),
+            "A1B": (BadCoordinateException, "Invalid cell ID (A1B)"),
+            "ñ1": (BadCoordinateException, "Invalid cell ID (Ñ1)"),
+            "A0": (BadCoordinateException, "Cell out of range"),
+        }
+        for expression, (error, message) in cases.items():
+            with self.subTest(expression), self.assertRaises(error) as context:
+                Tokenizer().tokenize(expression)
+            self.assertEqual(str(context.exception), message)
+
+
+class ParserTest(unittest.TestCase):
+    """Postfix expressions and errors of the one pass parser, as given by the previous pipeline."""
+
+    def _parse(self, expression: str) -> list[str]:
+        return [_describe(component) for component in Parser().parse(Tokenizer().tokenize(expression))]
+
+    def test_precedence(self) -> None:
+        cases = {
+            "2+3*4": ["2.0", "3.0", "4.0", "*", "+"],
+            "2*3+4": ["2.0", "3.0", "*", "4.0", "+"],
+            "8-2-2": ["8.0", "2.0", "-", "2.0", "-"],
+            "8/2/2": ["8.0", "2.0", "/", "2.0", "/"],
+            "2*(3+4)": ["2.0", "3.0", "4.0", "+", "*"],
+            "(1+2)*(3-4)/5": ["1.0", "2.0", "+", "3.0", "4.0", "-", "*", "5.0", "/"],
+            "((1))": ["1.0"],
+            "2*(-3)": ["2.0", "-3.0", "*"],
+            "1+SUMA(A1)*2": ["1.0", "Sum(A1)", "2.0", "*", "+"],
+            "PROMEDIO(A1:A3)/2": ["Average(A1:A3)", "2.0", "/"],
+            "SUMA(A1:B2;-1;3)": ["Sum(A1:B2, -1.0, 3.0)"],
+            "SUMA(1;)": ["Sum(1.0)"],
+        }
+        for expression, postfix in cases.items():
+            with self.subTest(expression):
+                self.assertEqual(self._parse(expression), postfix)
+
+    def test_errors(self) -> None:
+        cases = {
+            "": "Empty formula",
+            "(1": "Missing closing parenthesis at position 2",
+            "1+(2": "Missing closing parenthesis at position 4",
+            "(A1:B2)": "Missing closing parenthesis at position 2",
+            "1)": "Unexpected token ')' at position 1",
+            "()": "Unexpected token ')' at position 1",
+            "1 2": "Unexpected token '2.0' at position 1",
+            "A1:B2": "Unexpected token ':' at position 1",
+            "1;2": "Unexpected token ';' at position 1",
+            "SUMA": "Function 'SUMA' must be followed by '('",
+            "SUMA()": "Function 'SUMA' requires at least one argument",
+            "SUMA(A1": "Function 'SUMA' missing closing parenthesis",
+            "SUMA(;1)": "Invalid separator at position 2",
+            "SUMA(1 2)": "Number must be preceded by a separator at position 3",
+            "SUMA(A1:)": "Range must be followed by a cell reference (position 4)",
+            "SUMA(A1:2)": "Range must be followed by a cell reference (position 4)",
+            "SUMA(A1:B2:C3)": "Unexpected token ':' at position 5",
+        }
+        for expression, message in cases.items():
+            with self.subTest(expression), self.assertRaises(SyntaxError) as context:
+                self._parse(expression)
+            self.assertEqual(str(context.exception), message)
+
+
+class DeepNestingTest(unittest.TestCase):
+    """Formulas nested thousands of levels deep parse and evaluate without hitting the recursion limit."""
+
+    @staticmethod
+    def _parse_count(expression: str) -> int:
+        return len(Parser().parse(Tokenizer().tokenize(expression)))
+
+    def test_parse_deep_parentheses(self) -> None:
+        depth = NESTING_DEPTH
+        self.assertEqual(self._parse_count("(" * depth + "1" + ")" * depth), 1)
+        self.assertEqual(self._parse_count("(" * depth + "1" + "+1)" * depth), 2 * depth + 1)
+
+    def test_evaluate_deep_parentheses(self) -> None:
+        depth = NESTING_DEPTH
+        controller = ControllerForChecker()
+        controller.set_cell_content("A1", "2")
+        controller.set_cell_content("B1", "=" + "(" * depth + "A1" + "+1)" * depth)
+        controller.set_cell_content("C1", "=" + "1*(" * depth + "A1" + ")" * depth)
+        self.assertEqual(controller.get_cell_content_as_float("B1"), depth + 2)
+        self.assertEqual(controller.get_cell_content_as_float("C1"), 2)
+
+        controller.set_cell_content("A1", "5")
+        self.assertEqual(controller.get_cell_content_as_float("B1"), depth + 5)
+        self.assertEqual(controller.get_cell_content_as_float("C1"), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from simple_spreadsheet.domain.coordinates import Coordinates
+from simple_spreadsheet.domain.formula_evaluation.optimizer import Optimizer
+from simple_spreadsheet.domain.formula_evaluation.parser import Parser
+from simple_spreadsheet.domain.formula_evaluation.tokenizer import Tokenizer
+from simple_spreadsheet.usecase.spreadsheet_engine import SpreadsheetEngine
+
+from test_formula_parsing import _describe
+
+
+class OptimizerTest(unittest.TestCase):
+    """Constant folding, shared subexpressions and the count of nodes they eliminate."""
+
+    def setUp(self) -> None:
+        self._optimizer = Optimizer()
+
+    def _optimize(self, expression: str) -> list:
+        return self._optimizer.optimize(Parser().parse(Tokenizer().tokenize(expression)))
+
+    def _check(self, expression: str, postfix: list[str], eliminated: int) -> None:
+        with self.subTest(expression):
+            self.assertEqual([_describe(component) for component in self._optimize(expression)], postfix)
+            self.assertEqual(self._optimizer.get_eliminated_nodes(), eliminated)
+
+    def test_constant_folding(self) -> None:
+        self._check("1+2*3", ["7.0"], 4)
+        self._check("A1+2*3", ["A1", "6.0", "+"], 2)
+        self._check("(1+2)*A1", ["3.0", "A1", "*"], 2)
+        self._check("SUMA(1;2)+A1", ["3.0", "A1", "+"], 2)
+        self._check("SUMA(MAX(1;2);A1)", ["Sum(2.0, A1)"], 2)
+
+    def test_exact_rewrites_only(self) -> None:
+        self._check("A1+2+3", ["A1", "2.0", "+", "3.0", "+"], 0)  # Not reassociated
+        self._check("0*A1", ["0.0", "A1", "*"], 0)
+        self._check("1/0+A1", ["1.0", "0.0", "/", "A1", "+"], 0)  # Raises at evaluation
+
+    def test_shared_subexpressions(self) -> None:
+        self._check("SUMA(A1:A3)+SUMA(A1:A3)", ["Sum(A1:A3)", "Sum(A1:A3)", "+"], 2)
+        first, second, _ = self._optimize("SUMA(A1:A3)+SUMA(A1:A3)")
+        self.assertIs(first, second)
+
+        self._check("SUMA(A1:A3)*MAX(A1:A3)", ["Sum(A1:A3)", "Max(A1:A3)", "*"], 1)
+        total, largest, _ = self._optimize("SUMA(A1:A3)*MAX(A1:A3)")
+        self.assertIs(total.args[0], largest.args[0])
+
+        # 0 and -0 are different constants
+        self._check("SUMA(A1;0)+SUMA(A1;-0)", ["Sum(A1, 0.0)", "Sum(A1, -0.0)", "+"], 0)
+
+    def test_eliminated_nodes_per_cell(self) -> None:
+        engine = SpreadsheetEngine()
+        a1, b1 = Coordinates.from_id("A1"), Coordinates.from_id("B1")
+        engine.set_cell_content(a1, "=1+2*3")
+        self.assertEqual(engine.get_eliminated_formula_nodes(), 4)
+        engine.set_cell_content(a1, "=1+2*3")  # Edited again, counted once
+        self.assertEqual(engine.get_eliminated_formula_nodes(), 4)
+        engine.set_cell_content(b1, "=A1+2*3")
+        self.assertEqual(engine.get_eliminated_formula_nodes(), 6)
+        engine.set_cell_content(a1, "=B2+1")
+        self.assertEqual(engine.get_eliminated_formula_nodes(), 2)
+        engine.set_cell_content(b1, "5")
+        self.assertEqual(engine.get_eliminated_formula_nodes(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()